@@ -1,45 +1,64 @@
+import argparse
+import time
+from array import array
+from operator import attrgetter
+
 import pygame
-import random
 
-pygame.init()
-pygame.mixer.init()
+from audio import GestorAudio
+from azar import FlujosAzar, booleanos, enteros, nueva_semilla
+from cache_imagenes import cargar_imagen_escalada
+from colisiones import BarridoX
+from entidades import BANDERA_SUPERADO, BANDERA_VERTICAL, AlmacenEntidades, PoolEntidades, bandera, color_paleta, columna
+from infinito import NIVEL_INFINITO, FlujoTramos
+from mapa_ritmo import cargar_mapa, distancias_ritmo
+from niveles import TIPOS, Campaña, Nivel, compilar
+from paso_fijo import PasoFijo
+from perfilador import PerfiladorFrames
+from recursos import GestorRecursos
+from repeticion import DIRECTORIO_GRABACIONES, Grabador
+from sprites import CacheSprites
+from textos import CacheTextos, MarcadorHUD
 
 # --- CLASE MENU ALTAMENTE MEJORADA ---
 class Menu:
-    def __init__(self, pantalla, fuente_grande, fuente_normal, colores):
+    def __init__(self, pantalla, fuente_grande, fuente_normal, colores, cache_textos=None):
         self.pantalla = pantalla
         self.fuente_grande = fuente_grande
         self.fuente_normal = fuente_normal
         self.colores = colores
+        self.cache_textos = cache_textos or CacheTextos()
         
         ancho = self.pantalla.get_width()
         alto = self.pantalla.get_height()
 
         self.estado_menu = "PRINCIPAL"
-        self.boton_jugar = pygame.Rect(ancho//2 - 100, 250, 200, 50)
-        self.boton_instrucciones = pygame.Rect(ancho//2 - 100, 320, 200, 50)
-        self.boton_salir = pygame.Rect(ancho//2 - 100, 390, 200, 50)
-        self.boton_volver = pygame.Rect(ancho//2 - 100, 450, 200, 50)
+        self.boton_jugar = pygame.Rect(ancho//2 - 100, 230, 200, 50)
+        self.boton_infinito = pygame.Rect(ancho//2 - 100, 300, 200, 50)
+        self.boton_instrucciones = pygame.Rect(ancho//2 - 100, 370, 200, 50)
+        self.boton_salir = pygame.Rect(ancho//2 - 100, 440, 200, 50)
+        self.boton_volver = pygame.Rect(ancho//2 - 100, 490, 200, 50)
         self.color_normal = (0, 100, 200)
         self.color_hover = (0, 150, 255)
 
     def _dibujar_boton(self, rect, texto, mouse_pos):
         color_actual = self.color_hover if rect.collidepoint(mouse_pos) else self.color_normal
         pygame.draw.rect(self.pantalla, color_actual, rect, border_radius=10)
-        texto_surf = self.fuente_normal.render(texto, True, self.colores["BLANCO"])
+        texto_surf = self.cache_textos.render(self.fuente_normal, texto, True, self.colores["BLANCO"])
         texto_rect = texto_surf.get_rect(center=rect.center)
         self.pantalla.blit(texto_surf, texto_rect)
 
     def dibujar(self, fondo, mouse_pos):
         self.pantalla.blit(fondo, (0, 0))
         if self.estado_menu == "PRINCIPAL":
-            titulo = self.fuente_grande.render("Geometry Dash", True, self.colores["BLANCO"])
+            titulo = self.cache_textos.render(self.fuente_grande, "Geometry Dash", True, self.colores["BLANCO"])
             self.pantalla.blit(titulo, (self.pantalla.get_width()//2 - titulo.get_width()//2, 150))
             self._dibujar_boton(self.boton_jugar, "Jugar", mouse_pos)
+            self._dibujar_boton(self.boton_infinito, "Infinito", mouse_pos)
             self._dibujar_boton(self.boton_instrucciones, "Instrucciones", mouse_pos)
             self._dibujar_boton(self.boton_salir, "Salir", mouse_pos)
         else:
-            titulo = self.fuente_grande.render("Instrucciones", True, self.colores["BLANCO"])
+            titulo = self.cache_textos.render(self.fuente_grande, "Instrucciones", True, self.colores["BLANCO"])
             self.pantalla.blit(titulo, (self.pantalla.get_width()//2 - titulo.get_width()//2, 100))
             instrucciones = [
                 "¡Bienvenido a Geometry Dash!",
@@ -47,10 +66,11 @@ class Menu:
                 "- Usa [ESPACIO] para saltar.",
                 "- Nivel 1: esquiva triángulos rojos.",
                 "- Nivel 2: obstáculos más rápidos y variables.",
-                "- ¡Consigue 10 puntos para cada nivel!"
+                "- ¡Consigue 10 puntos para cada nivel!",
+                "- Infinito: cada vez más rápido, sin final."
             ]
             for i, linea in enumerate(instrucciones):
-                texto_linea = self.fuente_normal.render(linea, True, self.colores["BLANCO"])
+                texto_linea = self.cache_textos.render(self.fuente_normal, linea, True, self.colores["BLANCO"])
                 self.pantalla.blit(texto_linea, (self.pantalla.get_width()//2 - texto_linea.get_width()//2, 200 + i * 40))
             self._dibujar_boton(self.boton_volver, "Volver", mouse_pos)
 
@@ -62,6 +82,7 @@ class Menu:
                 pos = e.pos
                 if self.estado_menu == "PRINCIPAL":
                     if self.boton_jugar.collidepoint(pos): return "INICIAR_JUEGO"
+                    if self.boton_infinito.collidepoint(pos): return "INICIAR_INFINITO"
                     if self.boton_instrucciones.collidepoint(pos): self.estado_menu = "INSTRUCCIONES"
                     if self.boton_salir.collidepoint(pos): return "SALIR"
                 else:
@@ -70,15 +91,24 @@ class Menu:
 
 # --- CLASES DE JUEGO ---
 class ObjetoJuego:
+    __slots__ = ("x", "y", "ancho", "alto", "color", "rectangulo", "x_anterior", "y_anterior")
     def __init__(self, x, y, ancho, alto, color):
         self.x, self.y = x, y
         self.ancho, self.alto = ancho, alto
         self.color = color
         self.rectangulo = pygame.Rect(x, y, ancho, alto)
+        self.x_anterior, self.y_anterior = x, y
     def actualizar_rectangulo(self):
         self.rectangulo.x, self.rectangulo.y = self.x, self.y
+    # Posición del tick anterior, para dibujar interpolando entre dos ticks
+    def guardar_posicion(self):
+        self.x_anterior, self.y_anterior = self.x, self.y
+    def posicion_interpolada(self, alfa):
+        return (round(self.x_anterior + (self.x - self.x_anterior) * alfa),
+                round(self.y_anterior + (self.y - self.y_anterior) * alfa))
 
 class Jugador(ObjetoJuego):
+    __slots__ = ("y_suelo", "velocidad_y", "esta_saltando")
     def __init__(self, x, y, tamaño, color, y_suelo):
         super().__init__(x, y, tamaño, tamaño, color)
         self.y_suelo = y_suelo
@@ -88,6 +118,11 @@ class Jugador(ObjetoJuego):
         if not self.esta_saltando:
             self.velocidad_y = -15
             self.esta_saltando = True
+    # De vuelta en el suelo y quieto, como recién creado
+    def reiniciar(self):
+        self.y, self.velocidad_y, self.esta_saltando = self.y_suelo, 0, False
+        self.actualizar_rectangulo()
+        self.guardar_posicion()
     def actualizar(self):
         self.velocidad_y += 1
         self.y += self.velocidad_y
@@ -96,10 +131,12 @@ class Jugador(ObjetoJuego):
             self.velocidad_y = 0
             self.esta_saltando = False
         self.actualizar_rectangulo()
-    def dibujar(self, pantalla):
-        pygame.draw.rect(pantalla, self.color, self.rectangulo)
+    def dibujar(self, pantalla, alfa=1.0):
+        x, y = self.posicion_interpolada(alfa)
+        pygame.draw.rect(pantalla, self.color, (x, y, self.ancho, self.alto))
 
 class ObjetoMovil(ObjetoJuego):
+    __slots__ = ("velocidad", "ancho_pantalla")
     def __init__(self, x, y, ancho, alto, color, velocidad, ancho_pantalla):
         super().__init__(x, y, ancho, alto, color)
         self.velocidad = velocidad
@@ -109,192 +146,565 @@ class ObjetoMovil(ObjetoJuego):
         self.actualizar_rectangulo()
 
 class Suelo(ObjetoMovil):
+    __slots__ = ()
     def actualizar(self):
-        self.mover()
+        self.x -= self.velocidad
+        self.actualizar_rectangulo()
+        # Sin perder el sobrante: en el modo infinito la velocidad no siempre divide el ancho
         if self.x <= -self.ancho:
-            self.x = 0
-    def dibujar(self, pantalla, fondo_img):
-        pantalla.blit(fondo_img, (self.x, 0))
-        pantalla.blit(fondo_img, (self.x + self.ancho, 0))
-        pygame.draw.rect(pantalla, self.color, (self.x, self.y, self.ancho, self.alto))
-        pygame.draw.rect(pantalla, self.color, (self.x + self.ancho, self.y, self.ancho, self.alto))
+            self.x += self.ancho
+    def reiniciar(self):
+        self.x = 0
+        self.actualizar_rectangulo()
+        self.guardar_posicion()
+    def posicion_interpolada(self, alfa):
+        # Al dar la vuelta x salta de -ancho a 0: se interpola el desplazamiento real
+        desplazamiento = self.x - self.x_anterior
+        if desplazamiento > 0:
+            desplazamiento -= self.ancho
+        return round(self.x_anterior + desplazamiento * alfa), self.y
+    def crear_tira(self, fondo_img):
+        # Fondo y suelo repetidos dos veces en una sola superficie: se desplaza con un único blit
+        tira = pygame.Surface((self.ancho * 2, fondo_img.get_height())).convert()
+        for x in (0, self.ancho):
+            tira.blit(fondo_img, (x, 0))
+            pygame.draw.rect(tira, self.color, (x, self.y, self.ancho, self.alto))
+        return tira
+    def dibujar(self, pantalla, tira, alfa=1.0):
+        x, _ = self.posicion_interpolada(alfa)
+        return pantalla.blit(tira, (x, 0))
 
+# Vista sobre un hueco de un AlmacenEntidades: el estado vive en sus columnas (ver entidades.py)
 class Obstaculo(ObjetoMovil):
-    def __init__(self, x, y, tamaño, color, velocidad, ancho_pantalla):
-        super().__init__(x, y, tamaño, tamaño, color, velocidad, ancho_pantalla)
+    __slots__ = ("almacen", "indice", "sprite", "rectangulo_colision")
+    x = columna("x")
+    y = columna("y")
+    ancho = columna("ancho")
+    alto = columna("alto")
+    velocidad = columna("velocidad")
+    color = color_paleta()
+    fue_superado = bandera(BANDERA_SUPERADO)
+    def __init__(self, x, y, tamaño, color, velocidad, ancho_pantalla, almacen=None):
+        self.vincular(almacen)
+        self.reiniciar(x, y, tamaño, color, velocidad, ancho_pantalla)
+    def vincular(self, almacen):
+        self.almacen = almacen if almacen is not None else AlmacenEntidades(1)
+        self.indice = self.almacen.reservar()
+        self.rectangulo = pygame.Rect(0, 0, 0, 0)
+        self.rectangulo_colision = pygame.Rect(0, 0, 0, 0)
+    # Deja la vista como recién creada reutilizando su hueco y sus rectángulos (ver PoolEntidades)
+    def reiniciar(self, x, y, tamaño, color, velocidad, ancho_pantalla):
+        self.x, self.y, self.ancho, self.alto, self.color = x, y, tamaño, tamaño, color
+        self.velocidad, self.ancho_pantalla = velocidad, ancho_pantalla
+        self.x_anterior, self.y_anterior = x, y
+        self.rectangulo.width = self.rectangulo.height = tamaño
         self.fue_superado = False
+        self.sprite = None
+        self.actualizar_rectangulo()
+    def mover(self):
+        self.almacen.x[self.indice] -= self.almacen.velocidad[self.indice]
+        self.actualizar_rectangulo()
+    def actualizar_rectangulo(self):
+        almacen, i = self.almacen, self.indice
+        x, y, ancho, alto = almacen.x[i], almacen.y[i], almacen.ancho[i], almacen.alto[i]
+        self.rectangulo.x, self.rectangulo.y = x, y
+        self.rectangulo_colision.update(x + ancho // 4, y - alto, ancho // 2, alto)
+    # mover() sin la llamada intermedia: es lo que más se ejecuta por frame
     def actualizar(self):
-        self.mover()
-    def dibujar(self, pantalla):
-        puntos = [(self.x, self.y), (self.x + self.ancho, self.y), (self.x + self.ancho // 2, self.y - self.alto)]
-        pygame.draw.polygon(pantalla, self.color, puntos)
+        a, i = self.almacen, self.indice
+        a.x[i] -= a.velocidad[i]
+        self.actualizar_rectangulo()
+    def dibujar(self, pantalla, alfa=1.0, sprites=None):
+        x, y = self.posicion_interpolada(alfa)
+        if sprites is None:
+            puntos = [(x, y), (x + self.ancho, y), (x + self.ancho // 2, y - self.alto)]
+            return pygame.draw.polygon(pantalla, self.color, puntos)
+        if self.sprite is None:
+            self.sprite = sprites.triangulo(self.ancho, self.alto, self.color)
+        return pantalla.blit(self.sprite, (x, y - self.alto))
     def obtener_rectangulo_colision(self):
-        return pygame.Rect(self.x + self.ancho // 4, self.y - self.alto, self.ancho // 2, self.alto)
+        return self.rectangulo_colision
 
 # --- Obstáculo Nivel 2: variable y movimiento vertical ---
 class ObstaculoNivel2(Obstaculo):
-    def __init__(self, x, y, velocidad, ancho_pantalla):
-        tamaño = random.randint(25, 45)
-        color = (255, random.randint(0, 255), 0)
-        super().__init__(x, y, tamaño, color, velocidad + random.randint(0, 5), ancho_pantalla)
-        self.mueve_vertical = random.choice([True, False])
+    __slots__ = ()
+    mueve_vertical = bandera(BANDERA_VERTICAL)
+    direccion = columna("direccion")
+    limite_superior = columna("limite_superior")
+    limite_inferior = columna("limite_inferior")
+    # Tamaño, color, velocidad y movimiento vertical llegan ya sorteados (ver MotorJuego.sortear_obstaculos)
+    def __init__(self, x, y, tamaño, color, velocidad, ancho_pantalla, mueve_vertical, almacen=None):
+        self.vincular(almacen)
+        self.reiniciar(x, y, tamaño, color, velocidad, ancho_pantalla, mueve_vertical)
+    def reiniciar(self, x, y, tamaño, color, velocidad, ancho_pantalla, mueve_vertical):
+        super().reiniciar(x, y, tamaño, color, velocidad, ancho_pantalla)
+        self.mueve_vertical = mueve_vertical
         self.direccion = 1
         self.limite_superior = y - 80
         self.limite_inferior = y
 
+    # Sobre las columnas del almacén y con un solo actualizar_rectangulo al final
     def actualizar(self):
-        self.mover()
-        if self.mueve_vertical:
-            self.y += self.direccion * 2
-            if self.y <= self.limite_superior or self.y >= self.limite_inferior:
-                self.direccion *= -1
+        a, i = self.almacen, self.indice
+        a.x[i] -= a.velocidad[i]
+        if a.banderas[i] & BANDERA_VERTICAL:
+            a.y[i] += a.direccion[i] * 2
+            if a.y[i] <= a.limite_superior[i] or a.y[i] >= a.limite_inferior[i]:
+                a.direccion[i] = -a.direccion[i]
         self.actualizar_rectangulo()
 
-# --- CLASE JUEGO PRINCIPAL ---
-class Juego:
-    def __init__(self):
+# --- MOTOR DE SIMULACIÓN (sin ventana, fuentes, audio ni reloj) ---
+COLORES_NIVEL2 = [(255, verde, 0) for verde in range(256)]
+# Con 250 px de separación mínima y velocidades de 10 a 15 px por frame caben pocos en pantalla
+CAPACIDAD_OBSTACULOS = 16
+# Instantáneas del motor: enteros de 64 bits, cabecera y luego 10 campos por obstáculo
+VERSION_INSTANTANEA = 1
+ESTADOS = ("MENU", "JUGANDO", "GAME_OVER", "WIN")
+CLASES_OBSTACULO = (Obstaculo, ObstaculoNivel2)
+CAMPOS_CABECERA = 13
+CAMPOS_OBSTACULO = 10
+
+class MotorJuego:
+    def __init__(self, semilla=None):
         self.ancho_pantalla, self.alto_pantalla = 800, 600
-        self.pantalla = pygame.display.set_mode((self.ancho_pantalla, self.alto_pantalla))
-        pygame.display.set_caption("Geometry Dash + Nivel 2")
-        self.reloj = pygame.time.Clock()
-        self.fondo = pygame.transform.scale(pygame.image.load("bg.png").convert(), (self.ancho_pantalla, self.alto_pantalla))
-        self.fuente_grande = pygame.font.Font(None, 74)
-        self.fuente_normal = pygame.font.Font(None, 48)
         self.colores = {"BLANCO": (255, 255, 255), "ROJO": (255, 0, 0), "GRIS": (50, 50, 50)}
         self.velocidad_juego = 10
-        self.cargar_audio()
         self.estado = "MENU"
-        self.menu = Menu(self.pantalla, self.fuente_grande, self.fuente_normal, self.colores)
         self.nivel_actual = 1
+        # Niveles de la campaña en niveles/ (ver niveles.py): las distancias se sortean y se compilan al empezar cada uno
+        self.campaña = Campaña.cargar("12")
+        self.niveles = {nivel: Nivel.cargar(etapa["nivel"]) for nivel, etapa in enumerate(self.campaña.niveles, 1)}
+        # Mapa fijo opcional para el nivel 1; si es None se usa el del archivo
+        self.mapa_nivel_1_distancias = None
+        # Con semilla fija todas las partidas son idénticas; si es None cada una sortea la suya
+        # La primera partida se sortea ya, para que Juego precargue su plan; nueva_partida la usa sin sortearla otra vez
+        self.semilla = semilla
+        self.planificar_partida(semilla if semilla is not None else nueva_semilla())
+        self.plan_sin_usar = True
+        # Estado de los obstáculos en columnas compactas, con huecos reciclados
+        self.almacen_obstaculos = AlmacenEntidades(CAPACIDAD_OBSTACULOS)
+        # Un pool por tipo: los obstáculos que salen de pantalla se reutilizan en el siguiente spawn
+        self.pools = {
+            Obstaculo: PoolEntidades(Obstaculo, self.almacen_obstaculos),
+            ObstaculoNivel2: PoolEntidades(ObstaculoNivel2, self.almacen_obstaculos),
+        }
+        self.obstaculos_activos = []
 
-    def cargar_audio(self):
-        try:
-            self.musica_juego = "bossfight-Vextron.mp3"
-            self.sonido_win = pygame.mixer.Sound("win.mp3")
-            self.sonido_lose = pygame.mixer.Sound("lose.mp3")
-        except pygame.error as e:
-            print(f"Error al cargar audio: {e}")
-            self.musica_juego = self.sonido_win = self.sonido_lose = None
-
+    # Ganchos de audio: el motor no reproduce nada, Juego los sobrescribe
     def reproducir_musica_juego(self):
-        if self.musica_juego:
-            pygame.mixer.music.load(self.musica_juego)
-            pygame.mixer.music.set_volume(0.1)
-            pygame.mixer.music.play(-1)
+        pass
 
     def reproducir_sonido_win(self):
-        if self.sonido_win:
-            pygame.mixer.music.stop()
-            self.sonido_win.play()
+        pass
 
     def reproducir_sonido_lose(self):
-        if self.sonido_lose:
-            pygame.mixer.music.stop()
-            self.sonido_lose.play()
+        pass
 
     def inicializar_partida(self):
         y_suelo = 450
         self.jugador = Jugador(100, y_suelo - 50, 50, self.colores["BLANCO"], y_suelo - 50)
         self.suelo = Suelo(0, y_suelo, self.ancho_pantalla, 150, self.colores["GRIS"], self.velocidad_juego, self.ancho_pantalla)
-        self.puntuacion = 0
-        self.mapa_nivel_distancias = [random.randint(350, 600) for _ in range(20)]
-        self.obstaculos_restantes_mapa = list(self.mapa_nivel_distancias)
-        self.obstaculos_activos = []
-        self.distancia_para_siguiente_obstaculo = self.obstaculos_restantes_mapa.pop(0)
-        self.reproducir_musica_juego()
+        self.iniciar_nivel(self.nivel_actual)
 
-    def inicializar_partida_nivel2(self):
-        self.nivel_actual = 2
-        y_suelo = 450
-        self.jugador = Jugador(100, y_suelo - 50, 50, self.colores["BLANCO"], y_suelo - 50)
-        self.suelo = Suelo(0, y_suelo, self.ancho_pantalla, 150, self.colores["GRIS"], self.velocidad_juego, self.ancho_pantalla)
+    # Al empezar la partida y al pasar de nivel: jugador y suelo vuelven a su sitio sin recrearlos
+    # y el plan del nivel ya suele estar sorteado (ver Juego.precargar_nivel)
+    def iniciar_nivel(self, nivel):
+        self.nivel_actual = nivel
+        self.jugador.reiniciar()
+        self.suelo.reiniciar()
         self.puntuacion = 0
-        self.mapa_nivel_distancias = [random.randint(250, 500) for _ in range(30)]
-        self.obstaculos_restantes_mapa = list(self.mapa_nivel_distancias)
-        self.obstaculos_activos = []
-        self.distancia_para_siguiente_obstaculo = self.obstaculos_restantes_mapa.pop(0)
+        self.iniciar_linea_tiempo(nivel)
+        # Puede llamarse a mitad del bucle de obstáculos: los del nivel anterior siguen intactos hasta el próximo spawn
+        self.devolver_obstaculos()
+        self.barrido_obstaculos = BarridoX(attrgetter("rectangulo_colision"))
+        self.obstaculos_activos = self.barrido_obstaculos.objetos
         self.reproducir_musica_juego()
 
-    def manejar_eventos_juego(self, eventos):
-        for e in eventos:
-            if e.type == pygame.QUIT: return "SALIR"
-            if e.type == pygame.KEYDOWN and e.key == pygame.K_SPACE: self.jugador.saltar()
-        return None
+    def planificar_partida(self, semilla):
+        # Todo el azar de la partida sale de la semilla, nivel tras nivel y cada propósito de
+        # su flujo: el plan depende solo de ella y basta para reconstruirlo. Cada nivel se
+        # sortea al llegar a él (ver plan_nivel)
+        self.flujos = FlujosAzar(semilla)
+        self.planes = {}
+        # Modo infinito (nivel 0): tramos de la misma semilla generados a medida que se avanza (ver infinito.py)
+        self.tramos = FlujoTramos(semilla, sortear=self.sortear_obstaculos)
 
-    def manejar_eventos_fin_partida(self, eventos):
-        for e in eventos:
-            if e.type == pygame.QUIT: return "SALIR"
-            if e.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN): return "VOLVER_AL_MENU"
-        return None
+    def plan_nivel(self, nivel):
+        # Siempre en orden: el nivel 2 se sortea después del 1 aunque se empiece por el 2
+        for siguiente in range(len(self.planes) + 1, nivel + 1):
+            self.planes[siguiente] = self.planificar_nivel(siguiente)
+        return self.planes[nivel]
+
+    def planificar_nivel(self, nivel, flujos=None):
+        # Con los flujos de la partida salvo que se den otros (ver Juego.precargar_nivel)
+        flujos = flujos or self.flujos
+        if nivel == 1 and self.mapa_nivel_1_distancias is not None:
+            mapa = Nivel.desde_distancias(self.mapa_nivel_1_distancias)
+        else:
+            mapa = self.niveles[nivel]
+        linea = compilar(mapa, self.velocidad_juego, self.ancho_pantalla, flujos.distancias)
+        return (linea,) + self.sortear_obstaculos(linea.total_obstaculos, flujos)
+
+    def iniciar_linea_tiempo(self, nivel, frame=0):
+        # En el modo infinito, el tramo que contiene `frame` con sus parámetros ya sorteados
+        if nivel == NIVEL_INFINITO:
+            tramo = self.tramos.en_frame(frame)
+            plan = (tramo,) + tramo.parametros
+        else:
+            plan = self.plan_nivel(nivel)
+        (self.linea_tiempo, self.tamaños_obstaculos, self.verdes_obstaculos,
+         self.extras_velocidad, self.verticales_obstaculos) = plan
+        self.suelo.velocidad = self.linea_tiempo.velocidad
+        self.frame_nivel = frame
+        self.cursor_obstaculos = 0
+
+    def sortear_obstaculos(self, cantidad, flujos=None):
+        # Parámetros de todos los obstáculos del nivel de una vez, cada uno de su flujo; el i-ésimo spawn usa el índice i
+        flujos = flujos or self.flujos
+        return (enteros(flujos.tamaño, 25, 45, cantidad), enteros(flujos.color, 0, 255, cantidad),
+                enteros(flujos.velocidad, 0, 5, cantidad), booleanos(flujos.vertical, cantidad))
+
+    def generar_obstaculo(self, tipo):
+        velocidad = self.linea_tiempo.velocidad
+        if TIPOS[tipo] == "variable":
+            i = self.cursor_obstaculos
+            return self.pools[ObstaculoNivel2].obtener(
+                self.ancho_pantalla, self.suelo.y, self.tamaños_obstaculos[i], COLORES_NIVEL2[self.verdes_obstaculos[i]],
+                velocidad + self.extras_velocidad[i], self.ancho_pantalla, self.verticales_obstaculos[i])
+        return self.pools[Obstaculo].obtener(self.ancho_pantalla, self.suelo.y, 35, self.colores["ROJO"],
+                                             velocidad, self.ancho_pantalla)
+
+    def devolver_obstaculos(self):
+        for obst in self.obstaculos_activos:
+            self.pools[type(obst)].devolver(obst)
+
+    def nueva_partida(self, nivel=1):
+        self.nivel_actual = nivel if 0 <= nivel <= len(self.campaña) else 1
+        if not self.plan_sin_usar or self.semilla not in (None, self.flujos.semilla):
+            self.planificar_partida(self.semilla if self.semilla is not None else nueva_semilla())
+        self.plan_sin_usar = False
+        self.inicializar_partida()
+        self.estado = "JUGANDO"
 
     def actualizar_juego(self):
         self.jugador.actualizar()
         self.suelo.actualizar()
 
-        self.distancia_para_siguiente_obstaculo -= self.velocidad_juego
-        if self.distancia_para_siguiente_obstaculo <= 0:
-            if self.nivel_actual == 1:
-                obst = Obstaculo(self.ancho_pantalla, self.suelo.y, 35, self.colores["ROJO"], self.velocidad_juego, self.ancho_pantalla)
-            else:
-                obst = ObstaculoNivel2(self.ancho_pantalla, self.suelo.y, self.velocidad_juego, self.ancho_pantalla)
-            self.obstaculos_activos.append(obst)
-            if self.obstaculos_restantes_mapa:
-                self.distancia_para_siguiente_obstaculo = self.obstaculos_restantes_mapa.pop(0)
-            else:
-                self.distancia_para_siguiente_obstaculo = float("inf")
+        # La línea de tiempo compilada dice en qué frame aparece cada obstáculo y de qué tipo
+        self.frame_nivel += 1
+        linea = self.linea_tiempo
+        if self.frame_nivel >= linea.fin:
+            linea = self.avanzar_tramo()
+        while linea.frames_obstaculos[self.cursor_obstaculos] <= self.frame_nivel:
+            self.barrido_obstaculos.insertar(self.generar_obstaculo(linea.tipos_obstaculos[self.cursor_obstaculos]))
+            self.cursor_obstaculos += 1
 
+        # Superado, x y ancho se leen de las columnas del almacén, sin pasar por las propiedades
+        a = self.almacen_obstaculos
+        banderas, columna_x, columna_ancho = a.banderas, a.x, a.ancho
+        x_jugador = self.jugador.x
         for obst in self.obstaculos_activos:
             obst.actualizar()
-            if self.jugador.rectangulo.colliderect(obst.obtener_rectangulo_colision()):
-                self.estado = "GAME_OVER"
-                self.reproducir_sonido_lose()
-            if not obst.fue_superado and self.jugador.x > obst.x + obst.ancho:
-                obst.fue_superado = True
+            i = obst.indice
+            if not banderas[i] & BANDERA_SUPERADO and x_jugador > columna_x[i] + columna_ancho[i]:
+                banderas[i] |= BANDERA_SUPERADO
                 self.puntuacion += 1
-                if self.puntuacion >= 10:
-                    if self.nivel_actual == 1:
-                        self.inicializar_partida_nivel2()
+                if self.puntuacion >= self.campaña.puntos[self.nivel_actual]:
+                    if self.nivel_actual < len(self.campaña):
+                        self.iniciar_nivel(self.nivel_actual + 1)
                     else:
                         self.estado = "WIN"
                         self.reproducir_sonido_win()
 
-        self.obstaculos_activos = [o for o in self.obstaculos_activos if o.x + o.ancho > 0]
+        # En nivel 2 las velocidades difieren: se reordena el barrido y solo se prueban los que solapan al jugador
+        self.barrido_obstaculos.reordenar()
+        rect = self.jugador.rectangulo
+        for obst in self.barrido_obstaculos.candidatos(rect.left, rect.right):
+            if rect.colliderect(obst.rectangulo_colision):
+                self.estado = "GAME_OVER"
+                self.reproducir_sonido_lose()
+
+        for obst in self.barrido_obstaculos.retirar(lambda o: o.x + o.ancho <= 0):
+            self.pools[type(obst)].devolver(obst)
+
+    def avanzar_tramo(self):
+        # Modo infinito: se pasa al siguiente tramo, ya generado, y el anterior se descarta
+        self.iniciar_linea_tiempo(NIVEL_INFINITO, self.frame_nivel)
+        return self.linea_tiempo
+
+    def en_curso(self):
+        return self.estado == "JUGANDO"
+
+    def partida_ganada(self):
+        return self.estado == "WIN"
+
+    # Instantáneas: el estado entre ticks en un buffer plano (bytes). El azar ya está sorteado
+    # en el plan de la partida, así que basta la semilla (en dos mitades de 32 bits) y los
+    # cursores; mapas y tamaño de pantalla no viajan
+    def instantanea(self):
+        jugador, semilla = self.jugador, self.flujos.semilla
+        datos = [VERSION_INSTANTANEA, semilla >> 32, semilla & 0xFFFFFFFF, ESTADOS.index(self.estado),
+                 self.nivel_actual, self.puntuacion, self.frame_nivel, self.cursor_obstaculos,
+                 jugador.y, jugador.velocidad_y, jugador.esta_saltando, self.suelo.x, len(self.obstaculos_activos)]
+        a = self.almacen_obstaculos
+        for obst in self.obstaculos_activos:
+            i = obst.indice
+            r, g, b = a.paleta[a.color[i]]
+            datos += (CLASES_OBSTACULO.index(type(obst)), a.x[i], a.y[i], a.ancho[i], a.velocidad[i], r << 16 | g << 8 | b,
+                      a.banderas[i], a.direccion[i], a.limite_superior[i], a.limite_inferior[i])
+        return array("q", datos).tobytes()
+
+    def restaurar(self, instantanea):
+        datos = array("q")
+        datos.frombytes(instantanea)
+        if datos[0] != VERSION_INSTANTANEA:
+            raise ValueError("Instantánea de otra versión del motor")
+        (_, alta, baja, estado, nivel, puntuacion, frame_nivel, cursor, y, velocidad_y, saltando,
+         x_suelo, n_obstaculos) = datos[:CAMPOS_CABECERA]
+        semilla = alta << 32 | baja
+        if semilla != self.flujos.semilla:
+            self.planificar_partida(semilla)
+        self.plan_sin_usar = False
+        if not hasattr(self, "jugador"):
+            self.inicializar_partida()
+        self.puntuacion = puntuacion
+        self.estado, self.nivel_actual = ESTADOS[estado], nivel
+        self.iniciar_linea_tiempo(nivel, frame_nivel)
+        self.cursor_obstaculos = cursor
+        jugador = self.jugador
+        jugador.y, jugador.velocidad_y, jugador.esta_saltando = y, velocidad_y, bool(saltando)
+        jugador.actualizar_rectangulo()
+        jugador.guardar_posicion()
+        self.suelo.x = x_suelo
+        self.suelo.actualizar_rectangulo()
+        self.suelo.guardar_posicion()
+        # Los obstáculos vuelven a sus pools y se reconstruyen en el orden del barrido
+        self.devolver_obstaculos()
+        self.barrido_obstaculos.vaciar()
+        a = self.almacen_obstaculos
+        for pos in range(CAMPOS_CABECERA, CAMPOS_CABECERA + n_obstaculos * CAMPOS_OBSTACULO, CAMPOS_OBSTACULO):
+            clase, x, y, ancho, velocidad, color, banderas, direccion, superior, inferior = datos[pos:pos + CAMPOS_OBSTACULO]
+            clase = CLASES_OBSTACULO[clase]
+            argumentos = (x, y, ancho, (color >> 16, color >> 8 & 255, color & 255), velocidad, self.ancho_pantalla)
+            if clase is ObstaculoNivel2:
+                argumentos += (bool(banderas & BANDERA_VERTICAL),)
+            obst = self.pools[clase].obtener(*argumentos)
+            i = obst.indice
+            a.banderas[i], a.direccion[i], a.limite_superior[i], a.limite_inferior[i] = banderas, direccion, superior, inferior
+            self.barrido_obstaculos.insertar(obst)
+
+    def simular(self, saltos=(), max_frames=100000):
+        # Avanza la partida sin límite de FPS mientras se esté jugando; salta en los frames indicados
+        saltos = set(saltos)
+        frame = 0
+        while frame < max_frames and self.en_curso():
+            if frame in saltos:
+                self.jugador.saltar()
+            self.actualizar_juego()
+            frame += 1
+        return frame
+
+# --- CLASE JUEGO PRINCIPAL ---
+PRESUPUESTO_ARRANQUE_MS = 500
+OBSTACULOS_RITMO = 20
+
+class Juego(MotorJuego):
+    def __init__(self, ticks_por_segundo=60, fps_render=60, semilla=None,
+                 directorio_grabaciones=DIRECTORIO_GRABACIONES, perfilar=False, ritmo=False, informar=None):
+        super().__init__(semilla)
+        self.inicio_arranque = time.perf_counter()
+        # Tiempos de carga de cada recurso y del arranque; por defecto no se informa de nada
+        self.informar = informar
+        pygame.init()
+        pygame.mixer.init()
+        self.pantalla = pygame.display.set_mode((self.ancho_pantalla, self.alto_pantalla))
+        pygame.display.set_caption("Geometry Dash + Nivel 2")
+        self.reloj = pygame.time.Clock()
+        # La simulación avanza a ticks fijos; el dibujo va a fps_render (0 = sin límite)
+        self.paso_fijo = PasoFijo(ticks_por_segundo)
+        self.fps_render = fps_render
+        self.recursos = GestorRecursos(informar=self.informar)
+        tamaño = (self.ancho_pantalla, self.alto_pantalla)
+        for etapa in self.campaña.niveles + [self.campaña.infinito]:
+            self.recursos.registrar(etapa["fondo"], lambda ruta=etapa["fondo"]: cargar_imagen_escalada(ruta, tamaño))
+        # El menú necesita el fondo del nivel 1 ya; lo demás espera a que se acerque su nivel
+        self.fondo = self.recursos.obtener(self.campaña[1]["fondo"])
+        self.tiras_fondo = {}  # fondo -> tira con el suelo, se crea al dibujarlo por primera vez
+        # (flujos, nivel, futuro) del plan que se sortea en segundo plano (ver precargar_nivel)
+        self.plan_siguiente = None
+        self.fuente_grande = pygame.font.Font(None, 74)
+        self.fuente_normal = pygame.font.Font(None, 48)
+        self.cache_textos = CacheTextos()
+        self.sprites = CacheSprites()
+        self.hud = MarcadorHUD(self.cache_textos, self.fuente_normal, "Nivel {} - Puntos: {}", self.colores["BLANCO"])
+        self.cargar_audio()
+        self.menu = Menu(self.pantalla, self.fuente_grande, self.fuente_normal, self.colores, self.cache_textos)
+        # Cada partida se graba (semilla y saltos por frame) para poder repetirla sin ventana; ver repeticion.py
+        self.grabador = Grabador(directorio_grabaciones)
+        # Tiempos por fase de cada frame; F3 muestra el overlay y F4 exporta (ver perfilador.py)
+        self.perfilador = PerfiladorFrames(activo=perfilar)
+        # Con ritmo=True el nivel 1 sigue los beats de su pista (mapa ya analizado con ritmo.py)
+        self.ritmo = ritmo and self.usar_mapa_ritmo()
+        self.esperando_pista = False
+        self.precargar_nivel(1)
+        self.precargar_nivel(NIVEL_INFINITO)
+
+    def usar_mapa_ritmo(self):
+        pista = self.campaña[1]["musica"]
+        mapa = cargar_mapa(pista)
+        if mapa is None:
+            print(f"{pista} no tiene mapa de ritmo (python ritmo.py): se juega el nivel 1 normal")
+            return False
+        self.mapa_nivel_1_distancias = distancias_ritmo(mapa, self.velocidad_juego, OBSTACULOS_RITMO,
+                                                        ticks_por_segundo=self.paso_fijo.ticks_por_segundo)
+        return True
+
+    def cargar_audio(self):
+        # Música de cada nivel (por ruta) y efectos, decodificados en segundo plano y residentes (ver audio.py)
+        self.audio = GestorAudio(self.recursos, informar=self.informar)
+        for etapa in self.campaña.niveles + [self.campaña.infinito]:
+            self.audio.registrar(etapa["musica"], etapa["musica"], 0.1)
+        self.audio.registrar("sonido_win", "win.mp3")
+        self.audio.registrar("sonido_lose", "lose.mp3")
+        self.audio.precargar("sonido_win", "sonido_lose")
+
+    def precargar_nivel(self, nivel):
+        # Fondo y música del nivel en el hilo de recursos y, si le toca, su plan: se sortea con los
+        # flujos de la partida, que nadie más usa hasta que plan_nivel recoge el resultado
+        etapa = self.campaña[nivel]
+        self.recursos.precargar(etapa["fondo"])
+        self.audio.precargar(etapa["musica"])
+        if nivel == len(self.planes) + 1 and self.plan_siguiente is None:
+            futuro = self.recursos.en_segundo_plano(self.planificar_nivel, nivel, self.flujos)
+            self.plan_siguiente = (self.flujos, nivel, futuro)
+
+    def plan_nivel(self, nivel):
+        if self.plan_siguiente is not None:
+            flujos, siguiente, futuro = self.plan_siguiente
+            if flujos is not self.flujos:
+                self.plan_siguiente = None  # de una partida anterior
+            elif siguiente <= nivel:
+                # Se espera al sorteo de fondo en vez de repetirlo; normalmente ya terminó
+                self.planes[siguiente] = futuro.result()
+                self.plan_siguiente = None
+        return super().plan_nivel(nivel)
+
+    def iniciar_nivel(self, nivel):
+        self.fondo = self.recursos.obtener(self.campaña[nivel]["fondo"])
+        super().iniciar_nivel(nivel)
+        # Mientras se juega este nivel se prepara el siguiente
+        if 0 < nivel < len(self.campaña):
+            self.precargar_nivel(nivel + 1)
+
+    def restaurar(self, instantanea):
+        super().restaurar(instantanea)
+        self.fondo = self.recursos.obtener(self.campaña[self.nivel_actual]["fondo"])
+
+    def reproducir_musica_juego(self):
+        # Al ritmo, el nivel 1 arranca con su pista desde el principio
+        desde_inicio = self.ritmo and self.nivel_actual == 1
+        self.audio.musica(self.campaña[self.nivel_actual]["musica"], desde_inicio=desde_inicio)
+        # Si la pista aún se decodifica el nivel espera a que suene (ver ejecutar_juego)
+        self.esperando_pista = desde_inicio and self.audio.esperando_inicio()
+
+    def reproducir_sonido_win(self):
+        self.audio.pausar_musica()
+        self.audio.efecto("sonido_win")
+
+    def reproducir_sonido_lose(self):
+        self.audio.pausar_musica()
+        self.audio.efecto("sonido_lose")
+
+    def nueva_partida(self, nivel=1):
+        super().nueva_partida(nivel)
+        self.grabador.comenzar(self, "12", self.flujos.semilla, nivel)
+
+    def actualizar_juego(self):
+        super().actualizar_juego()
+        self.grabador.tick()
+
+    def informar_arranque(self):
+        if not self.informar:
+            return
+        ms = (time.perf_counter() - self.inicio_arranque) * 1000
+        aviso = " (supera el presupuesto)" if ms > PRESUPUESTO_ARRANQUE_MS else ""
+        self.informar(f"Primer frame del menú en {ms:.1f} ms, presupuesto {PRESUPUESTO_ARRANQUE_MS} ms{aviso}")
+
+    def guardar_posiciones(self):
+        self.jugador.guardar_posicion()
+        self.suelo.guardar_posicion()
+        for obst in self.obstaculos_activos:
+            obst.guardar_posicion()
+
+    def manejar_eventos_juego(self, eventos):
+        for e in eventos:
+            if e.type == pygame.QUIT: return "SALIR"
+            if e.type == pygame.KEYDOWN and e.key == pygame.K_SPACE:
+                self.jugador.saltar()
+                self.grabador.salto()
+        return None
+
+    def manejar_eventos_fin_partida(self, eventos):
+        for e in eventos:
+            if e.type == pygame.QUIT: return "SALIR"
+            if e.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN): return "VOLVER_AL_MENU"
+        return None
 
-    def dibujar_juego(self):
-        self.suelo.dibujar(self.pantalla, self.fondo)
-        self.jugador.dibujar(self.pantalla)
+    def dibujar_juego(self, alfa=1.0):
+        marcar = self.perfilador.marcar
+        tira = self.tiras_fondo.get(self.fondo)
+        if tira is None:
+            tira = self.tiras_fondo[self.fondo] = self.suelo.crear_tira(self.fondo)
+        # El fondo va en la misma tira que el suelo
+        self.suelo.dibujar(self.pantalla, tira, alfa)
+        marcar("suelo")
+        self.jugador.dibujar(self.pantalla, alfa)
+        marcar("jugador")
         for obst in self.obstaculos_activos:
-            obst.dibujar(self.pantalla)
-        texto = self.fuente_normal.render(f"Nivel {self.nivel_actual} - Puntos: {self.puntuacion}", True, self.colores["BLANCO"])
-        self.pantalla.blit(texto, (20, 20))
+            obst.dibujar(self.pantalla, alfa, self.sprites)
+        marcar("obstaculos")
+        self.pantalla.blit(self.hud.superficie(self.nivel_actual or "∞", self.puntuacion), (20, 20))
+        marcar("hud")
 
     def dibujar_pantalla_final(self, mensaje):
         self.dibujar_juego()
-        overlay = pygame.Surface((self.ancho_pantalla, self.alto_pantalla), pygame.SRCALPHA)
-        overlay.fill((0,0,0,150))
-        self.pantalla.blit(overlay, (0,0))
-        final = self.fuente_grande.render(mensaje, True, self.colores["BLANCO"])
-        reiniciar = self.fuente_normal.render("Click o ESPACIO para volver al Menú", True, (200,200,200))
+        self.pantalla.blit(self.sprites.superposicion((self.ancho_pantalla, self.alto_pantalla), (0,0,0), 150), (0,0))
+        final = self.cache_textos.render(self.fuente_grande, mensaje, True, self.colores["BLANCO"])
+        reiniciar = self.cache_textos.render(self.fuente_normal, "Click o ESPACIO para volver al Menú", True, (200,200,200))
         self.pantalla.blit(final, (self.ancho_pantalla//2 - final.get_width()//2, 250))
         self.pantalla.blit(reiniciar, (self.ancho_pantalla//2 - reiniciar.get_width()//2, 330))
+        self.perfilador.marcar("hud")
 
     def ejecutar_juego(self):
+        perfilador = self.perfilador
         corriendo = True
         while corriendo:
-            eventos = pygame.event.get()
+            perfilador.comenzar_frame()
+            self.audio.actualizar()
+            eventos = [e for e in pygame.event.get() if not perfilador.manejar_evento(e)]
             mouse_pos = pygame.mouse.get_pos()
+            perfilador.marcar("eventos")
             if self.estado == "MENU":
                 self.menu.dibujar(self.fondo, mouse_pos)
+                perfilador.marcar("menu")
                 acc = self.menu.manejar_eventos(eventos)
-                if acc == "INICIAR_JUEGO":
-                    self.nivel_actual = 1
-                    self.inicializar_partida()
-                    self.estado = "JUGANDO"
+                if acc in ("INICIAR_JUEGO", "INICIAR_INFINITO"):
+                    self.nueva_partida(NIVEL_INFINITO if acc == "INICIAR_INFINITO" else 1)
+                    self.paso_fijo.reiniciar()
                 elif acc == "SALIR":
                     corriendo = False
             elif self.estado == "JUGANDO":
-                self.actualizar_juego()
-                self.dibujar_juego()
+                if self.esperando_pista:
+                    # Al ritmo, la simulación arranca en el frame en que audio.actualizar() hace sonar la pista
+                    self.esperando_pista = self.audio.esperando_inicio()
+                    self.paso_fijo.reiniciar()
+                for _ in range(self.paso_fijo.ticks_pendientes()):
+                    if not self.en_curso():
+                        break
+                    self.guardar_posiciones()
+                    self.actualizar_juego()
+                perfilador.marcar("actualizar")
+                self.dibujar_juego(self.paso_fijo.alfa)
                 if self.manejar_eventos_juego(eventos) == "SALIR":
                     corriendo = False
             elif self.estado == "GAME_OVER":
@@ -312,10 +722,24 @@ class Juego:
                 elif acc == "SALIR":
                     corriendo = False
 
+            if perfilador.overlay_visible:
+                perfilador.dibujar(self.pantalla)
+                perfilador.marcar("overlay")
             pygame.display.flip()
-            self.reloj.tick(60)
+            perfilador.marcar("flip")
+            if self.inicio_arranque is not None:
+                self.informar_arranque()
+                self.inicio_arranque = None
+            self.reloj.tick(self.fps_render)
+            perfilador.marcar("espera")
+            perfilador.terminar_frame(len(self.obstaculos_activos))
+        self.grabador.terminar()
+        self.recursos.cerrar()
         pygame.quit()
 
 if __name__ == "__main__":
-    juego = Juego()
+    parser = argparse.ArgumentParser(description="Geometry Dash + Nivel 2")
+    parser.add_argument("--informar", action="store_true", help="muestra los tiempos de carga y de arranque")
+    args = parser.parse_args()
+    juego = Juego(informar=print if args.informar else None)
     juego.ejecutar_juego()
@@ -0,0 +1,143 @@
+from collections import OrderedDict
+
+import pygame
+
+# ----------------------------- Gestor de audio -----------------------------
+# Música y efectos se decodifican una sola vez (pygame.mixer.Sound, en el hilo de fondo de
+# GestorRecursos) y se quedan en memoria mientras quepan en el presupuesto; si no caben se
+# descartan los que hace más tiempo que no se usan, nunca la pista que suena o la que espera.
+#
+# La música suena en dos canales reservados: cambiar de pista funde la anterior con la nueva
+# (lo hace SDL_mixer, el bucle no espera) y, si la nueva aún se está decodificando, la
+# anterior sigue sonando hasta que actualizar() la encuentra lista. Perder o ganar pausa la
+# música; volver a pedir la misma pista la reanuda donde iba, sin cargar nada. Un nivel al
+# ritmo de su pista la pide desde_inicio: suena desde el principio y sin fundido en cuanto
+# está decodificada (en ese mismo frame si ya lo estaba); hasta entonces esperando_inicio()
+# es True y el juego no empieza el nivel.
+
+PRESUPUESTO_AUDIO_MB = 32
+FUNDIDO_MS = 1000
+CANALES_MUSICA = 2
+
+
+class GestorAudio:
+    def __init__(self, recursos, presupuesto_mb=PRESUPUESTO_AUDIO_MB, informar=None):
+        self.recursos = recursos
+        self.presupuesto = presupuesto_mb * 2 ** 20
+        self.informar = informar
+        self.tamaños = OrderedDict()  # residentes, del uso más antiguo al más reciente -> bytes
+        self.fallidos = set()
+
+        pygame.mixer.set_reserved(CANALES_MUSICA)
+        self.canales_musica = [pygame.mixer.Channel(i) for i in range(CANALES_MUSICA)]
+        self.canal = 0
+        self.pista = None
+        self.en_pausa = False
+        self.pendiente = None
+        self.fundido_pendiente = FUNDIDO_MS
+        self.desde_inicio = False  # la pendiente se pidió desde_inicio
+
+    @property
+    def memoria(self):
+        return sum(self.tamaños.values())
+
+    def registrar(self, nombre, ruta, volumen=1.0):
+        def cargar():
+            sonido = pygame.mixer.Sound(ruta)
+            sonido.set_volume(volumen)
+            return sonido
+        self.recursos.registrar(nombre, cargar)
+
+    def precargar(self, *nombres):
+        self.recursos.precargar(*nombres)
+
+    def obtener(self, nombre):
+        # Espera a la decodificación si hace falta; None si el audio no se pudo cargar
+        if nombre in self.fallidos:
+            return None
+        try:
+            sonido = self.recursos.obtener(nombre)
+        except pygame.error as e:
+            if self.informar:
+                self.informar(f"Error al cargar audio '{nombre}': {e}")
+            self.fallidos.add(nombre)
+            return None
+        if nombre not in self.tamaños:
+            frecuencia, formato, canales = pygame.mixer.get_init()
+            self.tamaños[nombre] = round(sonido.get_length() * frecuencia) * canales * (abs(formato) // 8)
+        self.tamaños.move_to_end(nombre)
+        self._liberar(nombre)
+        return sonido
+
+    def _liberar(self, usado):
+        # Descarta por antigüedad de uso hasta volver al presupuesto
+        protegidos = {usado, self.pista, self.pendiente}
+        for nombre in list(self.tamaños):
+            if self.memoria <= self.presupuesto:
+                break
+            if nombre not in protegidos:
+                del self.tamaños[nombre]
+                self.recursos.descartar(nombre)
+                if self.informar:
+                    self.informar(f"Audio '{nombre}' descartado ({self.memoria / 2 ** 20:.1f} MB residentes)")
+
+    def efecto(self, nombre):
+        sonido = self.obtener(nombre)
+        if sonido is not None:
+            sonido.play()
+
+    # ------- Música -------
+
+    def musica(self, nombre, fundido_ms=FUNDIDO_MS, desde_inicio=False):
+        canal = self.canales_musica[self.canal]
+        if not desde_inicio and nombre == self.pista and (self.en_pausa or canal.get_busy()):
+            canal.unpause()
+            self.en_pausa = False
+            self.pendiente = None
+            return
+        if nombre in self.fallidos:
+            return
+        self.pendiente, self.fundido_pendiente = nombre, 0 if desde_inicio else fundido_ms
+        self.desde_inicio = desde_inicio
+        if self.recursos.listo(nombre):
+            self._cambiar_pista()
+        else:
+            self.recursos.precargar(nombre)
+
+    def actualizar(self):
+        # Una vez por frame: arranca la pista pedida en cuanto termina de decodificarse
+        if self.pendiente is not None and self.recursos.listo(self.pendiente):
+            self._cambiar_pista()
+
+    def esperando_inicio(self):
+        # Una pista pedida desde_inicio aún se decodifica
+        return self.pendiente is not None and self.desde_inicio
+
+    def _cambiar_pista(self):
+        nombre, fundido_ms = self.pendiente, self.fundido_pendiente
+        self.pendiente = None
+        sonido = self.obtener(nombre)
+        if sonido is None:
+            return
+        anterior = self.canales_musica[self.canal]
+        if self.en_pausa or not fundido_ms:
+            anterior.stop()
+        else:
+            anterior.fadeout(fundido_ms)
+        self.canal = (self.canal + 1) % CANALES_MUSICA
+        self.canales_musica[self.canal].play(sonido, loops=-1, fade_ms=fundido_ms)
+        self.pista = nombre
+        self.en_pausa = False
+        # La pista anterior deja de estar protegida (SDL la conserva hasta acabar el fundido)
+        self._liberar(nombre)
+
+    def pausar_musica(self):
+        self.canales_musica[self.canal].pause()
+        self.en_pausa = self.pista is not None
+        self.pendiente = None
+
+    def detener(self):
+        for canal in self.canales_musica:
+            canal.stop()
+        self.pista = self.pendiente = None
+        self.en_pausa = False
@@ -0,0 +1,203 @@
+import argparse
+import os
+import time
+from collections import deque
+
+from evaluador import crear_motor
+from repeticion import Grabacion
+
+# ----------------------------- Autojugador por búsqueda -----------------------------
+# Juega un nivel buscando en qué frames saltar, con MotorJuego.actualizar_juego como única
+# física. El motor se ramifica con instantanea()/restaurar() solo donde saltar cambia algo
+# (jugador.esta_saltando es False); en el aire se avanza sin ramificar. Obstáculos y
+# plataformas dependen solo del frame del nivel, así que un estado del motor queda
+# identificado por (frame, y, velocidad_y, saltando) y cada uno se explora una vez.
+#
+# - Por defecto busca la solución con menos saltos: búsqueda en anchura 0-1 (no saltar cuesta
+#   0, saltar 1). Es la repetición de referencia del nivel.
+# - rapido=True busca en profundidad prefiriendo no saltar y recuerda los estados sin salida:
+#   saltar lo más tarde posible basta casi siempre y sirve para certificar un nivel.
+
+MARGEN_FRAMES = 120  # tras el último spawn, frames para que cruce la pantalla
+
+SIGUE, PASADO, PERDIDO = 0, 1, 2
+
+
+class Solucion:
+    def __init__(self, posible, saltos=(), frames=0, estados=0, segundos=0.0):
+        self.posible = posible
+        self.saltos = saltos      # frames (desde el inicio del nivel) en que llamar a saltar()
+        self.frames = frames      # actualizaciones hasta pasar el nivel
+        self.estados = estados    # llamadas a actualizar_juego durante la búsqueda
+        self.segundos = segundos
+
+    def __repr__(self):
+        return (f"Solucion(posible={self.posible}, saltos={len(self.saltos)}, frames={self.frames}, "
+                f"estados={self.estados}, ms={self.segundos * 1000:.1f})")
+
+
+def _clave(motor):
+    jugador = motor.jugador
+    return motor.frame_nivel, jugador.y, jugador.velocidad_y, jugador.esta_saltando
+
+
+def _paso(motor, nivel):
+    motor.actualizar_juego()
+    if motor.partida_ganada() or motor.nivel_actual != nivel:
+        return PASADO
+    return SIGUE if motor.en_curso() else PERDIDO
+
+
+def _limite(motor):
+    frames = motor.linea_tiempo.frames_obstaculos
+    return (frames[-2] if len(frames) > 1 else 0) + MARGEN_FRAMES
+
+
+def resolver_nivel(motor, rapido=False):
+    # Busca desde el estado actual del motor hasta que cambia de nivel o gana la partida.
+    # Si hay solución el motor queda justo después de pasar el nivel; si no, como estaba
+    inicio = time.perf_counter()
+    instantanea = motor.instantanea()
+    buscar = _primer_camino if rapido else _menos_saltos
+    posible, saltos, frames, estados, final = buscar(motor, motor.nivel_actual, _limite(motor))
+    motor.restaurar(final if posible else instantanea)
+    return Solucion(posible, saltos, frames, estados, time.perf_counter() - inicio)
+
+
+def _menos_saltos(motor, nivel, limite):
+    base = motor.frame_nivel
+    # Cola de nodos (saltos, clave, instantánea, camino); camino indexa `enlaces`, que guarda
+    # (camino anterior, frame del salto) solo al saltar: no saltar no alarga el camino
+    cola = deque([(0, _clave(motor), motor.instantanea(), -1)])
+    vistos = {cola[0][1]: 0}
+    enlaces = []
+    mejor = None  # (saltos, camino, frames, instantánea)
+    estados = 0
+    while cola:
+        saltos, clave, instantanea, camino = cola.popleft()
+        if mejor is not None and saltos >= mejor[0]:
+            break
+        if vistos[clave] < saltos:
+            continue
+        frame = clave[0] - base
+        for saltar in (False, True):
+            motor.restaurar(instantanea)
+            coste, siguiente, pasos = saltos, camino, 0
+            if saltar:
+                motor.jugador.saltar()
+                enlaces.append((camino, frame))
+                coste, siguiente = saltos + 1, len(enlaces) - 1
+            while True:
+                resultado = _paso(motor, nivel)
+                pasos += 1
+                if resultado != SIGUE or not motor.jugador.esta_saltando:
+                    break
+            estados += pasos
+            if resultado == PASADO:
+                if mejor is None or coste < mejor[0]:
+                    mejor = (coste, siguiente, frame + pasos, motor.instantanea())
+                continue
+            if resultado == PERDIDO or motor.frame_nivel > limite:
+                continue
+            nueva = _clave(motor)
+            if vistos.get(nueva, coste + 1) <= coste:
+                continue
+            vistos[nueva] = coste
+            nodo = (coste, nueva, motor.instantanea(), siguiente)
+            if saltar:
+                cola.append(nodo)
+            else:
+                cola.appendleft(nodo)
+
+    if mejor is None:
+        return False, [], 0, estados, None
+    coste, camino, frames, final = mejor
+    saltos = []
+    while camino >= 0:
+        camino, frame = enlaces[camino]
+        saltos.append(frame)
+    saltos.reverse()
+    return True, saltos, frames, estados, final
+
+
+def _primer_camino(motor, nivel, limite):
+    base = motor.frame_nivel
+    muertos = set()    # estados desde los que ningún camino pasa el nivel
+    camino = []        # claves del camino actual
+    decisiones = []    # [instantánea, posición en camino, saltos hechos, salto ya probado]
+    saltos = []
+    estados = 0
+    while True:
+        clave = _clave(motor)
+        if clave in muertos or clave[0] > limite:
+            resultado = PERDIDO
+        else:
+            camino.append(clave)
+            if not clave[3]:
+                decisiones.append([motor.instantanea(), len(camino) - 1, len(saltos), False])
+            resultado = _paso(motor, nivel)
+            estados += 1
+
+        # Al perder se vuelve a la última decisión: primero se prueba saltar y, si ya se
+        # probó, ese estado tampoco tiene salida
+        while resultado == PERDIDO:
+            if not decisiones:
+                return False, [], 0, estados, None
+            decision = decisiones[-1]
+            instantanea, pos, hechos, probado = decision
+            if probado:
+                muertos.update(camino[pos:])
+                del camino[pos:]
+                decisiones.pop()
+                continue
+            muertos.update(camino[pos + 1:])
+            del camino[pos + 1:]
+            del saltos[hechos:]
+            decision[3] = True
+            motor.restaurar(instantanea)
+            saltos.append(camino[pos][0] - base)
+            motor.jugador.saltar()
+            resultado = _paso(motor, nivel)
+            estados += 1
+
+        if resultado == PASADO:
+            return True, saltos, camino[-1][0] - base + 1, estados, motor.instantanea()
+
+
+def resolver_partida(juego, semilla=None, nivel=1, rapido=False, mapa=None):
+    # Resuelve nivel tras nivel y devuelve la grabación de referencia y la solución de cada nivel
+    motor = crear_motor(juego, mapa, semilla)
+    motor.nueva_partida(nivel)
+    # 12.py sortea su semilla si no se fija: se guarda la que usó para poder repetirla
+    semilla = motor.flujos.semilla if hasattr(motor, "flujos") else (semilla or 0)
+    grabacion = Grabacion(juego, semilla, nivel, mapa=mapa)
+    soluciones = []
+    while motor.en_curso():
+        solucion = resolver_nivel(motor, rapido)
+        soluciones.append(solucion)
+        if not solucion.posible:
+            break
+        grabacion.saltos.extend(grabacion.frames + frame for frame in solucion.saltos)
+        grabacion.frames += solucion.frames
+    grabacion.puntuacion = motor.puntuacion
+    grabacion.nivel_final = motor.nivel_actual
+    return grabacion, soluciones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Certifica niveles jugándolos con búsqueda sobre el motor")
+    parser.add_argument("--juego", choices=["main", "12"], default="main")
+    parser.add_argument("--semillas", type=int, nargs=2, default=(0, 1), metavar=("INICIO", "FIN"))
+    parser.add_argument("--rapido", action="store_true", help="cualquier solución en vez de la de menos saltos")
+    parser.add_argument("--guardar", metavar="DIRECTORIO", help="guarda las repeticiones de referencia")
+    args = parser.parse_args()
+
+    if args.guardar:
+        os.makedirs(args.guardar, exist_ok=True)
+    for semilla in range(*args.semillas):
+        grabacion, soluciones = resolver_partida(args.juego, semilla, rapido=args.rapido)
+        completa = all(solucion.posible for solucion in soluciones)
+        for nivel, solucion in enumerate(soluciones, 1):
+            print(f"semilla {semilla}, nivel {nivel}: {solucion}")
+        if completa and args.guardar:
+            grabacion.guardar(os.path.join(args.guardar, f"referencia-{args.juego}-{semilla}.rep"))
@@ -0,0 +1,38 @@
+import random
+from array import array
+
+# ----------------------------- Flujos de azar sembrados -----------------------------
+# Cada partida tiene su semilla y de ella salen flujos independientes por propósito
+# (distancias del mapa, tipo, tamaño, color, velocidad y movimiento vertical de los obstáculos).
+# Cambiar cuántos números consume un propósito no altera los de los demás, y la misma
+# semilla da exactamente la misma partida. Los parámetros de un nivel se sortean todos
+# juntos al empezarlo, en arreglos, en vez de un randint por obstáculo durante el juego.
+
+PROPOSITOS = ("distancias", "tipos", "tamaño", "color", "velocidad", "vertical")
+
+
+def nueva_semilla():
+    # Para partidas sin semilla fija: sale del sistema, no del estado global de random
+    return random.SystemRandom().getrandbits(64)
+
+
+class FlujosAzar:
+    def __init__(self, semilla):
+        self.semilla = semilla
+        # Semilla de texto: random la deriva con SHA-512, estable entre ejecuciones y plataformas
+        self.flujos = {proposito: random.Random(f"{semilla}/{proposito}") for proposito in PROPOSITOS}
+        self.distancias = self.flujos["distancias"]
+        self.tipos = self.flujos["tipos"]
+        self.tamaño = self.flujos["tamaño"]
+        self.color = self.flujos["color"]
+        self.velocidad = self.flujos["velocidad"]
+        self.vertical = self.flujos["vertical"]
+
+
+def enteros(flujo, minimo, maximo, cantidad):
+    # `cantidad` enteros uniformes en [minimo, maximo] sorteados de una vez
+    return array("i", flujo.choices(range(minimo, maximo + 1), k=cantidad))
+
+
+def booleanos(flujo, cantidad):
+    return array("B", flujo.choices((1, 0), k=cantidad))
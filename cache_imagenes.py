@@ -0,0 +1,66 @@
+import hashlib
+import mmap
+import os
+
+import pygame
+
+# ----------------------------- Caché de imágenes en disco -----------------------------
+# La primera vez que se pide una imagen a un tamaño dado se decodifica, se escala, se
+# convierte al formato de la pantalla y se guardan sus píxeles crudos en disco. Las
+# siguientes veces se mapea el archivo en memoria y se crea la superficie con
+# pygame.image.frombuffer: sin decodificar ni escalar, y con blits sin conversión.
+# La clave es el hash del archivo de origen, el tamaño y el formato de píxel, así que
+# cambiar la imagen o la resolución invalida la entrada sola.
+
+DIRECTORIO_CACHE = ".cache_imagenes"
+
+
+def _formato_pantalla():
+    # Formato de frombuffer cuyo orden de bytes coincide con el de la pantalla
+    mascaras = pygame.display.get_surface().get_masks()
+    return "RGBX" if mascaras[:3] == (0xFF, 0xFF00, 0xFF0000) else "BGRA"
+
+
+def ruta_en_cache(ruta, tamaño, formato, directorio=DIRECTORIO_CACHE):
+    with open(ruta, "rb") as archivo:
+        huella = hashlib.sha256(archivo.read()).hexdigest()[:16]
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    return os.path.join(directorio, f"{nombre}-{huella}-{tamaño[0]}x{tamaño[1]}-{formato}.raw")
+
+
+def _preprocesar(ruta, tamaño, formato, destino):
+    imagen = pygame.transform.scale(pygame.image.load(ruta), tamaño).convert()
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporal = destino + ".tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(pygame.image.tobytes(imagen, formato))
+    os.replace(temporal, destino)
+    return imagen
+
+
+def cargar_imagen_escalada(ruta, tamaño, directorio=DIRECTORIO_CACHE):
+    # Requiere la pantalla ya creada (el formato de destino es el suyo)
+    formato = _formato_pantalla()
+    destino = ruta_en_cache(ruta, tamaño, formato, directorio)
+    if not os.path.exists(destino) or os.path.getsize(destino) != tamaño[0] * tamaño[1] * 4:
+        return _preprocesar(ruta, tamaño, formato, destino)
+
+    with open(destino, "rb") as archivo:
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+    imagen = pygame.image.frombuffer(mapa, tamaño, formato)
+    if imagen.get_flags() & pygame.SRCALPHA:
+        # Mismo orden de bytes que la pantalla pero con canal alfa: una copia directa, una sola vez
+        imagen = imagen.convert()
+    return imagen
+
+
+if __name__ == "__main__":
+    # Paso de preparación: genera la caché de los fondos sin abrir una ventana visible
+    import sys
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    for ruta in sys.argv[1:] or ["bg.png", "nivel2.jpeg"]:
+        cargar_imagen_escalada(ruta, (800, 600))
+        print(f"{ruta} -> {ruta_en_cache(ruta, (800, 600), _formato_pantalla())}")
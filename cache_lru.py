@@ -0,0 +1,30 @@
+from collections import OrderedDict
+
+# ----------------------------- Caché LRU -----------------------------
+# Base común de CacheTextos y CacheSprites: guarda lo construido por clave, expulsa
+# la entrada usada hace más tiempo al superar la capacidad y cuenta aciertos y
+# fallos para el perfilado.
+
+class CacheLRU:
+    def __init__(self, capacidad):
+        self.capacidad = capacidad
+        self.entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave, construir):
+        valor = self.entradas.get(clave)
+        if valor is not None:
+            self.aciertos += 1
+            self.entradas.move_to_end(clave)
+            return valor
+
+        self.fallos += 1
+        valor = construir()
+        self.entradas[clave] = valor
+        if len(self.entradas) > self.capacidad:
+            self.entradas.popitem(last=False)
+        return valor
+
+    def __len__(self):
+        return len(self.entradas)
@@ -0,0 +1,68 @@
+from bisect import bisect_left
+
+# ----------------------------- Fase amplia de colisiones -----------------------------
+# Barrido en x: los objetos activos se guardan ordenados por el borde izquierdo de su
+# rectángulo de colisión. Como todos se desplazan a la izquierda, el orden casi no cambia
+# entre frames y se mantiene con inserciones y una pasada de ordenación por inserción.
+# Solo los objetos que solapan el intervalo en x del jugador llegan a la fase estrecha.
+
+class BarridoX:
+    def __init__(self, rect_de):
+        # rect_de(objeto) devuelve su pygame.Rect de colisión (cacheado, no uno nuevo)
+        self.rect_de = rect_de
+        self.objetos = []
+
+    def _izquierda(self, objeto):
+        return self.rect_de(objeto).x
+
+    def insertar(self, objeto):
+        rect = self.rect_de(objeto)
+        objetos = self.objetos
+        # Los objetos nuevos aparecen por la derecha: casi siempre es un append
+        i = len(objetos)
+        while i and self.rect_de(objetos[i - 1]).x > rect.x:
+            i -= 1
+        objetos.insert(i, objeto)
+
+    def vaciar(self):
+        # En el sitio: quien tenga una referencia a `objetos` la sigue viendo
+        self.objetos.clear()
+
+    def reordenar(self):
+        # Solo hace falta cuando los objetos tienen velocidades distintas
+        objetos, rect_de = self.objetos, self.rect_de
+        for i in range(1, len(objetos)):
+            objeto = objetos[i]
+            x = rect_de(objeto).x
+            j = i - 1
+            while j >= 0 and rect_de(objetos[j]).x > x:
+                objetos[j + 1] = objetos[j]
+                j -= 1
+            objetos[j + 1] = objeto
+
+    def retirar(self, fuera, limite=0):
+        # Solo los objetos que empiezan a la izquierda de `limite` pueden haber salido de pantalla.
+        # Devuelve los retirados para que el dueño libere sus huecos
+        objetos = self.objetos
+        if not objetos or self.rect_de(objetos[0]).x >= limite:
+            return ()
+        n = bisect_left(objetos, limite, key=self._izquierda)
+        retirados, quedan = [], []
+        for objeto in objetos[:n]:
+            (retirados if fuera(objeto) else quedan).append(objeto)
+        objetos[:n] = quedan
+        return retirados
+
+    def candidatos(self, izquierda, derecha):
+        # Objetos cuyo rectángulo solapa [izquierda, derecha), en orden de x. En pantalla caben
+        # pocos: un recorrido que corta en el primero que empieza en `derecha` o más allá sale
+        # más barato que dos búsquedas binarias con clave
+        rect_de = self.rect_de
+        solapan = []
+        for objeto in self.objetos:
+            rect = rect_de(objeto)
+            if rect.x >= derecha:
+                break
+            if rect.right > izquierda:
+                solapan.append(objeto)
+        return solapan
@@ -0,0 +1,124 @@
+from array import array
+from operator import attrgetter
+
+# ----------------------------- Almacén de entidades -----------------------------
+# Obstáculos y plataformas guardan su estado en columnas compactas (array de enteros):
+# x, y, tamaño, velocidad, índice de color, banderas... Las clases Obstaculo,
+# ObstaculoNivel2 y PlataformaMovil quedan como vistas ligeras (con __slots__) que leen y
+# escriben su hueco a través de propiedades.
+#
+# Cada vista reserva su hueco al crearse y es su dueña mientras exista: al salir de
+# pantalla vuelve a su PoolEntidades con el hueco y el siguiente spawn lo reescribe entero.
+# Los huecos no se devuelven al almacén, así que los ocupados son las vistas creadas, el
+# máximo de entidades que hubo a la vez en pantalla.
+
+CAMPOS = ("x", "y", "ancho", "alto", "velocidad", "color", "banderas",
+          "direccion", "limite_superior", "limite_inferior")
+
+BANDERA_SUPERADO = 1
+BANDERA_VERTICAL = 2
+
+
+class AlmacenEntidades:
+    def __init__(self, capacidad=64):
+        self.capacidad = 0
+        self.columnas = {}
+        for campo in CAMPOS:
+            columna = array("i")
+            self.columnas[campo] = columna
+            setattr(self, campo, columna)
+        self.paleta = []
+        self.indices_color = {}
+        self.libres = []
+        self.crecer(capacidad)
+
+    def crecer(self, capacidad):
+        # La capacidad es fija mientras no se llene; si se llena se duplica en el sitio
+        nuevos = capacidad - self.capacidad
+        if nuevos <= 0:
+            return
+        for columna in self.columnas.values():
+            columna.extend([0] * nuevos)
+        self.libres.extend(range(capacidad - 1, self.capacidad - 1, -1))
+        self.capacidad = capacidad
+
+    @property
+    def ocupados(self):
+        return self.capacidad - len(self.libres)
+
+    def reservar(self):
+        if not self.libres:
+            self.crecer(max(1, self.capacidad * 2))
+        return self.libres.pop()
+
+    def indice_color(self, color):
+        indice = self.indices_color.get(color)
+        if indice is None:
+            indice = len(self.paleta)
+            self.paleta.append(color)
+            self.indices_color[color] = indice
+        return indice
+
+
+# ----------------------------- Propiedades de las vistas -----------------------------
+
+def columna(nombre):
+    leer_columna = attrgetter(nombre)
+
+    def leer(vista):
+        return leer_columna(vista.almacen)[vista.indice]
+
+    def escribir(vista, valor):
+        leer_columna(vista.almacen)[vista.indice] = valor
+
+    return property(leer, escribir)
+
+
+def bandera(bit):
+    def leer(vista):
+        return bool(vista.almacen.banderas[vista.indice] & bit)
+
+    def escribir(vista, valor):
+        if valor:
+            vista.almacen.banderas[vista.indice] |= bit
+        else:
+            vista.almacen.banderas[vista.indice] &= ~bit
+
+    return property(leer, escribir)
+
+
+def color_paleta():
+    def leer(vista):
+        return vista.almacen.paleta[vista.almacen.color[vista.indice]]
+
+    def escribir(vista, valor):
+        vista.almacen.color[vista.indice] = vista.almacen.indice_color(valor)
+
+    return property(leer, escribir)
+
+
+# ----------------------------- Pools de entidades -----------------------------
+# Las vistas que salen de pantalla no se descartan: vuelven al pool conservando su hueco
+# en el almacén y sus pygame.Rect, y el siguiente spawn las reinicia con reiniciar(...),
+# que escribe todos los campos del hueco.
+# Con el nivel en marcha todos los spawns son aciertos y no se crea ninguna entidad nueva.
+
+class PoolEntidades:
+    def __init__(self, clase, almacen):
+        self.clase = clase
+        self.almacen = almacen
+        self.libres = []
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, *argumentos):
+        if self.libres:
+            self.aciertos += 1
+            entidad = self.libres.pop()
+            entidad.reiniciar(*argumentos)
+            return entidad
+        self.fallos += 1
+        return self.clase(*argumentos, almacen=self.almacen)
+
+    def devolver(self, entidad):
+        self.libres.append(entidad)
@@ -0,0 +1,257 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from evaluador import crear_motor
+from simulador_lote import JUGADOR_X, SIN_ORDEN, SimuladorLote
+
+# ----------------------------- Entorno de entrenamiento -----------------------------
+# Interfaz al estilo Gym sobre MotorJuego (main.py o 12.py), sin ventana ni reloj:
+# reset(seed) y step(accion), con accion 1 = saltar y 0 = no hacer nada. La observación es
+# un vector float32:
+#
+#   [y, velocidad_y, saltando,  dx, y, tamaño  de los K obstáculos siguientes,
+#                               dx, y, ancho   de las P plataformas siguientes]
+#
+# con dx medido desde la x del jugador; los huecos se rellenan con (ANCHO_PANTALLA, 0, 0).
+# La recompensa es lo que sube la puntuación total en el paso (obstáculos superados) y perder
+# resta 1. Con frames_por_paso > 1 la acción se aplica en el primer frame y las recompensas
+# se suman.
+#
+# Para N entornos a la vez, crear_entornos da un EntornoVector (N motores, uno tras otro) o,
+# en main.py, un EntornoLote: las N partidas avanzan juntas en SimuladorLote con un paso
+# NumPy por frame, con las mismas observaciones y recompensas. Los dos reinician cada
+# entorno en cuanto termina.
+
+ANCHO_PANTALLA = 800
+RECOMPENSA_PERDER = -1.0
+CAMPOS_JUGADOR = 3
+CAMPOS_ENTIDAD = 3
+
+
+class Entorno:
+    def __init__(self, juego="main", obstaculos=3, plataformas=2, frames_por_paso=1,
+                 max_frames=100000, mapa=None):
+        self.motor = crear_motor(juego, mapa)
+        self.obstaculos = obstaculos
+        self.plataformas = plataformas
+        self.frames_por_paso = frames_por_paso
+        self.max_frames = max_frames
+        self.tamaño_observacion = CAMPOS_JUGADOR + CAMPOS_ENTIDAD * (obstaculos + plataformas)
+        self.acciones = 2
+        # 12.py no tiene plataformas: sus huecos quedan siempre de relleno
+        self.con_plataformas = hasattr(self.motor, "plataformas_activas")
+        # Puntos de los niveles anteriores (como evaluador.puntos_totales, sin la llamada por paso)
+        self.puntos_previos = self.motor.campaña.puntos_previos
+        self.relleno = [ANCHO_PANTALLA, 0, 0] * max(obstaculos, plataformas)
+        self.frames = 0
+        self.puntos = 0
+
+    def reset(self, seed=None):
+        return np.array(self._reiniciar(seed), dtype=np.float32)
+
+    def step(self, accion):
+        motor = self.motor
+        if not motor.en_curso():
+            raise RuntimeError("El episodio terminó: hay que llamar a reset()")
+        recompensa, terminado, truncado = self._avanzar(accion)
+        info = {"nivel": motor.nivel_actual, "puntos": self.puntos, "frames": self.frames,
+                "ganada": motor.partida_ganada()}
+        return np.array(self._observar(), dtype=np.float32), recompensa, terminado, truncado, info
+
+    def _reiniciar(self, semilla):
+        # 12.py con semilla None sortea una partida nueva; main.py es siempre la misma
+        self.motor.semilla = semilla
+        self.motor.nueva_partida()
+        self.frames = 0
+        self.puntos = 0
+        return self._observar()
+
+    def _avanzar(self, accion):
+        motor = self.motor
+        if accion:
+            motor.jugador.saltar()
+        motor.actualizar_juego()
+        frames = 1
+        while frames < self.frames_por_paso and motor.en_curso():
+            motor.actualizar_juego()
+            frames += 1
+        self.frames += frames
+        puntos = self.puntos_previos[motor.nivel_actual] + motor.puntuacion
+        recompensa = float(puntos - self.puntos)
+        self.puntos = puntos
+        if motor.en_curso():
+            return recompensa, False, self.frames >= self.max_frames
+        if not motor.partida_ganada():
+            recompensa += RECOMPENSA_PERDER
+        return recompensa, True, False
+
+    def _observar(self):
+        motor = self.motor
+        jugador = motor.jugador
+        x = jugador.x
+        fila = [jugador.y, jugador.velocidad_y, jugador.esta_saltando]
+
+        # Los activos van ordenados por x: los siguientes son los primeros que no quedaron atrás
+        almacen = motor.almacen_obstaculos
+        columna_x, columna_y, columna_ancho = almacen.x, almacen.y, almacen.ancho
+        faltan = self.obstaculos
+        for obstaculo in motor.obstaculos_activos:
+            if not faltan:
+                break
+            i = obstaculo.indice
+            if columna_x[i] + columna_ancho[i] > x:
+                fila += (columna_x[i] - x, columna_y[i], columna_ancho[i])
+                faltan -= 1
+        if faltan:
+            fila += self.relleno[:CAMPOS_ENTIDAD * faltan]
+
+        faltan = self.plataformas
+        if self.con_plataformas:
+            for plataforma in motor.plataformas_activas:
+                if not faltan:
+                    break
+                rect = plataforma.rect
+                if rect.right > x:
+                    fila += (rect.x - x, rect.y, rect.width)
+                    faltan -= 1
+        if faltan:
+            fila += self.relleno[:CAMPOS_ENTIDAD * faltan]
+        return fila
+
+
+class EntornoVector:
+    def __init__(self, n, juego="main", **opciones):
+        self.entornos = [Entorno(juego, **opciones) for _ in range(n)]
+        self.n = n
+        self.tamaño_observacion = self.entornos[0].tamaño_observacion
+        self.acciones = 2
+        self.semillas = [None] * n
+
+    def reset(self, seed=None):
+        # Con semilla, el entorno i empieza con seed + i y cada reinicio automático suma n
+        self.semillas = [None if seed is None else seed + i for i in range(self.n)]
+        return np.array([entorno._reiniciar(semilla) for entorno, semilla in zip(self.entornos, self.semillas)],
+                        dtype=np.float32)
+
+    def step(self, acciones):
+        # Los entornos que terminan se reinician en el mismo step: su observación ya es la
+        # del episodio nuevo y terminados/truncados indican que el anterior acabó.
+        # Las observaciones van seguidas en una sola lista: convertirla de una vez es más
+        # barato que convertir una lista por entorno
+        valores, recompensas, terminados, truncados = [], [], [], []
+        for i, (entorno, accion) in enumerate(zip(self.entornos, acciones)):
+            recompensa, terminado, truncado = entorno._avanzar(accion)
+            if terminado or truncado:
+                if self.semillas[i] is not None:
+                    self.semillas[i] += self.n
+                valores += entorno._reiniciar(self.semillas[i])
+            else:
+                valores += entorno._observar()
+            recompensas.append(recompensa)
+            terminados.append(terminado)
+            truncados.append(truncado)
+        return (np.array(valores, dtype=np.float32).reshape(self.n, self.tamaño_observacion),
+                np.array(recompensas, dtype=np.float32), np.array(terminados), np.array(truncados), {})
+
+
+def _llenar_siguientes(observacion, columna, cantidad, validos, orden, campos):
+    # Escribe desde `columna` los campos de las `cantidad` entidades válidas que antes se
+    # generaron (en el motor son las primeras de la lista ordenada por x)
+    elegidas = np.argsort(np.where(validos, orden, SIN_ORDEN), axis=1, kind="stable")[:, :cantidad]
+    presentes = np.take_along_axis(validos, elegidas, axis=1)
+    fin = columna + CAMPOS_ENTIDAD * elegidas.shape[1]
+    for desplazamiento, (campo, relleno) in enumerate(zip(campos, (ANCHO_PANTALLA, 0, 0))):
+        valores = np.take_along_axis(campo, elegidas, axis=1)
+        observacion[:, columna + desplazamiento:fin:CAMPOS_ENTIDAD] = np.where(presentes, valores, relleno)
+    # Si el simulador guarda menos entidades de las pedidas, el resto es siempre relleno
+    observacion[:, fin:columna + CAMPOS_ENTIDAD * cantidad] = [ANCHO_PANTALLA, 0, 0] * (cantidad - elegidas.shape[1])
+
+
+class EntornoLote:
+    def __init__(self, n, obstaculos=3, plataformas=2, frames_por_paso=1, max_frames=100000, mapa=None):
+        self.simulador = SimuladorLote(n, mapa)
+        self.n = n
+        self.obstaculos = obstaculos
+        self.plataformas = plataformas
+        self.frames_por_paso = frames_por_paso
+        self.max_frames = max_frames
+        self.tamaño_observacion = CAMPOS_JUGADOR + CAMPOS_ENTIDAD * (obstaculos + plataformas)
+        self.acciones = 2
+        self.puntos = np.zeros(n, dtype=np.int32)
+
+    def reset(self, seed=None):
+        # Se acepta y no se usa, como en EntornoVector con main.py (ver crear_entornos)
+        self.simulador.reiniciar()
+        self.puntos[:] = 0
+        return self._observar()
+
+    def step(self, acciones):
+        simulador = self.simulador
+        simulador.paso(np.asarray(acciones, dtype=bool))
+        for _ in range(self.frames_por_paso - 1):
+            simulador.paso()
+        puntos = (simulador.nivel_actual - 1) * simulador.puntos_cambio_nivel + simulador.puntuacion
+        recompensas = (puntos - self.puntos).astype(np.float32)
+        self.puntos = puntos
+        recompensas[simulador.juego_terminado] += RECOMPENSA_PERDER
+        terminados = ~simulador.en_curso()
+        truncados = ~terminados & (simulador.frames >= self.max_frames)
+        acabados = np.flatnonzero(terminados | truncados)
+        if acabados.size:
+            simulador.reiniciar_filas(acabados)
+            self.puntos[acabados] = 0
+        return self._observar(), recompensas, terminados, truncados, {}
+
+    def _observar(self):
+        simulador = self.simulador
+        observacion = np.empty((self.n, self.tamaño_observacion), dtype=np.float32)
+        observacion[:, 0] = simulador.y
+        observacion[:, 1] = simulador.velocidad_y
+        observacion[:, 2] = simulador.esta_saltando
+
+        x, tamaño = simulador.obstaculo_x, simulador.obstaculo_tamaño
+        _llenar_siguientes(observacion, CAMPOS_JUGADOR, self.obstaculos,
+                           simulador.obstaculo_activo & (x + tamaño > JUGADOR_X), simulador.obstaculo_orden,
+                           (x - JUGADOR_X, simulador.obstaculo_y, tamaño))
+        x, ancho = simulador.plataforma_x, simulador.plataforma_ancho
+        _llenar_siguientes(observacion, CAMPOS_JUGADOR + CAMPOS_ENTIDAD * self.obstaculos, self.plataformas,
+                           simulador.plataforma_activa & (x + ancho > JUGADOR_X), simulador.plataforma_orden,
+                           (x - JUGADOR_X, simulador.plataforma_y, np.full_like(x, ancho)))
+        return observacion
+
+
+def crear_entornos(n, juego="main", lote=True, **opciones):
+    # reset(seed) solo cambia las partidas de 12.py, que sortea sus niveles: en main.py la campaña
+    # es fija y la semilla solo afecta al modo infinito, que los entornos no usan. Por eso
+    # EntornoLote la ignora y da lo mismo que EntornoVector con cualquier semilla
+    if juego == "main" and lote:
+        return EntornoLote(n, **opciones)
+    return EntornoVector(n, juego, **opciones)
+
+
+def medir(juego, n, pasos, frames_por_paso=1, lote=True):
+    # Pasos de entorno por segundo con acciones al azar (un 5 % de saltos)
+    entornos = crear_entornos(n, juego, lote, frames_por_paso=frames_por_paso)
+    entornos.reset(seed=0)
+    rng = random.Random(0)
+    acciones = [[rng.random() < 0.05 for _ in range(n)] for _ in range(64)]
+    inicio = time.perf_counter()
+    for paso in range(pasos):
+        entornos.step(acciones[paso % 64])
+    return n * pasos / (time.perf_counter() - inicio)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide la velocidad del entorno de entrenamiento")
+    parser.add_argument("--juego", choices=["main", "12"], default="main")
+    parser.add_argument("--entornos", type=int, default=256)
+    parser.add_argument("--pasos", type=int, default=2000)
+    parser.add_argument("--frames-por-paso", type=int, default=1)
+    parser.add_argument("--sin-lote", action="store_true", help="main.py con un MotorJuego por entorno")
+    args = parser.parse_args()
+
+    velocidad = medir(args.juego, args.entornos, args.pasos, args.frames_por_paso, not args.sin_lote)
+    print(f"{args.juego}: {args.entornos} entornos, {velocidad:,.0f} pasos/s")
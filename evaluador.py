@@ -0,0 +1,137 @@
+import argparse
+import importlib
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# ----------------------------- Evaluador de niveles en paralelo -----------------------------
+# Reparte partidas simuladas con MotorJuego (main.py o 12.py) entre todos los núcleos.
+# Cada proceso recibe un bloque de semillas y devuelve solo contadores agregados,
+# así la transferencia entre procesos no crece con el número de partidas.
+
+class SaltosPeriodicos:
+    # Política serializable: salta cada `periodo` frames empezando en `desfase`
+    def __init__(self, periodo, desfase=0):
+        self.periodo = periodo
+        self.desfase = desfase
+
+    def __call__(self, motor, frame):
+        return frame >= self.desfase and (frame - self.desfase) % self.periodo == 0
+
+
+class ResultadoEvaluacion:
+    def __init__(self, ancho_bin):
+        self.ancho_bin = ancho_bin
+        self.partidas = 0
+        self.completadas = 0
+        self.muertes = Counter()       # (nivel, distancia // ancho_bin * ancho_bin) -> partidas
+        self.puntuaciones = Counter()  # puntuación total -> partidas
+
+    @property
+    def tasa_completado(self):
+        return self.completadas / self.partidas if self.partidas else 0.0
+
+    def combinar(self, parcial):
+        partidas, completadas, muertes, puntuaciones = parcial
+        self.partidas += partidas
+        self.completadas += completadas
+        self.muertes.update(muertes)
+        self.puntuaciones.update(puntuaciones)
+
+    def __repr__(self):
+        return (f"ResultadoEvaluacion(partidas={self.partidas}, "
+                f"tasa_completado={self.tasa_completado:.3f})")
+
+
+def crear_motor(juego, mapa=None, semilla=None):
+    # 12.py sortea sus niveles y main.py su modo infinito: con la semilla fija la partida es reproducible.
+    # Se pasa al constructor para que 12.py sortee la partida una sola vez
+    motor = importlib.import_module(juego).MotorJuego(semilla)
+    if mapa is not None:
+        motor.mapa_nivel_1_distancias = list(mapa)
+    return motor
+
+
+def jugar_partida(motor, politica, max_frames):
+    # Devuelve (ganada, nivel, frames en el nivel actual, puntuación total)
+    if not callable(politica):
+        saltos = politica
+        politica = lambda motor, frame: frame in saltos
+    motor.nueva_partida()
+    nivel = motor.nivel_actual
+    inicio_nivel = 0
+    frame = 0
+    while frame < max_frames and motor.en_curso():
+        if politica(motor, frame):
+            motor.jugador.saltar()
+        motor.actualizar_juego()
+        frame += 1
+        if motor.nivel_actual != nivel:
+            nivel = motor.nivel_actual
+            inicio_nivel = frame
+    return motor.partida_ganada(), motor.nivel_actual, frame - inicio_nivel, puntos_totales(motor)
+
+
+def puntos_totales(motor):
+    # Los de los niveles ya superados de la campaña más los del nivel en curso
+    return motor.campaña.puntos_previos[motor.nivel_actual] + motor.puntuacion
+
+
+def _evaluar_bloque(tarea):
+    juego, mapa, politica, semillas, max_frames, ancho_bin = tarea
+    if not callable(politica):
+        politica = frozenset(politica)
+    completadas = 0
+    muertes = Counter()
+    puntuaciones = Counter()
+    for semilla in semillas:
+        motor = crear_motor(juego, mapa, semilla)
+        ganada, nivel, frames, total = jugar_partida(motor, politica, max_frames)
+        if ganada:
+            completadas += 1
+        else:
+            distancia = frames * motor.velocidad_juego
+            muertes[(nivel, distancia // ancho_bin * ancho_bin)] += 1
+        puntuaciones[total] += 1
+    return len(semillas), completadas, dict(muertes), dict(puntuaciones)
+
+
+def evaluar_nivel(juego, politica, semillas, mapa=None, max_frames=100000,
+                  ancho_bin=100, procesos=None, tamaño_bloque=None):
+    semillas = list(semillas)
+    procesos = procesos or os.cpu_count() or 1
+    if tamaño_bloque is None:
+        # Unos cuatro bloques por proceso para equilibrar carga sin multiplicar mensajes
+        tamaño_bloque = max(1, -(-len(semillas) // (procesos * 4)))
+    if not callable(politica):
+        politica = sorted(politica)
+
+    tareas = [
+        (juego, mapa, politica, semillas[i:i + tamaño_bloque], max_frames, ancho_bin)
+        for i in range(0, len(semillas), tamaño_bloque)
+    ]
+    resultado = ResultadoEvaluacion(ancho_bin)
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        for parcial in ejecutor.map(_evaluar_bloque, tareas):
+            resultado.combinar(parcial)
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evalúa un nivel con partidas simuladas en paralelo")
+    parser.add_argument("--juego", choices=["main", "12"], default="main")
+    parser.add_argument("--semillas", type=int, nargs=2, default=(0, 1000), metavar=("INICIO", "FIN"))
+    parser.add_argument("--periodo", type=int, default=60)
+    parser.add_argument("--desfase", type=int, default=0)
+    parser.add_argument("--procesos", type=int, default=None)
+    args = parser.parse_args()
+
+    resultado = evaluar_nivel(args.juego, SaltosPeriodicos(args.periodo, args.desfase),
+                              range(*args.semillas), procesos=args.procesos)
+    print(resultado)
+    print("Muertes (nivel, distancia):")
+    for clave, cantidad in sorted(resultado.muertes.items()):
+        print(f"  {clave}: {cantidad}")
+    print("Puntuaciones:")
+    for puntos, cantidad in sorted(resultado.puntuaciones.items()):
+        print(f"  {puntos}: {cantidad}")
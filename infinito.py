@@ -0,0 +1,121 @@
+from array import array
+from collections import deque
+from itertools import count
+
+from azar import FlujosAzar
+from niveles import FIN, TIPOS, LineaTiempo
+
+# ----------------------------- Modo infinito -----------------------------
+# La partida no tiene final: su línea de tiempo es un flujo perezoso de tramos de
+# FRAMES_TRAMO frames, cada uno una LineaTiempo con frames absolutos que acaba en `fin`.
+# El motor usa el tramo actual como cualquier línea de tiempo y al llegar a su fin pide el
+# siguiente a FlujoTramos, que ya lo tiene generado; el anterior se descarta. En memoria
+# solo hay el tramo actual y los TRAMOS_ADELANTO siguientes, y los obstáculos y
+# plataformas salen de los pools de siempre, así que ni la memoria ni el coste por frame
+# crecen con la duración de la partida.
+#
+# Cada tramo sale solo de la semilla y de su índice (sus propios flujos de azar), sin
+# depender de los anteriores: una instantánea del motor basta con el frame para volver a
+# generar el tramo en que estaba. La dificultad sube con la distancia recorrida, tramo a
+# tramo, hasta TRAMOS_RAMPA: más velocidad, obstáculos más seguidos y, si el juego los
+# admite, más obstáculos variables.
+
+NIVEL_INFINITO = 0  # nivel_actual de una partida infinita
+FRAMES_TRAMO = 600  # 10 s a 60 ticks
+TRAMOS_ADELANTO = 1
+TRAMOS_RAMPA = 18   # a los 3 minutos la dificultad ya es la máxima
+
+VELOCIDAD_INICIAL, VELOCIDAD_MAXIMA = 10, 16
+# Frames entre obstáculos (mínimo, máximo); un salto dura 30, así siempre se cae antes del siguiente
+SEPARACION_INICIAL, SEPARACION_FINAL = (55, 85), (30, 45)
+VARIABLES_INICIAL, VARIABLES_FINAL = 0.3, 0.8
+
+
+class Tramo(LineaTiempo):
+    def __init__(self, indice, velocidad, frames_obstaculos, tipos_obstaculos, frames_plataformas=None,
+                 alturas_plataformas=None, ancho_plataforma=0, alto_plataforma=0, parametros=()):
+        super().__init__(velocidad, frames_obstaculos, tipos_obstaculos, frames_plataformas,
+                         alturas_plataformas, ancho_plataforma, alto_plataforma, (indice + 1) * FRAMES_TRAMO)
+        self.indice = indice
+        self.parametros = parametros  # lo que sortea el juego para cada obstáculo (ver FlujoTramos)
+
+
+def dificultad(indice):
+    # (velocidad, separación mínima, separación máxima, proporción de variables) del tramo
+    progreso = min(1.0, indice / TRAMOS_RAMPA)
+
+    def interpolar(inicial, final):
+        return inicial + (final - inicial) * progreso
+
+    return (round(interpolar(VELOCIDAD_INICIAL, VELOCIDAD_MAXIMA)),
+            round(interpolar(SEPARACION_INICIAL[0], SEPARACION_FINAL[0])),
+            round(interpolar(SEPARACION_INICIAL[1], SEPARACION_FINAL[1])),
+            interpolar(VARIABLES_INICIAL, VARIABLES_FINAL))
+
+
+def generar_tramo(semilla, indice, tipos_permitidos=TIPOS, plataformas=None, sortear=None):
+    flujos = FlujosAzar(f"{semilla}/infinito/{indice}")
+    velocidad, minimo, maximo, variables = dificultad(indice)
+    inicio, fin = indice * FRAMES_TRAMO, (indice + 1) * FRAMES_TRAMO
+
+    # Media separación mínima libre a cada lado del tramo: entre dos tramos tampoco quedan más juntos
+    margen = -(-minimo // 2)
+    frames_obstaculos = array("i")
+    frame = inicio + margen
+    while frame <= fin - margen:
+        frames_obstaculos.append(frame)
+        frame += flujos.distancias.randint(minimo, maximo)
+    cantidad = len(frames_obstaculos)
+    frames_obstaculos.append(FIN)
+    if "variable" in tipos_permitidos:
+        tipos = [TIPOS.index("variable") if flujos.tipos.random() < variables else 0 for _ in range(cantidad)]
+    else:
+        tipos = [TIPOS.index(tipos_permitidos[0])] * cantidad
+    tipos_obstaculos = array("B", tipos)
+    tipos_obstaculos.append(0)
+    parametros = sortear(cantidad, flujos) if sortear else ()
+
+    if not plataformas:
+        return Tramo(indice, velocidad, frames_obstaculos, tipos_obstaculos, parametros=parametros)
+    # Plataformas cada `cada` frames contados desde el inicio de la partida, con las alturas
+    # alternando en ese mismo orden: el patrón sigue igual de un tramo al siguiente
+    cada, alturas = plataformas["cada"], plataformas["alturas"]
+    frames_plataformas = array("i", range(max(cada, -(-inicio // cada) * cada), fin, cada))
+    alturas_plataformas = array("i", (alturas[frame // cada % len(alturas)] for frame in frames_plataformas))
+    frames_plataformas.append(FIN)
+    alturas_plataformas.append(0)
+    return Tramo(indice, velocidad, frames_obstaculos, tipos_obstaculos, frames_plataformas,
+                 alturas_plataformas, plataformas["ancho"], plataformas["alto"], parametros)
+
+
+def tramos(semilla, desde=0, tipos_permitidos=TIPOS, plataformas=None, sortear=None):
+    # Flujo infinito y perezoso: cada tramo se genera cuando se pide
+    return (generar_tramo(semilla, indice, tipos_permitidos, plataformas, sortear) for indice in count(desde))
+
+
+class FlujoTramos:
+    # sortear(cantidad, flujos), si se da, devuelve los parámetros de los obstáculos del tramo
+    # sorteados de sus flujos; el motor los lee en tramo.parametros
+    def __init__(self, semilla, tipos_permitidos=TIPOS, plataformas=None, sortear=None, adelanto=TRAMOS_ADELANTO):
+        self.semilla = semilla
+        self.opciones = (tipos_permitidos, plataformas, sortear)
+        self.adelanto = adelanto
+        self.flujo = None
+        self.actual = None
+        self.siguientes = deque()
+
+    def en_frame(self, frame):
+        # Tramo que contiene `frame`; al pasar al siguiente se genera el que viene detrás
+        indice = frame // FRAMES_TRAMO
+        if self.actual is not None and self.actual.indice == indice:
+            return self.actual
+        if self.siguientes and self.siguientes[0].indice == indice:
+            self.actual = self.siguientes.popleft()
+        else:
+            # Otro punto de la partida (partida nueva o instantánea): el flujo se reinicia ahí
+            self.flujo = tramos(self.semilla, indice, *self.opciones)
+            self.siguientes.clear()
+            self.actual = next(self.flujo)
+        while len(self.siguientes) < self.adelanto:
+            self.siguientes.append(next(self.flujo))
+        return self.actual
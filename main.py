@@ -1,24 +1,61 @@
-import pygame
+import argparse
+import time
+from array import array
+from operator import attrgetter
 
-pygame.init()
-pygame.mixer.init()
+import pygame
 
-# ----------------------------- Cargar imágenes de fondo -----------------------------
-FONDO_NIVEL_1 = pygame.transform.scale(pygame.image.load("bg.png"), (800, 600))
-FONDO_NIVEL_2 = pygame.transform.scale(pygame.image.load("nivel2.jpeg"), (800, 600))
+from audio import GestorAudio
+from azar import nueva_semilla
+from cache_imagenes import cargar_imagen_escalada
+from colisiones import BarridoX
+from entidades import BANDERA_SUPERADO, AlmacenEntidades, PoolEntidades, bandera, color_paleta, columna
+from infinito import NIVEL_INFINITO, FlujoTramos
+from mapa_ritmo import cargar_mapa, distancias_ritmo
+from niveles import Campaña, Nivel, cargar_nivel, compilar
+from paso_fijo import PasoFijo
+from perfilador import PerfiladorFrames
+from recursos import GestorRecursos
+from render_sucio import RenderSucio
+from repeticion import DIRECTORIO_GRABACIONES, Grabador
+from sprites import CacheSprites
+from textos import CacheTextos, MarcadorHUD
+
+# ----------------------------- Recursos -----------------------------
+# Nada se carga al importar: Juego registra los recursos y los carga bajo demanda
+# o en segundo plano (ver recursos.GestorRecursos). Mientras se juega un nivel se
+# precargan el fondo, la música y la línea de tiempo del siguiente de la campaña.
+PRESUPUESTO_ARRANQUE_MS = 500
+OBSTACULOS_RITMO = 20  # los del nivel 1 cuando sigue los beats de su pista
+
+def cargar_fondo(ruta):
+    return cargar_imagen_escalada(ruta, (800, 600))
 
 
 # ----------------------------- Clases base -----------------------------
 
 class ObjetoJuego:
+    __slots__ = ("x", "y", "ancho", "alto", "color", "rectangulo", "x_anterior", "y_anterior")
+
     def __init__(self, x, y, ancho, alto, color):
         self.x, self.y, self.ancho, self.alto, self.color = x, y, ancho, alto, color
         self.rectangulo = pygame.Rect(x, y, ancho, alto)
+        self.x_anterior, self.y_anterior = x, y
 
     def actualizar_rectangulo(self):
         self.rectangulo.x, self.rectangulo.y = self.x, self.y
 
+    # Posición del tick anterior, para dibujar interpolando entre dos ticks
+    def guardar_posicion(self):
+        self.x_anterior, self.y_anterior = self.x, self.y
+
+    def posicion_interpolada(self, alfa):
+        return (round(self.x_anterior + (self.x - self.x_anterior) * alfa),
+                round(self.y_anterior + (self.y - self.y_anterior) * alfa))
+
 class Jugador(ObjetoJuego):
+    __slots__ = ("y_suelo_original", "y_suelo", "velocidad_y", "esta_saltando")
+
     def __init__(self, x, y, tamaño, color, y_suelo):
         super().__init__(x, y, tamaño, tamaño, color)
         self.y_suelo_original = y_suelo
@@ -31,6 +68,14 @@ class Jugador(ObjetoJuego):
             self.velocidad_y = -15
             self.esta_saltando = True
 
+    def reiniciar(self):
+        # De vuelta en el suelo y quieto, como recién creado
+        self.y = self.y_suelo = self.y_suelo_original
+        self.velocidad_y = 0
+        self.esta_saltando = False
+        self.actualizar_rectangulo()
+        self.guardar_posicion()
+
     def actualizar(self, plataformas_activas=None):
         self.velocidad_y += 1
         self.y += self.velocidad_y
@@ -53,10 +98,13 @@ class Jugador(ObjetoJuego):
 
         self.actualizar_rectangulo()
 
-    def dibujar(self, pantalla):
-        pygame.draw.rect(pantalla, self.color, self.rectangulo)
+    def dibujar(self, pantalla, alfa=1.0):
+        x, y = self.posicion_interpolada(alfa)
+        return pygame.draw.rect(pantalla, self.color, (x, y, self.ancho, self.alto))
 
 class ObjetoMovil(ObjetoJuego):
+    __slots__ = ("velocidad", "ancho_pantalla")
+
     def __init__(self, x, y, ancho, alto, color, velocidad, ancho_pantalla):
         super().__init__(x, y, ancho, alto, color)
         self.velocidad = velocidad
@@ -67,80 +115,163 @@ class ObjetoMovil(ObjetoJuego):
         self.actualizar_rectangulo()
 
 class Suelo(ObjetoMovil):
+    __slots__ = ()
+
     def actualizar(self):
         self.mover()
+        # Sin perder el sobrante: en el modo infinito la velocidad no siempre divide el ancho
         if self.x <= -self.ancho_pantalla:
-            self.x = 0
+            self.x += self.ancho_pantalla
 
-    def dibujar(self, pantalla):
-        pygame.draw.rect(pantalla, self.color, (self.x, self.y, self.ancho, self.alto))
-        pygame.draw.rect(pantalla, self.color, (self.x + self.ancho, self.y, self.ancho, self.alto))
+    def reiniciar(self):
+        self.x = 0
+        self.actualizar_rectangulo()
+        self.guardar_posicion()
+
+    def posicion_interpolada(self, alfa):
+        # Al dar la vuelta x salta de -ancho_pantalla a 0: se interpola el desplazamiento real
+        desplazamiento = self.x - self.x_anterior
+        if desplazamiento > 0:
+            desplazamiento -= self.ancho_pantalla
+        return round(self.x_anterior + desplazamiento * alfa), self.y
+
+    def dibujar(self, pantalla, alfa=1.0):
+        x, y = self.posicion_interpolada(alfa)
+        pygame.draw.rect(pantalla, self.color, (x, y, self.ancho, self.alto))
+        pygame.draw.rect(pantalla, self.color, (x + self.ancho, y, self.ancho, self.alto))
 
 class Obstaculo(ObjetoMovil):
-    def __init__(self, x, y, tamaño, color, velocidad, ancho_pantalla):
-        super().__init__(x, y, tamaño, tamaño, color, velocidad, ancho_pantalla)
+    # Vista sobre un hueco de un AlmacenEntidades: posición, tamaño, velocidad, color y
+    # estado viven en las columnas del almacén (ver entidades.py)
+    __slots__ = ("almacen", "indice", "sprite", "rectangulo_colision")
+
+    x = columna("x")
+    y = columna("y")
+    ancho = columna("ancho")
+    alto = columna("alto")
+    velocidad = columna("velocidad")
+    color = color_paleta()
+    fue_superado = bandera(BANDERA_SUPERADO)
+
+    def __init__(self, x, y, tamaño, color, velocidad, ancho_pantalla, almacen=None):
+        self.almacen = almacen if almacen is not None else AlmacenEntidades(1)
+        self.indice = self.almacen.reservar()
+        self.rectangulo = pygame.Rect(0, 0, 0, 0)
+        self.rectangulo_colision = pygame.Rect(0, 0, 0, 0)
+        self.reiniciar(x, y, tamaño, color, velocidad, ancho_pantalla)
+
+    def reiniciar(self, x, y, tamaño, color, velocidad, ancho_pantalla):
+        # Deja la vista como recién creada reutilizando su hueco y sus rectángulos (ver PoolEntidades)
+        self.x, self.y, self.ancho, self.alto, self.color = x, y, tamaño, tamaño, color
+        self.velocidad, self.ancho_pantalla = velocidad, ancho_pantalla
+        self.x_anterior, self.y_anterior = x, y
+        self.rectangulo.width = self.rectangulo.height = tamaño
         self.fue_superado = False
+        self.sprite = None
+        self.actualizar_rectangulo()
+
+    def mover(self):
+        self.almacen.x[self.indice] -= self.almacen.velocidad[self.indice]
+        self.actualizar_rectangulo()
+
+    def actualizar_rectangulo(self):
+        almacen, i = self.almacen, self.indice
+        x, y, ancho, alto = almacen.x[i], almacen.y[i], almacen.ancho[i], almacen.alto[i]
+        self.rectangulo.x, self.rectangulo.y = x, y
+        self.rectangulo_colision.update(x + ancho // 4, y - alto, ancho // 2, alto)
 
     def actualizar(self):
         self.mover()
 
-    def dibujar(self, pantalla):
-        puntos = [(self.x, self.y), (self.x + self.ancho, self.y), (self.x + self.ancho // 2, self.y - self.alto)]
-        pygame.draw.polygon(pantalla, self.color, puntos)
+    def dibujar(self, pantalla, alfa=1.0, sprites=None):
+        x, y = self.posicion_interpolada(alfa)
+        if sprites is None:
+            puntos = [(x, y), (x + self.ancho, y), (x + self.ancho // 2, y - self.alto)]
+            return pygame.draw.polygon(pantalla, self.color, puntos)
+        if self.sprite is None:
+            self.sprite = sprites.triangulo(self.ancho, self.alto, self.color)
+        return pantalla.blit(self.sprite, (x, y - self.alto))
 
     def obtener_rectangulo_colision(self):
-        return pygame.Rect(self.x + self.ancho // 4, self.y - self.alto, self.ancho // 2, self.alto)
+        return self.rectangulo_colision
 
 class PlataformaMovil:
-    def __init__(self, x, y, ancho, alto, color, velocidad):
-        self.rect = pygame.Rect(x, y, ancho, alto)
-        self.color = color
+    # Vista sobre un hueco de un AlmacenEntidades; rect es el rectángulo de colisión cacheado
+    __slots__ = ("almacen", "indice", "rect", "x_anterior")
+
+    x = columna("x")
+    velocidad = columna("velocidad")
+    color = color_paleta()
+
+    def __init__(self, x, y, ancho, alto, color, velocidad, almacen=None):
+        self.almacen = almacen if almacen is not None else AlmacenEntidades(1)
+        self.indice = self.almacen.reservar()
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.reiniciar(x, y, ancho, alto, color, velocidad)
+
+    def reiniciar(self, x, y, ancho, alto, color, velocidad):
+        almacen, i = self.almacen, self.indice
+        almacen.x[i], almacen.y[i] = x, y
+        almacen.ancho[i], almacen.alto[i] = ancho, alto
         self.velocidad = velocidad
+        self.color = color
+        self.rect.update(x, y, ancho, alto)
+        self.x_anterior = x
 
     def actualizar(self):
-        self.rect.x -= self.velocidad
+        self.almacen.x[self.indice] -= self.almacen.velocidad[self.indice]
+        self.rect.x = self.almacen.x[self.indice]
+
+    def guardar_posicion(self):
+        self.x_anterior = self.rect.x
 
-    def dibujar(self, pantalla):
-        pygame.draw.rect(pantalla, self.color, self.rect)
+    def dibujar(self, pantalla, alfa=1.0, sprites=None):
+        x = round(self.x_anterior + (self.rect.x - self.x_anterior) * alfa)
+        if sprites is None:
+            return pygame.draw.rect(pantalla, self.color, (x, self.rect.y, self.rect.width, self.rect.height))
+        return pantalla.blit(sprites.barra(self.rect.width, self.rect.height, self.color), (x, self.rect.y))
 
 
 # ----------------------------- Clase Menu -----------------------------
 
 class Menu:
-    def __init__(self, pantalla, fuente_grande, fuente_normal, colores):
+    def __init__(self, pantalla, fuente_grande, fuente_normal, colores, cache_textos=None):
         self.pantalla = pantalla
         self.fuente_grande = fuente_grande
         self.fuente_normal = fuente_normal
         self.colores = colores
+        self.cache_textos = cache_textos or CacheTextos()
 
         ancho = self.pantalla.get_width()
         alto = self.pantalla.get_height()
 
         self.estado_menu = "PRINCIPAL"
-        self.boton_jugar = pygame.Rect(ancho//2 - 100, 250, 200, 50)
-        self.boton_instrucciones = pygame.Rect(ancho//2 - 100, 320, 200, 50)
-        self.boton_salir = pygame.Rect(ancho//2 - 100, 390, 200, 50)
-        self.boton_volver = pygame.Rect(ancho//2 - 100, 450, 200, 50)
+        self.boton_jugar = pygame.Rect(ancho//2 - 100, 230, 200, 50)
+        self.boton_infinito = pygame.Rect(ancho//2 - 100, 300, 200, 50)
+        self.boton_instrucciones = pygame.Rect(ancho//2 - 100, 370, 200, 50)
+        self.boton_salir = pygame.Rect(ancho//2 - 100, 440, 200, 50)
+        self.boton_volver = pygame.Rect(ancho//2 - 100, 490, 200, 50)
         self.color_normal = (0, 100, 200)
         self.color_hover = (0, 150, 255)
 
     def _dibujar_boton(self, rect, texto, mouse_pos):
         color_actual = self.color_hover if rect.collidepoint(mouse_pos) else self.color_normal
         pygame.draw.rect(self.pantalla, color_actual, rect, border_radius=10)
-        texto_surf = self.fuente_normal.render(texto, True, self.colores["BLANCO"])
+        texto_surf = self.cache_textos.render(self.fuente_normal, texto, True, self.colores["BLANCO"])
         texto_rect = texto_surf.get_rect(center=rect.center)
         self.pantalla.blit(texto_surf, texto_rect)
 
     def dibujar(self, fondo, mouse_pos):
         self.pantalla.blit(fondo, (0, 0))
         if self.estado_menu == "PRINCIPAL":
-            titulo = self.fuente_grande.render("Geometry Dash", True, self.colores["BLANCO"])
+            titulo = self.cache_textos.render(self.fuente_grande, "Geometry Dash", True, self.colores["BLANCO"])
             self.pantalla.blit(titulo, (self.pantalla.get_width()//2 - titulo.get_width()//2, 150))
             self._dibujar_boton(self.boton_jugar, "Jugar", mouse_pos)
+            self._dibujar_boton(self.boton_infinito, "Infinito", mouse_pos)
             self._dibujar_boton(self.boton_instrucciones, "Instrucciones", mouse_pos)
             self._dibujar_boton(self.boton_salir, "Salir", mouse_pos)
         else:
-            titulo = self.fuente_grande.render("Instrucciones", True, self.colores["BLANCO"])
+            titulo = self.cache_textos.render(self.fuente_grande, "Instrucciones", True, self.colores["BLANCO"])
             self.pantalla.blit(titulo, (self.pantalla.get_width()//2 - titulo.get_width()//2, 100))
             instrucciones = [
                 "¡Bienvenido a Geometry Dash!",
@@ -148,10 +279,11 @@ class Menu:
                 "- Usa [ESPACIO] para saltar.",
                 "- Nivel 1: esquiva triángulos rojos.",
                 "- Nivel 2: obstáculos más rápidos y variables.",
-                "- ¡Consigue 10 puntos para cada nivel!"
+                "- ¡Consigue 10 puntos para cada nivel!",
+                "- Infinito: cada vez más rápido, sin final."
             ]
             for i, linea in enumerate(instrucciones):
-                texto_linea = self.fuente_normal.render(linea, True, self.colores["BLANCO"])
+                texto_linea = self.cache_textos.render(self.fuente_normal, linea, True, self.colores["BLANCO"])
                 self.pantalla.blit(texto_linea, (self.pantalla.get_width()//2 - texto_linea.get_width()//2, 200 + i * 40))
             self._dibujar_boton(self.boton_volver, "Volver", mouse_pos)
 
@@ -163,6 +295,7 @@ class Menu:
                 pos = e.pos
                 if self.estado_menu == "PRINCIPAL":
                     if self.boton_jugar.collidepoint(pos): return "INICIAR_JUEGO"
+                    if self.boton_infinito.collidepoint(pos): return "INICIAR_INFINITO"
                     if self.boton_instrucciones.collidepoint(pos): self.estado_menu = "INSTRUCCIONES"
                     if self.boton_salir.collidepoint(pos): return "SALIR"
                 else:
@@ -170,13 +303,20 @@ class Menu:
         return None
 
 
-# ----------------------------- Clase principal -----------------------------
-
-class Juego:
-    def __init__(self):
-        self.pantalla = pygame.display.set_mode((800, 600))
-        pygame.display.set_caption("Geometry Dash")
-        self.reloj = pygame.time.Clock()
+# ----------------------------- Motor de simulación -----------------------------
+# Física, generación de obstáculos y colisiones sin ventana, fuentes, audio ni reloj.
+# Juego es solo una interfaz sobre este motor.
+# A 600 px entre obstáculos y 10 px por frame nunca hay más de dos o tres en pantalla
+CAPACIDAD_OBSTACULOS = 8
+CAPACIDAD_PLATAFORMAS = 8
+# Instantáneas del motor: enteros de 64 bits con esta cabecera, luego obstáculos y plataformas
+VERSION_INSTANTANEA = 1
+CAMPOS_CABECERA = 14
+
+class MotorJuego:
+    def __init__(self, semilla=None):
+        # Niveles de la partida, en orden, con sus puntos, fondo y música (ver niveles.Campaña)
+        self.campaña = Campaña.cargar("main")
         self.nivel_actual = 1
 
         self.colores = {
@@ -187,209 +327,571 @@ class Juego:
         }
 
         self.velocidad_juego = 10
-        self.fuente_grande = pygame.font.Font(None, 74)
-        self.fuente_normal = pygame.font.Font(None, 48)
-
-        self.mapa_nivel_1_distancias = [600] * 20
 
-        self.menu = Menu(self.pantalla, self.fuente_grande, self.fuente_normal, self.colores)
-
-        self.esta_ejecutando = True
-        self.en_menu = True
-
-        self.fondo = FONDO_NIVEL_1
-
-        self.cargar_audio()
-
-    def cargar_audio(self):
-        self.musica_juego = "bossfight-Vextron.mp3"
-        self.sonido_win = pygame.mixer.Sound("win.mp3")
-        self.sonido_lose = pygame.mixer.Sound("lose.mp3")
+        # Niveles compilados a líneas de tiempo por frame (ver niveles.py), una vez por nivel
+        # y velocidad. Si se fija mapa_nivel_1_distancias, el nivel 1 usa esas distancias
+        self.lineas_tiempo = {}
+        self.mapa_nivel_1_distancias = None
+        # Modo infinito (nivel 0): tramos generados a medida que se avanza (ver infinito.py)
+        self.semilla = semilla
+        self.tramos = None
+
+        # Estado de obstáculos y plataformas en columnas compactas, con huecos reciclados
+        self.almacen_obstaculos = AlmacenEntidades(CAPACIDAD_OBSTACULOS)
+        self.almacen_plataformas = AlmacenEntidades(CAPACIDAD_PLATAFORMAS)
+        # Las entidades que salen de pantalla vuelven a su pool y se reutilizan en el siguiente spawn
+        self.pool_obstaculos = PoolEntidades(Obstaculo, self.almacen_obstaculos)
+        self.pool_plataformas = PoolEntidades(PlataformaMovil, self.almacen_plataformas)
+        self.obstaculos_activos = []
+        self.plataformas_activas = []
 
+    # Ganchos de audio: el motor no reproduce nada, Juego los sobrescribe
     def reproducir_musica_juego(self):
-        pygame.mixer.music.load(self.musica_juego)
-        pygame.mixer.music.set_volume(0.04)
-        pygame.mixer.music.play(-1)
+        pass
 
     def reproducir_sonido_game_over(self):
-        pygame.mixer.music.stop()
-        self.sonido_lose.set_volume(0.1)
-        self.sonido_lose.play()
+        pass
 
     def reproducir_sonido_victoria(self):
-        pygame.mixer.music.stop()
-        self.sonido_win.set_volume(0.1)
-        self.sonido_win.play()
-
-    def detener_audio(self):
-        pygame.mixer.music.stop()
+        pass
 
     def inicializar_juego(self):
         y_suelo = 450
         self.jugador = Jugador(100, y_suelo - 50, 50, self.colores["BLANCO"], y_suelo - 50)
         self.suelo = Suelo(0, y_suelo, 800, 150, self.colores["VERDE"], self.velocidad_juego, 800)
 
-        self.puntuacion = 0
         self.juego_terminado = False
         self.juego_ganado = False
+        self.iniciar_nivel()
 
-        self.obstaculos_restantes_mapa = list(
-            self.mapa_nivel_1_distancias if self.nivel_actual == 1 else [600] * 50
-        )
-        self.obstaculos_activos = []
-        self.plataformas_activas = []
-        self.contador_plataforma = 0
-        self.distancia_para_siguiente_obstaculo = self.obstaculos_restantes_mapa.pop(0)
+    def iniciar_nivel(self):
+        # Al empezar la partida y al pasar de nivel: jugador y suelo vuelven a su sitio sin
+        # recrearlos y la línea de tiempo ya suele estar preparada (ver Juego.precargar_nivel)
+        self.jugador.reiniciar()
+        self.suelo.reiniciar()
+        self.puntuacion = 0
 
-        self.fondo = FONDO_NIVEL_1 if self.nivel_actual == 1 else FONDO_NIVEL_2
+        self.linea_tiempo = self.linea_tiempo_nivel(self.nivel_actual)
+        self.suelo.velocidad = self.linea_tiempo.velocidad
+        self.frame_nivel = 0
+        self.cursor_obstaculos = 0
+        self.cursor_plataformas = 0
+        for obstaculo in self.obstaculos_activos:
+            self.pool_obstaculos.devolver(obstaculo)
+        for plataforma in self.plataformas_activas:
+            self.pool_plataformas.devolver(plataforma)
+        # Las listas activas son las de los barridos en x, siempre ordenadas por x
+        self.barrido_obstaculos = BarridoX(attrgetter("rectangulo_colision"))
+        self.barrido_plataformas = BarridoX(attrgetter("rect"))
+        self.obstaculos_activos = self.barrido_obstaculos.objetos
+        self.plataformas_activas = self.barrido_plataformas.objetos
 
         self.reproducir_musica_juego()
 
-    def manejar_eventos(self):
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT:
-                self.esta_ejecutando = False
-            if evento.type == pygame.KEYDOWN and evento.key == pygame.K_SPACE:
-                if not self.juego_terminado and not self.juego_ganado:
-                    self.jugador.saltar()
-                else:
-                    self.inicializar_juego()
+    def linea_tiempo_nivel(self, nivel, frame=0):
+        if nivel == NIVEL_INFINITO:
+            # El tramo que contiene `frame`; los tramos salen de la semilla (0 si no se fijó; Juego
+            # sortea una por partida) y usan las plataformas del último nivel de la campaña
+            semilla = self.semilla or 0
+            if self.tramos is None or self.tramos.semilla != semilla:
+                ultimo = Nivel.cargar(self.campaña[len(self.campaña)]["nivel"])
+                self.tramos = FlujoTramos(semilla, ("triangulo",), ultimo.plataformas)
+            return self.tramos.en_frame(frame)
+        if nivel == 1 and self.mapa_nivel_1_distancias is not None:
+            return compilar(Nivel.desde_distancias(self.mapa_nivel_1_distancias), self.velocidad_juego, 800)
+        clave = (nivel, self.velocidad_juego)
+        if clave not in self.lineas_tiempo:
+            self.lineas_tiempo[clave] = cargar_nivel(self.campaña[nivel]["nivel"], self.velocidad_juego, 800,
+                                                     tipos_permitidos=("triangulo",))
+        return self.lineas_tiempo[clave]
+
+    def nueva_partida(self, nivel=1):
+        self.nivel_actual = nivel
+        self.inicializar_juego()
+
+    def en_curso(self):
+        return not (self.juego_terminado or self.juego_ganado)
+
+    def partida_ganada(self):
+        return self.juego_ganado
 
     def actualizar_juego(self):
         if self.juego_terminado or self.juego_ganado:
             return
 
-        # Actualizar jugador con plataformas si es nivel 2
-        plataformas_para_colision = self.plataformas_activas if self.nivel_actual == 2 else None
+        # Actualizar jugador con plataformas si el nivel las tiene (solo las que solapan su x)
+        plataformas_para_colision = None
+        if self.linea_tiempo.total_plataformas:
+            rect = self.jugador.rectangulo
+            plataformas_para_colision = self.barrido_plataformas.candidatos(rect.left, rect.right)
         self.jugador.actualizar(plataformas_para_colision)
 
         # Actualizar suelo
         self.suelo.actualizar()
 
-        # Generar obstáculos
-        self.distancia_para_siguiente_obstaculo -= self.velocidad_juego
-        if self.distancia_para_siguiente_obstaculo <= 0:
-            self.obstaculos_activos.append(
-                Obstaculo(800, self.suelo.y, 35, self.colores["ROJO"], self.velocidad_juego, 800)
+        # Generar obstáculos: la línea de tiempo dice en qué frame aparece el siguiente
+        self.frame_nivel += 1
+        linea = self.linea_tiempo
+        if self.frame_nivel >= linea.fin:
+            linea = self.avanzar_tramo()
+        while linea.frames_obstaculos[self.cursor_obstaculos] <= self.frame_nivel:
+            self.barrido_obstaculos.insertar(
+                self.pool_obstaculos.obtener(800, self.suelo.y, 35, self.colores["ROJO"], linea.velocidad, 800)
             )
-            if self.obstaculos_restantes_mapa:
-                self.distancia_para_siguiente_obstaculo = self.obstaculos_restantes_mapa.pop(0)
-            else:
-                self.distancia_para_siguiente_obstaculo = float("inf")
-
-        # Actualizar obstáculos y verificar colisiones
+            self.cursor_obstaculos += 1
+
+        # Actualizar obstáculos: el orden en x se conserva. Todos avanzan igual salvo en el modo
+        # infinito, donde al cambiar de tramo la velocidad sube como mucho 1 px/frame; los que
+        # quedan del tramo anterior salen en menos de 84 frames (835 px a 10 o más) y los nuevos
+        # aparecen al menos 30 frames (300 px) detrás, así que no llegan a alcanzarlos
+        # Superado, x y ancho se leen de las columnas del almacén, sin pasar por las propiedades
+        almacen = self.almacen_obstaculos
         for obstaculo in self.obstaculos_activos:
             obstaculo.actualizar()
-            if self.jugador.rectangulo.colliderect(obstaculo.obtener_rectangulo_colision()):
+            i = obstaculo.indice
+            if not almacen.banderas[i] & BANDERA_SUPERADO and self.jugador.x > almacen.x[i] + almacen.ancho[i]:
+                almacen.banderas[i] |= BANDERA_SUPERADO
+                self.puntuacion += 1
+
+        # Verificar colisiones solo con los obstáculos que solapan al jugador en x
+        rect = self.jugador.rectangulo
+        for obstaculo in self.barrido_obstaculos.candidatos(rect.left, rect.right):
+            if rect.colliderect(obstaculo.rectangulo_colision):
                 self.juego_terminado = True
                 # Reproducir sonido de game over
                 self.reproducir_sonido_game_over()
                 return
-            if not obstaculo.fue_superado and self.jugador.x > obstaculo.x + obstaculo.ancho:
-                obstaculo.fue_superado = True
-                self.puntuacion += 1
 
-        # Verificar cambio de nivel
-        if self.puntuacion == 10 and self.nivel_actual == 1:
-            self.nivel_actual = 2
-            self.inicializar_juego()
-            return
-
-        # Verificar victoria
-        if self.puntuacion >= 20 and self.nivel_actual == 2:
+        # Verificar fin del nivel: se pasa al siguiente de la campaña o, tras el último, se gana
+        if self.puntuacion >= self.campaña.puntos[self.nivel_actual]:
+            if self.nivel_actual < len(self.campaña):
+                self.nivel_actual += 1
+                self.iniciar_nivel()
+                return
             self.juego_ganado = True
             self.reproducir_sonido_victoria()
             return
 
         # Limpiar obstáculos fuera de pantalla
-        self.obstaculos_activos = [o for o in self.obstaculos_activos if o.x + o.ancho > 0]
+        for obstaculo in self.barrido_obstaculos.retirar(lambda o: o.x + o.ancho <= 0):
+            self.pool_obstaculos.devolver(obstaculo)
 
-        # ------- Lógica de plataformas para nivel 2 -------
-        if self.nivel_actual == 2:
+        # ------- Lógica de plataformas (nivel 2) -------
+        if self.plataformas_activas:
             # Actualizar plataformas existentes
             for plataforma in self.plataformas_activas:
                 plataforma.actualizar()
             
             # Eliminar plataformas que salieron de pantalla
-            self.plataformas_activas = [p for p in self.plataformas_activas if p.rect.right > 0]
-
-            # Generar nuevas plataformas cada cierto tiempo
-            self.contador_plataforma += 1
-            if self.contador_plataforma >= 180:  # Cada 3 segundos aprox (60 FPS * 3)
-                self.contador_plataforma = 0
-                # Alternar altura de plataformas (más bajas para ser alcanzables)
-                y_plataforma = 350 if len(self.plataformas_activas) % 2 == 0 else 320
-                nueva_plataforma = PlataformaMovil(800, y_plataforma, 180, 25, self.colores["AZUL"], self.velocidad_juego)
-                self.plataformas_activas.append(nueva_plataforma)
-
-    def dibujar_juego(self):
+            for plataforma in self.barrido_plataformas.retirar(lambda p: p.rect.right <= 0):
+                self.pool_plataformas.devolver(plataforma)
+
+        # Generar nuevas plataformas; la altura alterna y ya viene calculada en la línea de tiempo
+        while linea.frames_plataformas[self.cursor_plataformas] <= self.frame_nivel:
+            nueva_plataforma = self.pool_plataformas.obtener(
+                800, linea.alturas_plataformas[self.cursor_plataformas], linea.ancho_plataforma,
+                linea.alto_plataforma, self.colores["AZUL"], linea.velocidad
+            )
+            self.barrido_plataformas.insertar(nueva_plataforma)
+            self.cursor_plataformas += 1
+
+    def avanzar_tramo(self):
+        # Modo infinito: se pasa al siguiente tramo, ya generado, y el anterior se descarta.
+        # La velocidad nueva es para lo que aparezca desde ahora; lo que está en pantalla sigue igual
+        self.linea_tiempo = linea = self.linea_tiempo_nivel(NIVEL_INFINITO, self.frame_nivel)
+        self.cursor_obstaculos = self.cursor_plataformas = 0
+        self.suelo.velocidad = linea.velocidad
+        return linea
+
+    # ------- Instantáneas -------
+    # Todo lo que cambia entre ticks en un buffer plano (bytes): se copia en microsegundos,
+    # se compara, se guarda o se manda a otro proceso. Lo fijo (mapas, colores, tamaño de
+    # pantalla) no viaja: se restaura sobre un motor con la misma configuración.
+    def instantanea(self):
+        jugador = self.jugador
+        datos = [VERSION_INSTANTANEA, self.nivel_actual, self.puntuacion, self.juego_terminado, self.juego_ganado,
+                 self.frame_nivel, self.cursor_obstaculos, self.cursor_plataformas,
+                 jugador.y, jugador.velocidad_y, jugador.esta_saltando, self.suelo.x,
+                 len(self.obstaculos_activos), len(self.plataformas_activas)]
+        almacen = self.almacen_obstaculos
+        for obstaculo in self.obstaculos_activos:
+            i = obstaculo.indice
+            datos += (almacen.x[i], almacen.y[i], almacen.ancho[i], almacen.velocidad[i], almacen.banderas[i])
+        for plataforma in self.plataformas_activas:
+            datos += (plataforma.rect.x, plataforma.rect.y, plataforma.velocidad)
+        return array("q", datos).tobytes()
+
+    def restaurar(self, instantanea):
+        datos = array("q")
+        datos.frombytes(instantanea)
+        if datos[0] != VERSION_INSTANTANEA:
+            raise ValueError("Instantánea de otra versión del motor")
+        if not hasattr(self, "jugador"):
+            self.inicializar_juego()
+        (_, nivel, self.puntuacion, terminado, ganado, self.frame_nivel, self.cursor_obstaculos,
+         self.cursor_plataformas, y, velocidad_y, saltando, x_suelo, n_obstaculos, n_plataformas) = datos[:CAMPOS_CABECERA]
+        self.juego_terminado, self.juego_ganado = bool(terminado), bool(ganado)
+        # La línea de tiempo solo se busca si la instantánea es de otro nivel o, en el modo
+        # infinito, de otro tramo
+        if nivel != self.nivel_actual or nivel == NIVEL_INFINITO:
+            self.nivel_actual = nivel
+            self.linea_tiempo = self.linea_tiempo_nivel(nivel, self.frame_nivel)
+
+        jugador = self.jugador
+        jugador.y, jugador.velocidad_y, jugador.esta_saltando = y, velocidad_y, bool(saltando)
+        jugador.actualizar_rectangulo()
+        jugador.guardar_posicion()
+        self.suelo.x = x_suelo
+        self.suelo.velocidad = self.linea_tiempo.velocidad
+        self.suelo.actualizar_rectangulo()
+        self.suelo.guardar_posicion()
+
+        # Las entidades vuelven a sus pools y se reconstruyen en el mismo orden del barrido
+        for obstaculo in self.obstaculos_activos:
+            self.pool_obstaculos.devolver(obstaculo)
+        for plataforma in self.plataformas_activas:
+            self.pool_plataformas.devolver(plataforma)
+        self.barrido_obstaculos.vaciar()
+        self.barrido_plataformas.vaciar()
+        pos = CAMPOS_CABECERA
+        for _ in range(n_obstaculos):
+            x, y, ancho, velocidad, banderas = datos[pos:pos + 5]
+            obstaculo = self.pool_obstaculos.obtener(x, y, ancho, self.colores["ROJO"], velocidad, 800)
+            self.almacen_obstaculos.banderas[obstaculo.indice] = banderas
+            self.barrido_obstaculos.insertar(obstaculo)
+            pos += 5
+        linea = self.linea_tiempo
+        for _ in range(n_plataformas):
+            x, y, velocidad = datos[pos:pos + 3]
+            self.barrido_plataformas.insertar(self.pool_plataformas.obtener(
+                x, y, linea.ancho_plataforma, linea.alto_plataforma, self.colores["AZUL"], velocidad))
+            pos += 3
+
+    def simular(self, saltos=(), max_frames=100000):
+        # Avanza la partida sin límite de FPS hasta que termine; salta en los frames indicados
+        saltos = set(saltos)
+        frame = 0
+        while frame < max_frames and self.en_curso():
+            if frame in saltos:
+                self.jugador.saltar()
+            self.actualizar_juego()
+            frame += 1
+        return frame
+
+
+# ----------------------------- Clase principal -----------------------------
+
+class Juego(MotorJuego):
+    def __init__(self, ticks_por_segundo=60, fps_render=60, render_sucio=False,
+                 directorio_grabaciones=DIRECTORIO_GRABACIONES, perfilar=False, ritmo=False, informar=None):
+        super().__init__()
+        self.inicio_arranque = time.perf_counter()
+        # Tiempos de carga de cada recurso y del arranque; por defecto no se informa de nada
+        self.informar = informar
+        pygame.init()
+        pygame.mixer.init()
+
+        self.pantalla = pygame.display.set_mode((800, 600))
+        pygame.display.set_caption("Geometry Dash")
+        self.reloj = pygame.time.Clock()
+        # La simulación avanza a ticks fijos; el dibujo va a fps_render (0 = sin límite)
+        self.paso_fijo = PasoFijo(ticks_por_segundo)
+        self.fps_render = fps_render
+        # Modo de rectángulos sucios: solo se envían a pantalla las zonas que cambian
+        self.render_sucio = RenderSucio(self.pantalla) if render_sucio else None
+        self.fondos_con_suelo = {}
+
+        self.fuente_grande = pygame.font.Font(None, 74)
+        self.fuente_normal = pygame.font.Font(None, 48)
+        self.cache_textos = CacheTextos()
+        self.sprites = CacheSprites()
+        self.hud_puntuacion = MarcadorHUD(self.cache_textos, self.fuente_normal, "Puntuación: {}", self.colores["BLANCO"])
+        self.hud_nivel = MarcadorHUD(self.cache_textos, self.fuente_normal, "Nivel: {}", self.colores["BLANCO"])
+
+        self.menu = Menu(self.pantalla, self.fuente_grande, self.fuente_normal, self.colores, self.cache_textos)
+
+        self.esta_ejecutando = True
+        self.en_menu = True
+        # Cada partida se graba (saltos por frame) para poder repetirla sin ventana; ver repeticion.py
+        self.grabador = Grabador(directorio_grabaciones)
+        # Tiempos por fase de cada frame; F3 muestra el overlay y F4 exporta (ver perfilador.py)
+        self.perfilador = PerfiladorFrames(activo=perfilar)
+
+        # Fondos por ruta (dos niveles con la misma imagen la comparten) y líneas de tiempo por nivel
+        self.recursos = GestorRecursos(informar=self.informar)
+        for etapa in self.campaña.niveles + [self.campaña.infinito]:
+            self.recursos.registrar(etapa["fondo"], lambda ruta=etapa["fondo"]: cargar_fondo(ruta))
+        for nivel in range(1, len(self.campaña) + 1):
+            self.recursos.registrar(f"linea_{nivel}", lambda nivel=nivel: MotorJuego.linea_tiempo_nivel(self, nivel))
+        # El menú necesita el fondo del nivel 1 ya; lo demás espera a que se acerque su nivel
+        self.fondo = self.recursos.obtener(self.campaña[1]["fondo"])
+
+        self.cargar_audio()
+        # Con ritmo=True el nivel 1 sigue los beats de su pista (ver mapa_ritmo.py)
+        self.ritmo = ritmo and self.usar_mapa_ritmo()
+        self.esperando_pista = False
+        # Lo que se puede elegir en el menú: el nivel 1 y el modo infinito
+        self.precargar_nivel(1)
+        self.precargar_nivel(NIVEL_INFINITO)
+
+    def usar_mapa_ritmo(self):
+        # Solo se lee el mapa ya analizado: el análisis es un paso previo (python ritmo.py)
+        pista = self.campaña[1]["musica"]
+        mapa = cargar_mapa(pista)
+        if mapa is None:
+            print(f"{pista} no tiene mapa de ritmo (python ritmo.py): se juega el nivel 1 normal")
+            return False
+        self.mapa_nivel_1_distancias = distancias_ritmo(mapa, self.velocidad_juego, OBSTACULOS_RITMO,
+                                                        ticks_por_segundo=self.paso_fijo.ticks_por_segundo)
+        return True
+
+    def cargar_audio(self):
+        # La música de cada nivel (por ruta) y los efectos se decodifican en segundo plano y se
+        # quedan en memoria (ver audio.GestorAudio)
+        self.audio = GestorAudio(self.recursos, informar=self.informar)
+        for etapa in self.campaña.niveles + [self.campaña.infinito]:
+            self.audio.registrar(etapa["musica"], etapa["musica"], 0.04)
+        self.audio.registrar("sonido_win", "win.mp3", 0.1)
+        self.audio.registrar("sonido_lose", "lose.mp3", 0.1)
+        self.audio.precargar("sonido_win", "sonido_lose")
+
+    def precargar_nivel(self, nivel):
+        # Fondo, música y línea de tiempo del nivel, en el hilo de recursos: al llegar a él
+        # no queda nada que cargar
+        etapa = self.campaña[nivel]
+        self.recursos.precargar(etapa["fondo"])
+        self.audio.precargar(etapa["musica"])
+        if nivel != NIVEL_INFINITO:
+            self.recursos.precargar(f"linea_{nivel}")
+
+    def linea_tiempo_nivel(self, nivel, frame=0):
+        # Las de la campaña salen del gestor de recursos, normalmente ya precargadas
+        if nivel == NIVEL_INFINITO:
+            return super().linea_tiempo_nivel(nivel, frame)
+        return self.recursos.obtener(f"linea_{nivel}")
+
+    def reproducir_musica_juego(self):
+        # Reiniciar reanuda la pista pausada; pasar de nivel la funde con la del siguiente.
+        # Al ritmo, el nivel 1 empieza siempre con su pista desde el principio
+        desde_inicio = self.ritmo and self.nivel_actual == 1
+        self.audio.musica(self.campaña[self.nivel_actual]["musica"], desde_inicio=desde_inicio)
+        # Si la pista aún se decodifica el nivel espera a que suene (ver ejecutar_juego)
+        self.esperando_pista = desde_inicio and self.audio.esperando_inicio()
+
+    def reproducir_sonido_game_over(self):
+        self.audio.pausar_musica()
+        self.audio.efecto("sonido_lose")
+
+    def reproducir_sonido_victoria(self):
+        self.audio.pausar_musica()
+        self.audio.efecto("sonido_win")
+
+    def detener_audio(self):
+        self.audio.detener()
+
+    def iniciar_nivel(self):
+        self.fondo = self.recursos.obtener(self.campaña[self.nivel_actual]["fondo"])
+        super().iniciar_nivel()
+        # Mientras se juega este nivel se prepara el siguiente
+        if 0 < self.nivel_actual < len(self.campaña):
+            self.precargar_nivel(self.nivel_actual + 1)
+
+    def restaurar(self, instantanea):
+        super().restaurar(instantanea)
+        self.fondo = self.recursos.obtener(self.campaña[self.nivel_actual]["fondo"])
+
+    def comenzar_partida(self):
+        # Cada partida infinita tiene su recorrido; la grabación guarda la semilla para repetirlo
+        self.semilla = nueva_semilla() if self.nivel_actual == NIVEL_INFINITO else None
+        self.inicializar_juego()
+        self.grabador.comenzar(self, "main", self.semilla or 0, self.nivel_actual)
+
+    def actualizar_juego(self):
+        super().actualizar_juego()
+        self.grabador.tick()
+
+    def informar_arranque(self):
+        if not self.informar:
+            return
+        ms = (time.perf_counter() - self.inicio_arranque) * 1000
+        aviso = " (supera el presupuesto)" if ms > PRESUPUESTO_ARRANQUE_MS else ""
+        self.informar(f"Primer frame del menú en {ms:.1f} ms, presupuesto {PRESUPUESTO_ARRANQUE_MS} ms{aviso}")
+
+    def guardar_posiciones(self):
+        self.jugador.guardar_posicion()
+        self.suelo.guardar_posicion()
+        for obstaculo in self.obstaculos_activos:
+            obstaculo.guardar_posicion()
+        for plataforma in self.plataformas_activas:
+            plataforma.guardar_posicion()
+
+    def manejar_eventos(self):
+        for evento in pygame.event.get():
+            if self.perfilador.manejar_evento(evento):
+                continue
+            if evento.type == pygame.QUIT:
+                self.esta_ejecutando = False
+            if evento.type == pygame.KEYDOWN and evento.key == pygame.K_SPACE:
+                if not self.juego_terminado and not self.juego_ganado:
+                    self.jugador.saltar()
+                    self.grabador.salto()
+                else:
+                    self.comenzar_partida()
+
+    def dibujar_juego(self, alfa=1.0):
+        marcar = self.perfilador.marcar
         self.pantalla.blit(self.fondo, (0, 0))
+        marcar("fondo")
         
         # Dibujar suelo
-        self.suelo.dibujar(self.pantalla)
+        self.suelo.dibujar(self.pantalla, alfa)
+        marcar("suelo")
         
         # Dibujar plataformas (nivel 2)
         for plataforma in self.plataformas_activas:
-            plataforma.dibujar(self.pantalla)
+            plataforma.dibujar(self.pantalla, alfa, self.sprites)
+        marcar("plataformas")
         
         # Dibujar obstáculos
         for obstaculo in self.obstaculos_activos:
-            obstaculo.dibujar(self.pantalla)
+            obstaculo.dibujar(self.pantalla, alfa, self.sprites)
+        marcar("obstaculos")
         
         # Dibujar jugador
-        self.jugador.dibujar(self.pantalla)
+        self.jugador.dibujar(self.pantalla, alfa)
+        marcar("jugador")
 
         # UI
-        texto_puntuacion = self.fuente_normal.render(f"Puntuación: {self.puntuacion}", True, self.colores["BLANCO"])
-        texto_nivel = self.fuente_normal.render(f"Nivel: {self.nivel_actual}", True, self.colores["BLANCO"])
-        self.pantalla.blit(texto_puntuacion, (20, 20))
-        self.pantalla.blit(texto_nivel, (20, 60))
+        self.pantalla.blit(self.hud_puntuacion.superficie(self.puntuacion), (20, 20))
+        self.pantalla.blit(self.hud_nivel.superficie(self.nivel_actual or "∞"), (20, 60))
 
         # Pantalla de fin de juego
         if self.juego_terminado or self.juego_ganado:
-            superposicion = pygame.Surface((800, 600))
-            superposicion.set_alpha(150)
-            superposicion.fill((0, 0, 0))
-            self.pantalla.blit(superposicion, (0, 0))
+            self.pantalla.blit(self.sprites.superposicion((800, 600), (0, 0, 0), 150), (0, 0))
             
             mensaje = "¡FELICIDADES!" if self.juego_ganado else "Game Over"
             color_mensaje = (0, 255, 0) if self.juego_ganado else (255, 0, 0)
             
-            texto_final = self.fuente_grande.render(mensaje, True, color_mensaje)
-            texto_puntuacion_final = self.fuente_normal.render(f"Puntuación final: {self.puntuacion}", True, (255, 255, 255))
-            texto_reiniciar = self.fuente_normal.render("Presione SPACE para reiniciar", True, (200, 200, 200))
+            texto_final = self.cache_textos.render(self.fuente_grande, mensaje, True, color_mensaje)
+            texto_puntuacion_final = self.cache_textos.render(self.fuente_normal, f"Puntuación final: {self.puntuacion}", True, (255, 255, 255))
+            texto_reiniciar = self.cache_textos.render(self.fuente_normal, "Presione SPACE para reiniciar", True, (200, 200, 200))
             
             self.pantalla.blit(texto_final, (400 - texto_final.get_width() // 2, 200))
             self.pantalla.blit(texto_puntuacion_final, (400 - texto_puntuacion_final.get_width() // 2, 280))
             self.pantalla.blit(texto_reiniciar, (400 - texto_reiniciar.get_width() // 2, 330))
-    
+        marcar("hud")
+
+    def dibujar_perfilador(self):
+        # Devuelve el rect del overlay de rendimiento, o None si no se muestra
+        if not self.perfilador.overlay_visible:
+            return None
+        rect = self.perfilador.dibujar(self.pantalla)
+        self.perfilador.marcar("overlay")
+        return rect
+
+
+    def fondo_con_suelo(self):
+        # El suelo es una franja de color uniforme: su desplazamiento no se ve y va pegado al fondo
+        fondo = self.fondos_con_suelo.get(self.fondo)
+        if fondo is None:
+            fondo = self.fondo.convert()
+            pygame.draw.rect(fondo, self.suelo.color, (0, self.suelo.y, self.suelo.ancho, self.suelo.alto))
+            self.fondos_con_suelo[self.fondo] = fondo
+        return fondo
+
+    def dibujar_juego_sucio(self, alfa=1.0):
+        render = self.render_sucio
+        marcar = self.perfilador.marcar
+        if not self.en_curso():
+            # La superposición de fin de juego cubre toda la pantalla
+            self.dibujar_juego(alfa)
+            self.dibujar_perfilador()
+            pygame.display.flip()
+            marcar("flip")
+            render.invalidar()
+            return
 
+        render.comenzar(self.fondo_con_suelo())
+        marcar("fondo")
+        for plataforma in self.plataformas_activas:
+            render.agregar(plataforma.dibujar(self.pantalla, alfa, self.sprites))
+        marcar("plataformas")
+        for obstaculo in self.obstaculos_activos:
+            render.agregar(obstaculo.dibujar(self.pantalla, alfa, self.sprites))
+        marcar("obstaculos")
+        render.agregar(self.jugador.dibujar(self.pantalla, alfa))
+        marcar("jugador")
+        render.agregar(self.pantalla.blit(self.hud_puntuacion.superficie(self.puntuacion), (20, 20)))
+        render.agregar(self.pantalla.blit(self.hud_nivel.superficie(self.nivel_actual or "∞"), (20, 60)))
+        marcar("hud")
+        rect = self.dibujar_perfilador()
+        if rect:
+            render.agregar(rect)
+        render.presentar()
+        marcar("flip")
 
     def ejecutar_juego(self):
+        perfilador = self.perfilador
         while self.esta_ejecutando:
+            perfilador.comenzar_frame()
+            self.audio.actualizar()
             if self.en_menu:
                 eventos = pygame.event.get()
+                for evento in eventos:
+                    perfilador.manejar_evento(evento)
                 accion = self.menu.manejar_eventos(eventos)
-                if accion == "INICIAR_JUEGO":
-                    self.inicializar_juego()
+                perfilador.marcar("eventos")
+                if accion in ("INICIAR_JUEGO", "INICIAR_INFINITO"):
+                    # Reiniciar con SPACE repite el modo elegido
+                    self.nivel_actual = NIVEL_INFINITO if accion == "INICIAR_INFINITO" else 1
+                    self.comenzar_partida()
                     self.en_menu = False
+                    self.paso_fijo.reiniciar()
                 elif accion == "SALIR":
                     self.esta_ejecutando = False
                 else:
                     mouse_pos = pygame.mouse.get_pos()
                     self.menu.dibujar(self.fondo, mouse_pos)
+                    perfilador.marcar("menu")
+                    self.dibujar_perfilador()
                     pygame.display.flip()
-                    self.reloj.tick(60)
+                    perfilador.marcar("flip")
+                    if self.inicio_arranque is not None:
+                        self.informar_arranque()
+                        self.inicio_arranque = None
+                    if self.render_sucio:
+                        self.render_sucio.invalidar()
+                    self.reloj.tick(self.fps_render)
             else:
                 self.manejar_eventos()
-                self.actualizar_juego()
-                self.dibujar_juego()
-                pygame.display.flip()
-                self.reloj.tick(60)
+                perfilador.marcar("eventos")
+                if self.esperando_pista:
+                    # Al ritmo, la simulación arranca en el frame en que audio.actualizar() hace sonar la pista
+                    self.esperando_pista = self.audio.esperando_inicio()
+                    self.paso_fijo.reiniciar()
+                for _ in range(self.paso_fijo.ticks_pendientes()):
+                    self.guardar_posiciones()
+                    self.actualizar_juego()
+                perfilador.marcar("actualizar")
+                if self.render_sucio:
+                    self.dibujar_juego_sucio(self.paso_fijo.alfa)
+                else:
+                    self.dibujar_juego(self.paso_fijo.alfa)
+                    self.dibujar_perfilador()
+                    pygame.display.flip()
+                    perfilador.marcar("flip")
+                self.reloj.tick(self.fps_render)
+            perfilador.marcar("espera")
+            perfilador.terminar_frame(len(self.obstaculos_activos) + len(self.plataformas_activas))
 
+        self.grabador.terminar()
         self.detener_audio()
+        self.recursos.cerrar()
         pygame.quit()
 
 
 if __name__ == "__main__":
-    Juego().ejecutar_juego()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Geometry Dash")
+    parser.add_argument("--informar", action="store_true", help="muestra los tiempos de carga y de arranque")
+    args = parser.parse_args()
+    Juego(informar=print if args.informar else None).ejecutar_juego()
\ No newline at end of file
@@ -0,0 +1,99 @@
+import hashlib
+import os
+import struct
+
+# ----------------------------- Mapas de ritmo -----------------------------
+# Lo que queda del análisis de una pista (ver ritmo.py): su duración, el tempo, el instante
+# de cada beat y de cada onset con su fuerza, todo en milisegundos. Se guarda en un binario
+# compacto en .cache_ritmo con el hash del audio en el nombre, así que cambiar la pista
+# invalida su mapa sola. El juego solo lee estos archivos: nunca decodifica ni analiza audio.
+#
+# distancias_ritmo() lo convierte en las distancias entre obstáculos de mapa_nivel_1_distancias:
+# cada obstáculo aparece en el frame justo para pasar bajo el centro del jugador en su beat,
+# contando el tiempo desde el primer frame del nivel, cuando empieza a sonar la pista.
+
+DIRECTORIO_CACHE = ".cache_ritmo"
+CABECERA = struct.Struct("<4sHIIII")
+MAGIA = b"RTMO"
+VERSION = 1
+
+ANCHO_PANTALLA = 800
+X_CENTRO_JUGADOR = 125
+TICKS_POR_SEGUNDO = 60
+DISTANCIA_MINIMA = 300  # px; con 280 entre todos los obstáculos el nivel 1 ya no se puede pasar
+
+
+class MapaRitmo:
+    def __init__(self, duracion, tempo, beats, onsets, fuerzas):
+        self.duracion = duracion  # ms
+        self.tempo = tempo        # beats por minuto
+        self.beats = beats        # ms, en orden
+        self.onsets = onsets      # ms, en orden
+        self.fuerzas = fuerzas    # 0-255 por onset
+
+    def a_bytes(self):
+        cabecera = CABECERA.pack(MAGIA, VERSION, self.duracion, round(self.tempo * 100),
+                                 len(self.beats), len(self.onsets))
+        return (cabecera + struct.pack(f"<{len(self.beats)}I", *self.beats)
+                + struct.pack(f"<{len(self.onsets)}I", *self.onsets) + bytes(self.fuerzas))
+
+    @classmethod
+    def desde_bytes(cls, datos):
+        magia, version, duracion, tempo, n_beats, n_onsets = CABECERA.unpack_from(datos)
+        if magia != MAGIA or version != VERSION:
+            raise ValueError("No es un mapa de ritmo compatible")
+        inicio = CABECERA.size
+        beats = list(struct.unpack_from(f"<{n_beats}I", datos, inicio))
+        inicio += 4 * n_beats
+        onsets = list(struct.unpack_from(f"<{n_onsets}I", datos, inicio))
+        inicio += 4 * n_onsets
+        return cls(duracion, tempo / 100, beats, onsets, list(datos[inicio:inicio + n_onsets]))
+
+
+def ruta_mapa(ruta_audio, directorio=DIRECTORIO_CACHE):
+    with open(ruta_audio, "rb") as archivo:
+        huella = hashlib.sha256(archivo.read()).hexdigest()[:16]
+    nombre = os.path.splitext(os.path.basename(ruta_audio))[0]
+    return os.path.join(directorio, f"{nombre}-{huella}.ritmo")
+
+
+def guardar_mapa(mapa, ruta_audio, directorio=DIRECTORIO_CACHE):
+    destino = ruta_mapa(ruta_audio, directorio)
+    os.makedirs(directorio, exist_ok=True)
+    temporal = destino + ".tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(mapa.a_bytes())
+    os.replace(temporal, destino)
+    return destino
+
+
+def cargar_mapa(ruta_audio, directorio=DIRECTORIO_CACHE):
+    # None si la pista aún no se analizó (python ritmo.py)
+    ruta = ruta_mapa(ruta_audio, directorio)
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, "rb") as archivo:
+        return MapaRitmo.desde_bytes(archivo.read())
+
+
+def distancias_ritmo(mapa, velocidad, cantidad, fuente="beats", cada=1, minimo=DISTANCIA_MINIMA,
+                     ticks_por_segundo=TICKS_POR_SEGUNDO, ancho_pantalla=ANCHO_PANTALLA):
+    # Un obstáculo cada `cada` instantes de la fuente ("beats" u "onsets"), saltándose los que
+    # quedarían a menos de `minimo` px del anterior. La pista suena en bucle: si no llegan a
+    # `cantidad` se siguen tomando de la siguiente vuelta
+    instantes = (mapa.beats if fuente == "beats" else mapa.onsets)[::cada]
+    if not instantes or not mapa.duracion:
+        raise ValueError("El mapa de ritmo no tiene instantes que usar")
+    llegada = -(-(ancho_pantalla - X_CENTRO_JUGADOR) // velocidad)  # frames de spawn al jugador
+    frames_minimos = -(-minimo // velocidad)
+    resultado, anterior, vuelta = [], 0, 0
+    while len(resultado) < cantidad:
+        for ms in instantes:
+            frame = round((vuelta * mapa.duracion + ms) * ticks_por_segundo / 1000) - llegada
+            if frame - anterior >= (frames_minimos if resultado else 1):
+                resultado.append((frame - anterior) * velocidad)
+                anterior = frame
+                if len(resultado) == cantidad:
+                    break
+        vuelta += 1
+    return resultado
@@ -0,0 +1,253 @@
+import json
+import os
+import random
+import struct
+import sys
+from array import array
+from itertools import accumulate
+
+from azar import enteros
+
+# ----------------------------- Formato de niveles -----------------------------
+# Un nivel se describe en JSON con tramos de obstáculos y, si los hay, un patrón de
+# plataformas:
+#
+#   {"nombre": "Nivel 2",
+#    "obstaculos": [{"tipo": "triangulo", "distancia": 600, "repetir": 50}],
+#    "plataformas": {"cada": 180, "alturas": [350, 320], "ancho": 180, "alto": 25}}
+#
+# "distancia" son los píxeles de scroll hasta el siguiente obstáculo: un número, una
+# lista explícita, o [mínimo, máximo] junto con "repetir" para sortearla en cada partida.
+# Antes de jugar, el nivel se compila a una línea de tiempo indexada por frame: el motor
+# solo compara el frame actual con el del siguiente spawn y avanza un cursor, sin pop(0)
+# ni contadores por frame.
+# Los niveles sin sorteo se pueden guardar ya compilados en un binario compacto (.nivel).
+
+TIPOS = ("triangulo", "variable")
+FIN = 2 ** 31 - 1  # Centinela al final de cada línea de tiempo: ningún frame llega a él
+
+DIRECTORIO_NIVELES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "niveles")
+CABECERA = struct.Struct("<4sHiiiii")
+MAGIA = b"NIVL"
+VERSION = 1
+
+
+class Nivel:
+    def __init__(self, obstaculos, plataformas=None, nombre=""):
+        self.obstaculos = obstaculos
+        self.plataformas = plataformas
+        self.nombre = nombre
+        for tramo in obstaculos:
+            if tramo.get("tipo", "triangulo") not in TIPOS:
+                raise ValueError(f"Tipo de obstáculo desconocido: {tramo['tipo']}")
+
+    @classmethod
+    def desde_json(cls, ruta):
+        with open(ruta, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+        return cls(datos["obstaculos"], datos.get("plataformas"), datos.get("nombre", ""))
+
+    @classmethod
+    def cargar(cls, nombre, directorio=DIRECTORIO_NIVELES):
+        return cls.desde_json(os.path.join(directorio, nombre + ".json"))
+
+    @classmethod
+    def desde_distancias(cls, distancias, tipo="triangulo", plataformas=None):
+        return cls([{"tipo": tipo, "distancia": list(distancias)}], plataformas)
+
+    @property
+    def aleatorio(self):
+        return any(isinstance(t["distancia"], list) and len(t["distancia"]) == 2 and "repetir" in t
+                   for t in self.obstaculos)
+
+    def expandir(self, rng=random):
+        # Distancias y tipos obstáculo a obstáculo; cada rango se sortea de una vez con rng
+        distancias, tipos = [], []
+        for tramo in self.obstaculos:
+            tipo = TIPOS.index(tramo.get("tipo", "triangulo"))
+            distancia = tramo["distancia"]
+            if isinstance(distancia, list) and "repetir" in tramo:
+                minimo, maximo = distancia
+                nuevas = enteros(rng, minimo, maximo, tramo["repetir"])
+            elif isinstance(distancia, list):
+                nuevas = distancia
+            else:
+                nuevas = [distancia] * tramo.get("repetir", 1)
+            distancias.extend(nuevas)
+            tipos.extend([tipo] * len(nuevas))
+        return distancias, tipos
+
+    def distancias(self):
+        if self.aleatorio:
+            raise ValueError("El nivel sortea sus distancias: usar expandir(rng)")
+        return self.expandir()[0]
+
+
+class LineaTiempo:
+    def __init__(self, velocidad, frames_obstaculos, tipos_obstaculos,
+                 frames_plataformas=None, alturas_plataformas=None, ancho_plataforma=0, alto_plataforma=0, fin=FIN):
+        self.velocidad = velocidad
+        self.frames_obstaculos = frames_obstaculos
+        self.tipos_obstaculos = tipos_obstaculos
+        self.frames_plataformas = frames_plataformas if frames_plataformas is not None else array("i", [FIN])
+        self.alturas_plataformas = alturas_plataformas if alturas_plataformas is not None else array("i", [0])
+        self.ancho_plataforma = ancho_plataforma
+        self.alto_plataforma = alto_plataforma
+        # Frame en que el motor pasa a otra línea de tiempo: solo acaban los tramos del modo infinito
+        self.fin = fin
+
+    @property
+    def total_obstaculos(self):
+        return len(self.frames_obstaculos) - 1
+
+    @property
+    def total_plataformas(self):
+        return len(self.frames_plataformas) - 1
+
+
+def _validar_tipos(tipos, tipos_permitidos):
+    for tipo in set(tipos):
+        if TIPOS[tipo] not in tipos_permitidos:
+            raise ValueError(f"Este juego no admite obstáculos de tipo '{TIPOS[tipo]}'")
+
+
+def compilar(nivel, velocidad, ancho_pantalla=800, rng=random, tipos_permitidos=TIPOS):
+    distancias, tipos = nivel.expandir(rng)
+    _validar_tipos(tipos, tipos_permitidos)
+
+    # Cada distancia se consume a `velocidad` píxeles por frame y el spawn ocurre en el
+    # primer frame en que llega a 0 (el sobrante no se arrastra al siguiente)
+    frames_obstaculos = array("i", accumulate(max(1, -(-d // velocidad)) for d in distancias))
+    frames_obstaculos.append(FIN)
+    tipos_obstaculos = array("B", tipos)
+    tipos_obstaculos.append(0)
+
+    patron = nivel.plataformas
+    if not patron:
+        return LineaTiempo(velocidad, frames_obstaculos, tipos_obstaculos)
+
+    # Hay plataformas hasta que el último obstáculo cruza la pantalla. La altura alterna
+    # según cuántas plataformas siguen en pantalla al aparecer la nueva: como todas van a
+    # la misma velocidad se sabe de antemano en qué frame sale cada una.
+    ultimo = frames_obstaculos[-2] if len(frames_obstaculos) > 1 else 0
+    fin = ultimo + -(-ancho_pantalla // velocidad)
+    vida = -(-(ancho_pantalla + patron["ancho"]) // velocidad)
+    alturas = patron["alturas"]
+    frames_plataformas, alturas_plataformas = array("i"), array("i")
+    primera_en_pantalla = 0
+    for frame in range(patron["cada"], fin + 1, patron["cada"]):
+        while (primera_en_pantalla < len(frames_plataformas)
+               and frames_plataformas[primera_en_pantalla] + vida <= frame):
+            primera_en_pantalla += 1
+        en_pantalla = len(frames_plataformas) - primera_en_pantalla
+        frames_plataformas.append(frame)
+        alturas_plataformas.append(alturas[en_pantalla % len(alturas)])
+    frames_plataformas.append(FIN)
+    alturas_plataformas.append(0)
+    return LineaTiempo(velocidad, frames_obstaculos, tipos_obstaculos, frames_plataformas,
+                       alturas_plataformas, patron["ancho"], patron["alto"])
+
+
+# ----------------------------- Campañas -----------------------------
+# Los niveles de cada juego en orden, con el archivo del nivel, los puntos que hay que
+# conseguir en él para pasar al siguiente (o ganar, tras el último) y su fondo y música.
+# "infinito" da el fondo y la música del modo infinito, el nivel 0, que nunca se pasa:
+#
+#   {"niveles": [{"nivel": "nivel_1", "puntos": 10, "fondo": "bg.png", "musica": "Castle-town.mp3"}, ...],
+#    "infinito": {"fondo": "nivel2.jpeg", "musica": "bossfight-Vextron.mp3"}}
+
+class Campaña:
+    def __init__(self, niveles, infinito=None):
+        self.niveles = niveles
+        self.infinito = infinito or niveles[-1]
+        # Puntos para pasar cada nivel, indexados por nivel_actual; el infinito no llega nunca
+        self.puntos = [FIN] + [nivel["puntos"] for nivel in niveles]
+        # Y los ya ganados al empezar cada nivel (los de los anteriores); en el infinito, ninguno
+        self.puntos_previos = [0] + list(accumulate([0] + self.puntos[1:-1]))
+
+    @classmethod
+    def cargar(cls, juego, directorio=DIRECTORIO_NIVELES):
+        with open(os.path.join(directorio, f"campaña_{juego}.json"), encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+        return cls(datos["niveles"], datos.get("infinito"))
+
+    def __len__(self):
+        return len(self.niveles)
+
+    def __getitem__(self, nivel):
+        # Los niveles se numeran desde 1; el 0 es el modo infinito
+        return self.niveles[nivel - 1] if nivel else self.infinito
+
+
+# ----------------------------- Binario compilado -----------------------------
+# Cabecera (magia, versión, velocidad, nº de obstáculos, nº de plataformas, ancho y alto
+# de plataforma) seguida de las columnas en little-endian, centinelas incluidos.
+
+def _columna_en_disco(columna):
+    if sys.byteorder == "big":
+        columna = array(columna.typecode, columna)
+        columna.byteswap()
+    return columna.tobytes()
+
+
+def _columna_de_disco(tipo, datos, inicio, cantidad):
+    columna = array(tipo)
+    fin = inicio + cantidad * columna.itemsize
+    columna.frombytes(datos[inicio:fin])
+    if sys.byteorder == "big":
+        columna.byteswap()
+    return columna, fin
+
+
+def guardar_linea_tiempo(linea, ruta):
+    with open(ruta, "wb") as archivo:
+        archivo.write(CABECERA.pack(MAGIA, VERSION, linea.velocidad, len(linea.frames_obstaculos),
+                                    len(linea.frames_plataformas), linea.ancho_plataforma, linea.alto_plataforma))
+        for columna in (linea.frames_obstaculos, linea.tipos_obstaculos,
+                        linea.frames_plataformas, linea.alturas_plataformas):
+            archivo.write(_columna_en_disco(columna))
+
+
+def cargar_linea_tiempo(ruta, velocidad):
+    with open(ruta, "rb") as archivo:
+        datos = archivo.read()
+    magia, version, velocidad_archivo, n_obstaculos, n_plataformas, ancho, alto = CABECERA.unpack_from(datos)
+    if magia != MAGIA or version != VERSION:
+        raise ValueError(f"{ruta} no es un nivel compilado compatible")
+    if velocidad_archivo != velocidad:
+        raise ValueError(f"{ruta} se compiló para velocidad {velocidad_archivo}, no {velocidad}")
+    inicio = CABECERA.size
+    frames_obstaculos, inicio = _columna_de_disco("i", datos, inicio, n_obstaculos)
+    tipos_obstaculos, inicio = _columna_de_disco("B", datos, inicio, n_obstaculos)
+    frames_plataformas, inicio = _columna_de_disco("i", datos, inicio, n_plataformas)
+    alturas_plataformas, inicio = _columna_de_disco("i", datos, inicio, n_plataformas)
+    return LineaTiempo(velocidad, frames_obstaculos, tipos_obstaculos, frames_plataformas,
+                       alturas_plataformas, ancho, alto)
+
+
+def cargar_nivel(nombre, velocidad, ancho_pantalla=800, directorio=DIRECTORIO_NIVELES, tipos_permitidos=TIPOS):
+    # Usa el binario precompilado si está al día con el JSON; si no, compila en memoria
+    ruta_json = os.path.join(directorio, nombre + ".json")
+    ruta_binario = os.path.join(directorio, f"{nombre}-v{velocidad}.nivel")
+    if os.path.exists(ruta_binario) and os.path.getmtime(ruta_binario) >= os.path.getmtime(ruta_json):
+        linea = cargar_linea_tiempo(ruta_binario, velocidad)
+        _validar_tipos(linea.tipos_obstaculos[:-1], tipos_permitidos)
+        return linea
+    return compilar(Nivel.cargar(nombre, directorio), velocidad, ancho_pantalla, tipos_permitidos=tipos_permitidos)
+
+
+if __name__ == "__main__":
+    # Paso de preparación: python niveles.py [velocidad] compila todos los niveles sin sorteo
+    velocidad = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for archivo in sorted(os.listdir(DIRECTORIO_NIVELES)):
+        if not archivo.endswith(".json") or archivo.startswith("campaña_"):
+            continue
+        nombre = archivo[:-5]
+        nivel = Nivel.desde_json(os.path.join(DIRECTORIO_NIVELES, archivo))
+        if nivel.aleatorio:
+            print(f"{archivo}: sortea sus distancias en cada partida, se compila al jugar")
+            continue
+        linea = compilar(nivel, velocidad)
+        destino = os.path.join(DIRECTORIO_NIVELES, f"{nombre}-v{velocidad}.nivel")
+        guardar_linea_tiempo(linea, destino)
+        print(f"{archivo} -> {destino} ({linea.total_obstaculos} obstáculos, {linea.total_plataformas} plataformas)")
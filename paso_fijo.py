@@ -0,0 +1,39 @@
+import time
+
+# ----------------------------- Paso de simulación fijo -----------------------------
+# Acumula el tiempo real transcurrido y lo convierte en ticks de simulación de duración
+# fija. La física sigue contando ticks (como antes contaba frames), así que el resultado
+# de una partida no depende de la velocidad de la máquina ni de los FPS de dibujo.
+# `alfa` es la fracción de tick pendiente, para interpolar el dibujo entre dos ticks.
+
+class PasoFijo:
+    def __init__(self, ticks_por_segundo=60, max_ticks_por_frame=5):
+        self.ticks_por_segundo = ticks_por_segundo
+        self.dt = 1.0 / ticks_por_segundo
+        # Si un frame tarda demasiado se descarta el retraso en vez de encadenar ticks sin fin
+        self.max_ticks_por_frame = max_ticks_por_frame
+        self.acumulado = 0.0
+        self.ultimo = None
+
+    def reiniciar(self):
+        self.acumulado = 0.0
+        self.ultimo = time.perf_counter()
+
+    def ticks_pendientes(self):
+        ahora = time.perf_counter()
+        if self.ultimo is None:
+            self.ultimo = ahora
+        self.acumulado += ahora - self.ultimo
+        self.ultimo = ahora
+
+        ticks = int(self.acumulado / self.dt)
+        if ticks > self.max_ticks_por_frame:
+            ticks = self.max_ticks_por_frame
+            self.acumulado = 0.0
+        else:
+            self.acumulado -= ticks * self.dt
+        return ticks
+
+    @property
+    def alfa(self):
+        return min(self.acumulado / self.dt, 1.0)
@@ -0,0 +1,222 @@
+import csv
+import json
+import os
+import sys
+import time
+from array import array
+
+import pygame
+
+# ----------------------------- Perfilador de frames por fases -----------------------------
+# Mide cuánto tarda cada fase de un frame de ejecutar_juego (eventos, actualizar_juego, cada
+# parte del dibujo, display.flip y la espera del reloj) con marcas de vuelta: marcar(fase)
+# suma a esa fase el tiempo desde la marca anterior. Cada frame guarda además el total, las
+# entidades activas y los bloques de memoria que ganó el intérprete (asignaciones netas).
+# Los últimos FRAMES_HISTORIAL frames viven en anillos de array, sin crecer, y de ahí salen
+# los percentiles, la gráfica del overlay (F3) y la exportación a CSV o JSON (F4).
+# Desactivado, comenzar_frame/marcar/terminar_frame son una función vacía.
+
+FASES = ("eventos", "menu", "actualizar", "fondo", "suelo", "plataformas", "obstaculos",
+         "jugador", "hud", "overlay", "flip", "espera")
+FRAMES_HISTORIAL = 3600  # un minuto a 60 FPS
+FRAMES_VENTANA = 300     # percentiles del overlay: los últimos 5 s
+FRAMES_GRAFICA = 240
+REFRESCO_TEXTO = 30      # frames entre recálculos del texto del overlay
+PRESUPUESTO_MS = 1000 / 60
+PERCENTILES = (50, 95, 99)
+DIRECTORIO_PERFILES = "perfiles"
+
+ALTO_GRAFICA = 80
+COLOR_PANEL = (20, 20, 20)
+COLORES_BARRA = ((0, 200, 0), (230, 200, 0), (230, 40, 40))  # dentro del presupuesto, hasta el doble, más
+
+
+def _nada(*argumentos):
+    pass
+
+
+class PerfiladorFrames:
+    def __init__(self, activo=False, fases=FASES, historial=FRAMES_HISTORIAL):
+        self.fases = fases
+        self.indices = {fase: i for i, fase in enumerate(fases)}
+        self.historial = historial
+        self.tiempos = [array("d", bytes(8 * historial)) for _ in fases]  # ms por fase y frame
+        self.totales = array("d", bytes(8 * historial))
+        self.entidades = array("i", bytes(4 * historial))
+        self.asignaciones = array("i", bytes(4 * historial))
+        self.frames = 0
+        self.actual = [0.0] * len(fases)
+        self.inicio = self.ultimo = 0.0
+        self.bloques = 0
+        self.en_frame = False
+
+        self.overlay_visible = False
+        self.activado_por_overlay = False
+        self.fuente = None
+        self.grafica = None
+        self.frame_grafica = 0
+        self.texto = None
+        self.frame_texto = -REFRESCO_TEXTO
+        self.activar(activo)
+
+    def activar(self, activo=True):
+        # Apagado, las tres llamadas del bucle quedan como atributos de instancia que no hacen nada
+        self.activo = activo
+        self.en_frame = False
+        for nombre in ("comenzar_frame", "marcar", "terminar_frame"):
+            if activo:
+                self.__dict__.pop(nombre, None)
+            else:
+                setattr(self, nombre, _nada)
+
+    def comenzar_frame(self):
+        self.inicio = self.ultimo = time.perf_counter()
+        self.bloques = sys.getallocatedblocks()
+        actual = self.actual
+        for i in range(len(actual)):
+            actual[i] = 0.0
+        self.en_frame = True
+
+    def marcar(self, fase):
+        ahora = time.perf_counter()
+        self.actual[self.indices[fase]] += ahora - self.ultimo
+        self.ultimo = ahora
+
+    def terminar_frame(self, entidades=0):
+        if not self.en_frame:
+            return
+        ahora = time.perf_counter()
+        i = self.frames % self.historial
+        for columna, segundos in zip(self.tiempos, self.actual):
+            columna[i] = segundos * 1000
+        self.totales[i] = (ahora - self.inicio) * 1000
+        self.entidades[i] = entidades
+        self.asignaciones[i] = sys.getallocatedblocks() - self.bloques
+        self.frames += 1
+        self.en_frame = False
+
+    # ------- Consultas -------
+
+    def _ultimos(self, columna, cantidad=None):
+        # Los `cantidad` frames más recientes del anillo, del más antiguo al más nuevo
+        guardados = min(self.frames, self.historial)
+        cantidad = guardados if cantidad is None else min(cantidad, guardados)
+        fin = self.frames % self.historial
+        if cantidad <= fin:
+            return columna[fin - cantidad:fin]
+        return columna[self.historial - (cantidad - fin):] + columna[:fin]
+
+    def percentiles(self, ventana=None):
+        resumen = {}
+        columnas = [("total", self.totales)] + list(zip(self.fases, self.tiempos))
+        for nombre, columna in columnas:
+            ordenados = sorted(self._ultimos(columna, ventana))
+            if ordenados:
+                resumen[nombre] = {f"p{p}": ordenados[min(len(ordenados) - 1, len(ordenados) * p // 100)]
+                                   for p in PERCENTILES}
+        return resumen
+
+    # ------- Exportación -------
+
+    def exportar_csv(self, ruta):
+        columnas = [self._ultimos(self.totales)] + [self._ultimos(c) for c in self.tiempos]
+        primero = self.frames - len(columnas[0])
+        with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(["frame", "total_ms"] + [f"{fase}_ms" for fase in self.fases] + ["entidades", "asignaciones"])
+            for fila, valores in enumerate(zip(*columnas, self._ultimos(self.entidades), self._ultimos(self.asignaciones))):
+                escritor.writerow([primero + fila] + [f"{v:.4f}" for v in valores[:-2]] + list(valores[-2:]))
+
+    def exportar_json(self, ruta):
+        datos = {
+            "frames": self.frames,
+            "presupuesto_ms": PRESUPUESTO_MS,
+            "percentiles_ms": self.percentiles(),
+            "total_ms": self._ultimos(self.totales).tolist(),
+            "fases_ms": {fase: self._ultimos(columna).tolist() for fase, columna in zip(self.fases, self.tiempos)},
+            "entidades": self._ultimos(self.entidades).tolist(),
+            "asignaciones": self._ultimos(self.asignaciones).tolist(),
+        }
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo)
+
+    def exportar(self, directorio=DIRECTORIO_PERFILES):
+        os.makedirs(directorio, exist_ok=True)
+        base = os.path.join(directorio, f"perfil-{time.strftime('%Y%m%d-%H%M%S')}")
+        self.exportar_csv(base + ".csv")
+        self.exportar_json(base + ".json")
+        return base
+
+    # ------- Overlay -------
+
+    def alternar_overlay(self):
+        # Mostrar el overlay enciende el perfilador si estaba apagado; ocultarlo lo vuelve a apagar
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible and not self.activo:
+            self.activar(True)
+            self.activado_por_overlay = True
+        elif not self.overlay_visible and self.activado_por_overlay:
+            self.activar(False)
+            self.activado_por_overlay = False
+
+    def manejar_evento(self, evento):
+        # F3 muestra u oculta el overlay, F4 exporta lo medido; devuelve True si era una de ellas
+        if evento.type != pygame.KEYDOWN or evento.key not in (pygame.K_F3, pygame.K_F4):
+            return False
+        if evento.key == pygame.K_F3:
+            self.alternar_overlay()
+        elif self.frames:
+            print(f"Perfil exportado en {self.exportar()}.csv/.json")
+        return True
+
+    def _actualizar_texto(self):
+        resumen = self.percentiles(FRAMES_VENTANA)
+        textos = []
+        if "total" in resumen:
+            total = resumen["total"]
+            textos.append(f"frame  p50 {total['p50']:.2f}  p95 {total['p95']:.2f}  p99 {total['p99']:.2f} ms")
+        for fase in self.fases:
+            valores = resumen.get(fase)
+            if valores and valores["p99"] >= 0.01:
+                textos.append(f"{fase:<11} {valores['p50']:6.2f} {valores['p95']:6.2f} {valores['p99']:6.2f}")
+        if self.frames:
+            i = (self.frames - 1) % self.historial
+            textos.append(f"entidades {self.entidades[i]}  asignaciones {self.asignaciones[i]:+d}")
+        lineas = [self.fuente.render(texto, True, (255, 255, 255), COLOR_PANEL) for texto in textos]
+        self.texto = pygame.Surface((FRAMES_GRAFICA, 8 + 16 * len(lineas)))
+        self.texto.fill(COLOR_PANEL)
+        for i, linea in enumerate(lineas):
+            self.texto.blit(linea, (6, 4 + 16 * i))
+        self.frame_texto = self.frames
+
+    def _actualizar_grafica(self):
+        # Una columna por frame: se desplaza lo ya dibujado y solo se pintan los frames nuevos.
+        # La línea blanca es el presupuesto de 60 FPS y la escala llega al doble
+        if self.grafica is None:
+            self.grafica = pygame.Surface((FRAMES_GRAFICA, ALTO_GRAFICA))
+            self.grafica.fill(COLOR_PANEL)
+        nuevos = min(self.frames - self.frame_grafica, FRAMES_GRAFICA)
+        self.frame_grafica = self.frames
+        if not nuevos:
+            return
+        grafica = self.grafica
+        grafica.scroll(-nuevos, 0)
+        grafica.fill(COLOR_PANEL, (FRAMES_GRAFICA - nuevos, 0, nuevos, ALTO_GRAFICA))
+        escala = ALTO_GRAFICA / (2 * PRESUPUESTO_MS)
+        y_presupuesto = ALTO_GRAFICA - int(PRESUPUESTO_MS * escala)
+        for x, ms in enumerate(self._ultimos(self.totales, nuevos), FRAMES_GRAFICA - nuevos):
+            color = COLORES_BARRA[(ms > PRESUPUESTO_MS) + (ms > 2 * PRESUPUESTO_MS)]
+            pygame.draw.line(grafica, color, (x, ALTO_GRAFICA - 1), (x, ALTO_GRAFICA - min(ALTO_GRAFICA, int(ms * escala))))
+            grafica.set_at((x, y_presupuesto), (255, 255, 255))
+
+    def dibujar(self, pantalla):
+        # Panel opaco arriba a la derecha: gráfica de tiempos de frame y percentiles por fase.
+        # Devuelve el rect dibujado
+        if self.fuente is None:
+            self.fuente = pygame.font.Font(None, 20)
+        if self.frames - self.frame_texto >= REFRESCO_TEXTO:
+            self._actualizar_texto()
+        self._actualizar_grafica()
+        x = pantalla.get_width() - FRAMES_GRAFICA - 10
+        rect = pantalla.blit(self.grafica, (x, 10))
+        return rect.union(pantalla.blit(self.texto, (x, 10 + ALTO_GRAFICA)))
@@ -0,0 +1,69 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ----------------------------- Gestor de recursos -----------------------------
+# Imágenes y sonidos se registran con una función que los carga, pero no se cargan
+# hasta que se piden (obtener) o se precargan en un hilo de fondo (precargar), por
+# ejemplo mientras se muestra el menú o al acercarse al siguiente nivel.
+# Se mide cuánto tarda cada recurso y se informa al terminar de cargarlo.
+
+class GestorRecursos:
+    def __init__(self, informar=None):
+        self.cargadores = {}
+        self.recursos = {}
+        self.pendientes = {}
+        self.tiempos = {}
+        self.informar = informar
+        self.cerrojo = threading.Lock()
+        self.ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recursos")
+
+    def registrar(self, nombre, cargador):
+        self.cargadores[nombre] = cargador
+
+    def _cargar(self, nombre, origen):
+        inicio = time.perf_counter()
+        recurso = self.cargadores[nombre]()
+        self.tiempos[nombre] = time.perf_counter() - inicio
+        if self.informar:
+            self.informar(f"Recurso '{nombre}' cargado en {self.tiempos[nombre] * 1000:.1f} ms ({origen})")
+        return recurso
+
+    def precargar(self, *nombres):
+        with self.cerrojo:
+            for nombre in nombres:
+                if nombre not in self.recursos and nombre not in self.pendientes:
+                    self.pendientes[nombre] = self.ejecutor.submit(self._cargar, nombre, "segundo plano")
+
+    def en_segundo_plano(self, funcion, *argumentos):
+        # Otro trabajo en el mismo hilo, detrás de las cargas ya pedidas; devuelve su Future
+        return self.ejecutor.submit(funcion, *argumentos)
+
+    def cargado(self, nombre):
+        return nombre in self.recursos
+
+    def listo(self, nombre):
+        # Cargado o con la carga de fondo ya terminada: obtener() no tendrá que esperar
+        if nombre in self.recursos:
+            return True
+        pendiente = self.pendientes.get(nombre)
+        return pendiente is not None and pendiente.done()
+
+    def descartar(self, nombre):
+        # Libera un recurso cargado; si se vuelve a pedir se carga de nuevo
+        self.recursos.pop(nombre, None)
+
+    def obtener(self, nombre):
+        recurso = self.recursos.get(nombre)
+        if recurso is not None:
+            return recurso
+
+        with self.cerrojo:
+            pendiente = self.pendientes.pop(nombre, None)
+        # Si ya se está cargando en segundo plano se espera a ese hilo en vez de repetir la carga
+        recurso = pendiente.result() if pendiente else self._cargar(nombre, "bajo demanda")
+        self.recursos[nombre] = recurso
+        return recurso
+
+    def cerrar(self):
+        self.ejecutor.shutdown(wait=False, cancel_futures=True)
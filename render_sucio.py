@@ -0,0 +1,44 @@
+import pygame
+
+# ----------------------------- Renderizado por rectángulos sucios -----------------------------
+# En vez de redibujar y voltear toda la pantalla cada frame, se restaura el fondo solo bajo
+# lo que se dibujó el frame anterior, se dibujan los objetos y se envía a la pantalla
+# la unión de las zonas viejas y nuevas con pygame.display.update(rects).
+# Requiere que el fondo sea estático mientras dure el modo sucio.
+
+class RenderSucio:
+    def __init__(self, pantalla):
+        self.pantalla = pantalla
+        self.area_pantalla = pantalla.get_rect()
+        self.fondo = None
+        self.rects_anteriores = []
+        self.rects_actuales = []
+        self.completo = True
+
+    def invalidar(self):
+        # El próximo frame se redibuja y se envía entero (cambio de fondo, menú, overlays...)
+        self.completo = True
+
+    def comenzar(self, fondo):
+        if fondo is not self.fondo:
+            self.fondo = fondo
+            self.completo = True
+        if self.completo:
+            self.pantalla.blit(fondo, (0, 0))
+        else:
+            for rect in self.rects_anteriores:
+                self.pantalla.blit(fondo, rect, rect)
+        self.rects_actuales = []
+
+    def agregar(self, rect):
+        rect = rect.clip(self.area_pantalla)
+        if rect.width and rect.height:
+            self.rects_actuales.append(rect)
+
+    def presentar(self):
+        if self.completo:
+            pygame.display.flip()
+            self.completo = False
+        else:
+            pygame.display.update(self.rects_anteriores + self.rects_actuales)
+        self.rects_anteriores = self.rects_actuales
@@ -0,0 +1,352 @@
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from operator import attrgetter
+
+# Sin ventana ni audio reales: el dibujo se mide sobre la superficie del driver dummy
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from autojugador import resolver_nivel
+from colisiones import BarridoX
+from entidades import AlmacenEntidades
+from evaluador import crear_motor
+
+# ----------------------------- Banco de pruebas de rendimiento -----------------------------
+# Mide main.py y 12.py siempre igual para poder comparar un cambio con el anterior:
+#
+# - ticks:      actualizar_juego sin ventana (ticks/s) con el nivel 1 a varias densidades de
+#               obstáculos, jugando la solución del autojugador para no morir a mitad.
+# - colisiones: fase amplia y estrecha (BarridoX.candidatos y colliderect) contra N
+#               obstáculos o plataformas activos, en µs por comprobación.
+# - render:     dibujar_juego (estados del nivel 2 con la solución) y Menu.dibujar sobre la
+#               pantalla del driver dummy de SDL, en frames/s sin display.flip.
+# - arranque:   proceso nuevo hasta el primer frame del menú (ms) y memoria máxima (RSS) de
+#               un proceso que juega unos frames de cada nivel.
+#
+# Cada medida hace una prueba de calentamiento y `repeticiones` pruebas con el recolector de
+# basura parado; se guardan todos los valores y se resumen con la mediana y la desviación
+# absoluta mediana relativa (dispersión). `medir --guardar` deja una base en JSON y
+# `comparar` vuelve a medir (o lee otro JSON) y marca como regresión lo que empeora más que
+# el umbral y que el ruido de las dos mediciones.
+
+VERSION_BASE = 1
+RUTA_BASE = "rendimiento_base.json"
+REPETICIONES = 5
+CALENTAMIENTO = 1
+UMBRAL_REGRESION = 0.10  # empeorar menos de un 10 % no cuenta como regresión
+FACTOR_RUIDO = 2         # ...ni menos que dos veces la suma de las dispersiones
+
+ANCHO_PANTALLA = 800
+ESPACIADOS = (600, 400, 280)  # px entre obstáculos del nivel 1; a menos de 280 no se puede pasar
+TICKS_POR_PRUEBA = 30000
+TAMAÑOS_ACTIVOS = (1, 8, 32, 128)
+CONSULTAS_POR_PRUEBA = 50000
+FRAMES_RENDER = 300
+FRAMES_MEMORIA = 300  # por nivel
+
+# Proceso hijo del arranque: crea Juego, dibuja el menú y avisa; con frames > 0 juega además
+# cada nivel (reiniciándolo al perder) e informa de su memoria máxima
+CODIGO_ARRANQUE = """
+import importlib, sys, pygame
+juego = importlib.import_module(sys.argv[1]).Juego(directorio_grabaciones=None)
+juego.menu.dibujar(juego.fondo, (0, 0))
+pygame.display.flip()
+print("menu", flush=True)
+frames = int(sys.argv[2])
+if frames:
+    for nivel in range(1, len(juego.campaña) + 1):
+        juego.nueva_partida(nivel)
+        for _ in range(frames):
+            if not juego.en_curso():
+                juego.nueva_partida(nivel)
+            juego.actualizar_juego()
+            juego.dibujar_juego()
+            pygame.display.flip()
+    import resource
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print("memoria", kb / 1024 if sys.platform != "darwin" else kb / 1024 ** 2, flush=True)
+juego.recursos.cerrar()
+pygame.quit()
+"""
+
+
+def _cronometrar(funcion, veces=1):
+    # Segundos en ejecutar `veces` la función, sin pausas del recolector de basura
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        inicio = time.perf_counter()
+        for _ in range(veces):
+            funcion()
+        return time.perf_counter() - inicio
+    finally:
+        if activo:
+            gc.enable()
+
+
+# ----------------------------- Pruebas -----------------------------
+# Cada grupo es un generador de (nombre, unidad, mayor_es_mejor, prueba); prueba() hace una
+# repetición y devuelve su valor. Lo que hay que preparar se prepara antes del yield
+
+def pruebas_ticks(juego):
+    for espaciado in ESPACIADOS:
+        motor = crear_motor(juego, semilla=0)
+        motor.mapa_nivel_1_distancias = [espaciado] * motor.campaña.puntos[1]
+        motor.nueva_partida()
+        inicio = motor.instantanea()
+        solucion = resolver_nivel(motor, rapido=True)
+        if not solucion.posible:
+            print(f"{juego}: el nivel con obstáculos cada {espaciado} px no tiene solución, se omite")
+            continue
+        saltos, frames = solucion.saltos, solucion.frames
+        partidas = -(-TICKS_POR_PRUEBA // frames)
+
+        def jugar(motor=motor, inicio=inicio, saltos=saltos, frames=frames):
+            motor.restaurar(inicio)
+            motor.simular(saltos, frames)
+
+        def prueba(jugar=jugar, partidas=partidas, frames=frames):
+            return partidas * frames / _cronometrar(jugar, partidas)
+
+        yield f"{juego}.ticks.espaciado_{espaciado}", "ticks/s", True, prueba
+
+
+def _barrido_lleno(clase, argumentos, atributo_rect, cantidad):
+    # `cantidad` entidades repartidas a lo ancho de la pantalla, como las tendría el motor
+    barrido = BarridoX(attrgetter(atributo_rect))
+    almacen = AlmacenEntidades(cantidad)
+    for i in range(cantidad):
+        barrido.insertar(clase(i * ANCHO_PANTALLA // cantidad, *argumentos, almacen=almacen))
+    return barrido
+
+
+def pruebas_colisiones(juego):
+    modulo = importlib.import_module(juego)
+    motor = crear_motor(juego, semilla=0)
+    motor.nueva_partida()
+    rect = motor.jugador.rectangulo
+    tipos = [("obstaculos", modulo.Obstaculo, (450, 35, (255, 0, 0), 10, ANCHO_PANTALLA), "rectangulo_colision")]
+    if hasattr(modulo, "PlataformaMovil"):
+        tipos.append(("plataformas", modulo.PlataformaMovil, (350, 100, 20, (0, 168, 232), 10), "rect"))
+    for tipo, clase, argumentos, atributo_rect in tipos:
+        for cantidad in TAMAÑOS_ACTIVOS:
+            barrido = _barrido_lleno(clase, argumentos, atributo_rect, cantidad)
+
+            def comprobar(barrido=barrido, rect_de=attrgetter(atributo_rect)):
+                for objeto in barrido.candidatos(rect.left, rect.right):
+                    rect.colliderect(rect_de(objeto))
+
+            def prueba(comprobar=comprobar):
+                return _cronometrar(comprobar, CONSULTAS_POR_PRUEBA) / CONSULTAS_POR_PRUEBA * 1e6
+
+            yield f"{juego}.colisiones.{tipo}_{cantidad}", "µs", False, prueba
+
+
+def _estados_nivel(juego, nivel):
+    # Instantáneas de cada frame de la solución del nivel: escenas reales con todo lo que dibuja
+    motor = crear_motor(juego, semilla=0)
+    motor.nueva_partida(nivel)
+    inicio = motor.instantanea()
+    solucion = resolver_nivel(motor, rapido=True)
+    motor.restaurar(inicio)
+    saltos = set(solucion.saltos)
+    estados = []
+    for frame in range(max(1, solucion.frames - 1)):
+        if frame in saltos:
+            motor.jugador.saltar()
+        motor.actualizar_juego()
+        estados.append(motor.instantanea())
+    return estados
+
+
+def pruebas_render(juego):
+    estados = _estados_nivel(juego, 2)
+    # Los recursos se cargan ya: un hilo de carga en segundo plano falsearía la medida
+    instancia = importlib.import_module(juego).Juego(directorio_grabaciones=None)
+    for nombre in list(instancia.recursos.cargadores):
+        instancia.recursos.obtener(nombre)
+    try:
+        def prueba_juego():
+            segundos = 0.0
+            for frame in range(FRAMES_RENDER):
+                instancia.restaurar(estados[frame % len(estados)])
+                segundos += _cronometrar(instancia.dibujar_juego)
+            return FRAMES_RENDER / segundos
+
+        def dibujar_menu():
+            instancia.menu.dibujar(instancia.fondo, (0, 0))
+
+        def prueba_menu():
+            return FRAMES_RENDER / _cronometrar(dibujar_menu, FRAMES_RENDER)
+
+        yield f"{juego}.render.juego", "fps", True, prueba_juego
+        yield f"{juego}.render.menu", "fps", True, prueba_menu
+    finally:
+        instancia.recursos.cerrar()
+        pygame.quit()
+
+
+def _proceso_juego(juego, frames):
+    # Lanza el hijo y devuelve (ms hasta el primer menú, memoria máxima en MB o None)
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen([sys.executable, "-c", CODIGO_ARRANQUE, juego, str(frames)],
+                               cwd=directorio, stdout=subprocess.PIPE, text=True)
+    ms = memoria = None
+    for linea in proceso.stdout:
+        if linea.startswith("menu") and ms is None:
+            ms = (time.perf_counter() - inicio) * 1000
+        elif linea.startswith("memoria"):
+            memoria = float(linea.split()[1])
+    if proceso.wait() != 0 or ms is None:
+        raise RuntimeError(f"El arranque de {juego} falló (código {proceso.returncode})")
+    return ms, memoria
+
+
+def pruebas_arranque(juego):
+    yield f"{juego}.arranque", "ms", False, lambda: _proceso_juego(juego, 0)[0]
+    try:
+        import resource  # noqa: F401  (el hijo lo necesita; no existe en Windows)
+    except ImportError:
+        return
+    yield f"{juego}.memoria_pico", "MB", False, lambda: _proceso_juego(juego, FRAMES_MEMORIA)[1]
+
+
+GRUPOS = {
+    "ticks": pruebas_ticks,
+    "colisiones": pruebas_colisiones,
+    "render": pruebas_render,
+    "arranque": pruebas_arranque,
+}
+
+
+# ----------------------------- Medición y bases -----------------------------
+
+def resumir(valores):
+    # (mediana, dispersión): la dispersión es la desviación absoluta mediana sobre la mediana
+    mediana = statistics.median(valores)
+    desviacion = statistics.median(abs(valor - mediana) for valor in valores)
+    return mediana, desviacion / mediana if mediana else 0.0
+
+
+def _linea(nombre, metrica):
+    mediana, dispersion = resumir(metrica["valores"])
+    return (f"{nombre:<34} {mediana:>12,.2f} {metrica['unidad']:<7} ±{dispersion * 100:4.1f} %  "
+            f"[{min(metrica['valores']):,.2f} – {max(metrica['valores']):,.2f}]")
+
+
+def medir(juegos=("main", "12"), grupos=tuple(GRUPOS), repeticiones=REPETICIONES, informar=print):
+    metricas = {}
+    for juego in juegos:
+        for grupo in grupos:
+            for nombre, unidad, mayor_es_mejor, prueba in GRUPOS[grupo](juego):
+                for _ in range(CALENTAMIENTO):
+                    prueba()
+                metricas[nombre] = {"unidad": unidad, "mayor_es_mejor": mayor_es_mejor,
+                                    "valores": [prueba() for _ in range(repeticiones)]}
+                if informar:
+                    informar(_linea(nombre, metricas[nombre]))
+    return {
+        "version": VERSION_BASE,
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "maquina": platform.platform(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "repeticiones": repeticiones,
+        "metricas": metricas,
+    }
+
+
+def guardar(medicion, ruta=RUTA_BASE):
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(medicion, archivo, indent=1, ensure_ascii=False)
+
+
+def cargar(ruta=RUTA_BASE):
+    with open(ruta, encoding="utf-8") as archivo:
+        medicion = json.load(archivo)
+    if medicion.get("version") != VERSION_BASE:
+        raise ValueError(f"{ruta}: base de rendimiento de otra versión")
+    return medicion
+
+
+def comparar(base, actual, umbral=UMBRAL_REGRESION):
+    # Una fila por métrica: (nombre, mediana base, mediana actual, cambio relativo, veredicto).
+    # El cambio es positivo cuando empeora, sea la métrica de subir (ticks/s) o de bajar (ms)
+    filas = []
+    metricas_base, metricas_actual = base["metricas"], actual["metricas"]
+    for nombre in sorted(metricas_base.keys() | metricas_actual.keys()):
+        if nombre not in metricas_actual:
+            filas.append((nombre, resumir(metricas_base[nombre]["valores"])[0], None, None, "sin medir"))
+            continue
+        if nombre not in metricas_base:
+            filas.append((nombre, None, resumir(metricas_actual[nombre]["valores"])[0], None, "nueva"))
+            continue
+        mediana_base, ruido_base = resumir(metricas_base[nombre]["valores"])
+        mediana_actual, ruido_actual = resumir(metricas_actual[nombre]["valores"])
+        cambio = (mediana_actual - mediana_base) / mediana_base
+        if metricas_base[nombre]["mayor_es_mejor"]:
+            cambio = -cambio
+        tolerancia = max(umbral, FACTOR_RUIDO * (ruido_base + ruido_actual))
+        if cambio > tolerancia:
+            veredicto = "REGRESIÓN"
+        elif cambio < -tolerancia:
+            veredicto = "mejora"
+        else:
+            veredicto = "igual"
+        filas.append((nombre, mediana_base, mediana_actual, cambio, veredicto))
+    return filas
+
+
+def imprimir_comparacion(base, actual, filas):
+    if base["maquina"] != actual["maquina"] or base["python"] != actual["python"]:
+        print(f"Aviso: la base es de {base['maquina']} (Python {base['python']}) y esta medición de "
+              f"{actual['maquina']} (Python {actual['python']})")
+    for nombre, mediana_base, mediana_actual, cambio, veredicto in filas:
+        base_texto = "-" if mediana_base is None else f"{mediana_base:,.2f}"
+        actual_texto = "-" if mediana_actual is None else f"{mediana_actual:,.2f}"
+        cambio_texto = "" if cambio is None else f"{cambio * 100:+6.1f} %"
+        print(f"{nombre:<34} {base_texto:>12} -> {actual_texto:>12} {cambio_texto:>9}  {veredicto}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banco de pruebas de rendimiento de main.py y 12.py")
+    subparsers = parser.add_subparsers(dest="orden", required=True)
+    for orden, ayuda in (("medir", "mide y opcionalmente guarda la base"),
+                         ("comparar", "compara con la base y marca las regresiones")):
+        sub = subparsers.add_parser(orden, help=ayuda)
+        sub.add_argument("--juegos", nargs="+", choices=["main", "12"], default=["main", "12"])
+        sub.add_argument("--grupos", nargs="+", choices=list(GRUPOS), default=list(GRUPOS))
+        sub.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    subparsers.choices["medir"].add_argument("--guardar", nargs="?", const=RUTA_BASE, metavar="RUTA",
+                                             help=f"guarda la medición como base (por defecto {RUTA_BASE})")
+    subparsers.choices["comparar"].add_argument("--base", default=RUTA_BASE)
+    subparsers.choices["comparar"].add_argument("--actual", metavar="RUTA",
+                                                help="compara con otra medición guardada en vez de medir ahora")
+    subparsers.choices["comparar"].add_argument("--umbral", type=float, default=UMBRAL_REGRESION)
+    args = parser.parse_args()
+
+    if args.orden == "medir":
+        medicion = medir(args.juegos, args.grupos, args.repeticiones)
+        if args.guardar:
+            guardar(medicion, args.guardar)
+            print(f"Base guardada en {args.guardar}")
+    else:
+        base = cargar(args.base)
+        actual = cargar(args.actual) if args.actual else medir(args.juegos, args.grupos, args.repeticiones, None)
+        filas = comparar(base, actual, args.umbral)
+        imprimir_comparacion(base, actual, filas)
+        regresiones = sum(fila[4] == "REGRESIÓN" for fila in filas)
+        print(f"{regresiones} regresiones" if regresiones else "Sin regresiones")
+        sys.exit(1 if regresiones else 0)
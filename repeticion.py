@@ -0,0 +1,240 @@
+import argparse
+import os
+import time
+from array import array
+from bisect import bisect_right
+
+from evaluador import crear_motor
+
+# ----------------------------- Grabación y repetición de partidas -----------------------------
+# Cada partida se guarda como juego, semilla, nivel inicial, el mapa del nivel 1 si se fijó
+# (mapa_nivel_1_distancias, por ejemplo el de un mapa de ritmo) y los frames en que se llamó a
+# saltar(), codificados como diferencias entre saltos en varints (un salto típico ocupa un
+# byte). La repetición vuelve a pasar esos saltos por MotorJuego.actualizar_juego sin
+# ventana ni reloj, y guarda instantáneas periódicas del motor (MotorJuego.instantanea, unos
+# cientos de bytes) para poder saltar a cualquier frame sin volver a simular desde el principio.
+
+MAGIA = b"GDRP"
+VERSION = 2  # la 1 no guardaba el mapa; se sigue leyendo
+DIRECTORIO_GRABACIONES = "repeticiones"
+INTERVALO_INSTANTANEAS = 600  # frames entre instantáneas (10 s de juego a 60 ticks)
+
+
+def _escribir_varint(salida, numero):
+    while numero >= 0x80:
+        salida.append(numero & 0x7F | 0x80)
+        numero >>= 7
+    salida.append(numero)
+
+
+def _leer_varint(datos, pos):
+    numero = desplazamiento = 0
+    while True:
+        byte = datos[pos]
+        pos += 1
+        numero |= (byte & 0x7F) << desplazamiento
+        if byte < 0x80:
+            return numero, pos
+        desplazamiento += 7
+
+
+class Grabacion:
+    def __init__(self, juego, semilla=0, nivel=1, saltos=None, frames=0, puntuacion=0, nivel_final=1, mapa=None):
+        self.juego = juego          # módulo del juego: "main" o "12"
+        self.semilla = semilla
+        self.nivel = nivel
+        self.mapa = mapa            # distancias del nivel 1, o None si es el del archivo
+        self.saltos = saltos if saltos is not None else array("I")  # frame de cada saltar(), en orden
+        self.frames = frames
+        # Resultado al grabar, para comprobar que la repetición llega al mismo sitio
+        self.puntuacion = puntuacion
+        self.nivel_final = nivel_final
+
+    def a_bytes(self):
+        salida = bytearray(MAGIA)
+        salida.append(VERSION)
+        nombre = self.juego.encode("ascii")
+        _escribir_varint(salida, len(nombre))
+        salida += nombre
+        for numero in (self.semilla, self.nivel, self.frames, self.puntuacion, self.nivel_final, len(self.saltos)):
+            _escribir_varint(salida, numero)
+        # Mapa: cantidad de distancias y luego cada una; 0 si no hay
+        mapa = self.mapa or ()
+        _escribir_varint(salida, len(mapa))
+        for distancia in mapa:
+            _escribir_varint(salida, distancia)
+        anterior = 0
+        for frame in self.saltos:
+            _escribir_varint(salida, frame - anterior)
+            anterior = frame
+        return bytes(salida)
+
+    @classmethod
+    def desde_bytes(cls, datos):
+        if datos[:4] != MAGIA or datos[4] not in (1, VERSION):
+            raise ValueError("No es una grabación compatible")
+        largo, pos = _leer_varint(datos, 5)
+        juego = datos[pos:pos + largo].decode("ascii")
+        pos += largo
+        campos = []
+        for _ in range(6):
+            numero, pos = _leer_varint(datos, pos)
+            campos.append(numero)
+        semilla, nivel, frames, puntuacion, nivel_final, n_saltos = campos
+        mapa = None
+        if datos[4] >= 2:
+            n_mapa, pos = _leer_varint(datos, pos)
+            if n_mapa:
+                mapa = []
+                for _ in range(n_mapa):
+                    distancia, pos = _leer_varint(datos, pos)
+                    mapa.append(distancia)
+        saltos = array("I")
+        frame = 0
+        for _ in range(n_saltos):
+            delta, pos = _leer_varint(datos, pos)
+            frame += delta
+            saltos.append(frame)
+        return cls(juego, semilla, nivel, saltos, frames, puntuacion, nivel_final, mapa)
+
+    def guardar(self, ruta):
+        with open(ruta, "wb") as archivo:
+            archivo.write(self.a_bytes())
+
+    @classmethod
+    def cargar(cls, ruta):
+        with open(ruta, "rb") as archivo:
+            return cls.desde_bytes(archivo.read())
+
+
+class Grabador:
+    # Lo usa Juego: comenzar() al empezar una partida, salto() en cada saltar() del
+    # jugador y tick() tras cada actualizar_juego; al acabar la partida la guarda
+    def __init__(self, directorio=DIRECTORIO_GRABACIONES):
+        self.directorio = directorio
+        self.motor = None
+        self.grabacion = None
+        self.ultima = None
+
+    @property
+    def activo(self):
+        return self.grabacion is not None
+
+    def comenzar(self, motor, juego, semilla, nivel):
+        self.terminar()
+        self.motor = motor
+        self.grabacion = Grabacion(juego, semilla, nivel, mapa=motor.mapa_nivel_1_distancias)
+
+    def salto(self):
+        if self.grabacion is not None:
+            self.grabacion.saltos.append(self.grabacion.frames)
+
+    def tick(self):
+        if self.grabacion is None:
+            return
+        self.grabacion.frames += 1
+        if not self.motor.en_curso():
+            self.terminar()
+
+    def terminar(self):
+        grabacion = self.grabacion
+        if grabacion is None:
+            return None
+        grabacion.puntuacion = self.motor.puntuacion
+        grabacion.nivel_final = self.motor.nivel_actual
+        self.grabacion = self.motor = None
+        self.ultima = grabacion
+        if self.directorio:
+            os.makedirs(self.directorio, exist_ok=True)
+            nombre = f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 10 ** 9:09d}-{grabacion.juego}.rep"
+            grabacion.guardar(os.path.join(self.directorio, nombre))
+        return grabacion
+
+
+class Reproductor:
+    def __init__(self, grabacion, intervalo_instantaneas=INTERVALO_INSTANTANEAS):
+        # intervalo_instantaneas=0 desactiva las instantáneas (repetición de principio a fin)
+        self.grabacion = grabacion
+        self.intervalo = intervalo_instantaneas
+        self.motor = crear_motor(grabacion.juego, grabacion.mapa, grabacion.semilla)
+        self.motor.nueva_partida(grabacion.nivel)
+        self.frame = 0
+        self.cursor = 0
+        self.instantaneas = {}  # frame -> (instantánea del motor, cursor)
+        self.frames_instantaneas = []
+        self._guardar_instantanea()
+
+    def _guardar_instantanea(self):
+        if self.frame not in self.instantaneas:
+            self.instantaneas[self.frame] = (self.motor.instantanea(), self.cursor)
+            self.frames_instantaneas.insert(bisect_right(self.frames_instantaneas, self.frame), self.frame)
+
+    def avanzar_hasta(self, frame):
+        # Simula a máxima velocidad aplicando los saltos grabados; para si la partida termina
+        motor, saltos = self.motor, self.grabacion.saltos
+        total = len(saltos)
+        frame = min(frame, self.grabacion.frames)
+        while self.frame < frame and motor.en_curso():
+            while self.cursor < total and saltos[self.cursor] == self.frame:
+                motor.jugador.saltar()
+                self.cursor += 1
+            motor.actualizar_juego()
+            self.frame += 1
+            if self.intervalo and self.frame % self.intervalo == 0:
+                self._guardar_instantanea()
+        return motor
+
+    def buscar(self, frame):
+        # Restaura la instantánea más cercana por debajo de `frame` y simula solo el resto
+        i = bisect_right(self.frames_instantaneas, frame) - 1
+        origen = self.frames_instantaneas[i]
+        if not origen <= self.frame <= frame:
+            instantanea, self.cursor = self.instantaneas[origen]
+            self.motor.restaurar(instantanea)
+            self.frame = origen
+        return self.avanzar_hasta(frame)
+
+    def reproducir(self):
+        return self.avanzar_hasta(self.grabacion.frames)
+
+    def coincide(self):
+        motor = self.reproducir()
+        return (motor.puntuacion, motor.nivel_actual) == (self.grabacion.puntuacion, self.grabacion.nivel_final)
+
+
+def reproducir_corpus(rutas):
+    # Repite todas las grabaciones y mide el rendimiento del motor sobre partidas reales
+    frames = distintas = 0
+    inicio = time.perf_counter()
+    for ruta in rutas:
+        reproductor = Reproductor(Grabacion.cargar(ruta), intervalo_instantaneas=0)
+        if not reproductor.coincide():
+            distintas += 1
+            print(f"{ruta}: la repetición no coincide con la partida grabada")
+        frames += reproductor.frame
+    segundos = time.perf_counter() - inicio
+    return len(rutas), frames, segundos, distintas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Repite partidas grabadas sin ventana")
+    parser.add_argument("rutas", nargs="+", help="archivos .rep o directorios con grabaciones")
+    parser.add_argument("--frame", type=int, help="muestra el estado de la partida en este frame")
+    args = parser.parse_args()
+
+    rutas = []
+    for ruta in args.rutas:
+        if os.path.isdir(ruta):
+            rutas.extend(os.path.join(ruta, nombre) for nombre in sorted(os.listdir(ruta)) if nombre.endswith(".rep"))
+        else:
+            rutas.append(ruta)
+
+    if args.frame is not None:
+        for ruta in rutas:
+            motor = Reproductor(Grabacion.cargar(ruta)).buscar(args.frame)
+            print(f"{ruta} @ {args.frame}: nivel {motor.nivel_actual}, puntuación {motor.puntuacion}, "
+                  f"jugador y={motor.jugador.y}, en curso={motor.en_curso()}")
+    else:
+        partidas, frames, segundos, distintas = reproducir_corpus(rutas)
+        print(f"{partidas} partidas, {frames} frames en {segundos:.2f} s "
+              f"({frames / max(segundos, 1e-9):.0f} frames/s), {distintas} no coinciden")
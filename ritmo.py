@@ -0,0 +1,129 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pygame
+from numpy.lib.stride_tricks import sliding_window_view
+
+from mapa_ritmo import MapaRitmo, cargar_mapa, guardar_mapa, ruta_mapa
+
+# ----------------------------- Análisis de ritmo (paso de preparación) -----------------------------
+# Decodifica una pista con pygame.mixer (mono a 22050 Hz), detecta onsets y beats con NumPy
+# y guarda su mapa de ritmo (ver mapa_ritmo.py). Se ejecuta antes de jugar:
+#
+#   python ritmo.py [pistas...]
+#
+# - Envolvente de onsets: flujo espectral, la suma de lo que crece cada banda del espectro
+#   (log-magnitud de la FFT de ventanas de Hann) de un salto al siguiente, menos su media
+#   local. Los onsets son sus máximos locales por encima de media + desviación.
+# - Tempo: el retardo entre 60 y 200 BPM con más autocorrelación de la envolvente, pesada
+#   hacia 120 BPM para no elegir la mitad o el doble.
+# - Beats: la fase de ese periodo cuyo peine acumula más envolvente, y cada beat del peine
+#   se ajusta al máximo de la envolvente a menos de un 10 % del periodo.
+
+FRECUENCIA = 22050
+VENTANA = 1024
+SALTO = 512            # ~23 ms entre valores de la envolvente
+MEDIA_LOCAL = 16       # saltos de la media que se resta al flujo (~0.37 s)
+VECINDAD_ONSET = 3     # un onset es el máximo a ±3 saltos
+BPM_MINIMO, BPM_MAXIMO = 60, 200
+BPM_PREFERIDO = 120
+ANCHO_PREFERENCIA = 1.0  # octavas: desviación del peso log-normal del tempo
+AJUSTE_BEAT = 0.1
+PISTAS = ("Castle-town.mp3", "bossfight-Vextron.mp3")
+
+
+def decodificar(ruta):
+    # Muestras mono en [-1, 1] a FRECUENCIA; el mezclador se abre con ese formato para que
+    # pygame haga la conversión al decodificar
+    if pygame.mixer.get_init() != (FRECUENCIA, -16, 1):
+        pygame.mixer.quit()
+        pygame.mixer.init(frequency=FRECUENCIA, size=-16, channels=1)
+    muestras = pygame.sndarray.array(pygame.mixer.Sound(ruta)).astype(np.float32) / 32768
+    return muestras.mean(axis=1) if muestras.ndim == 2 else muestras
+
+
+def envolvente_onsets(muestras):
+    marcos = sliding_window_view(muestras, VENTANA)[::SALTO] * np.hanning(VENTANA).astype(np.float32)
+    espectro = np.log1p(100 * np.abs(np.fft.rfft(marcos, axis=1)))
+    flujo = np.concatenate(([0.0], np.maximum(np.diff(espectro, axis=0), 0).sum(axis=1)))
+    local = np.convolve(flujo, np.ones(MEDIA_LOCAL) / MEDIA_LOCAL, mode="same")
+    envolvente = np.maximum(flujo - local, 0)
+    maximo = envolvente.max()
+    return envolvente / maximo if maximo else envolvente
+
+
+def detectar_onsets(envolvente):
+    # Índices de los máximos locales destacados y su fuerza (0-1)
+    relleno = np.pad(envolvente, VECINDAD_ONSET, constant_values=-1)
+    maximos = sliding_window_view(relleno, 2 * VECINDAD_ONSET + 1).max(axis=1)
+    umbral = envolvente.mean() + envolvente.std()
+    indices = np.flatnonzero((envolvente == maximos) & (envolvente > umbral))
+    return indices, envolvente[indices]
+
+
+def estimar_periodo(envolvente):
+    # Periodo del beat en saltos (con decimales) por autocorrelación, calculada con la FFT
+    centrada = envolvente - envolvente.mean()
+    espectro = np.fft.rfft(centrada, 2 * len(centrada))
+    autocorrelacion = np.fft.irfft(np.abs(espectro) ** 2)[:len(centrada)]
+    saltos_por_minuto = 60 * FRECUENCIA / SALTO
+    retardos = np.arange(int(saltos_por_minuto / BPM_MAXIMO), int(saltos_por_minuto / BPM_MINIMO) + 1)
+    octavas = np.log2(saltos_por_minuto / retardos / BPM_PREFERIDO)
+    pesos = np.exp(-0.5 * (octavas / ANCHO_PREFERENCIA) ** 2)
+    mejor = retardos[np.argmax(autocorrelacion[retardos] * pesos)]
+    # Interpolación parabólica alrededor del máximo para afinar el periodo
+    a, b, c = autocorrelacion[mejor - 1:mejor + 2]
+    curvatura = a - 2 * b + c
+    return mejor + (0.5 * (a - c) / curvatura if curvatura < 0 else 0.0)
+
+
+def seguir_beats(envolvente, periodo):
+    # Fase del peine con más envolvente (todas las fases a la vez) y ajuste local de cada beat
+    fases = np.arange(int(np.ceil(periodo)))
+    pasos = np.arange(int((len(envolvente) - 1) / periodo) + 1)
+    peines = np.rint(fases[:, None] + pasos[None, :] * periodo).astype(int)
+    validos = peines < len(envolvente)
+    puntuaciones = np.where(validos, envolvente[np.minimum(peines, len(envolvente) - 1)], 0).sum(axis=1)
+    beats = peines[np.argmax(puntuaciones)]
+    beats = beats[beats < len(envolvente)]
+
+    radio = max(1, int(periodo * AJUSTE_BEAT))
+    relleno = np.pad(envolvente, radio, constant_values=-1)
+    entornos = sliding_window_view(relleno, 2 * radio + 1)[beats]
+    return beats + np.argmax(entornos, axis=1) - radio
+
+
+def analizar(ruta):
+    muestras = decodificar(ruta)
+    envolvente = envolvente_onsets(muestras)
+    onsets, fuerzas = detectar_onsets(envolvente)
+    periodo = estimar_periodo(envolvente)
+    beats = seguir_beats(envolvente, periodo)
+    ms_por_salto = 1000 * SALTO / FRECUENCIA
+    return MapaRitmo(
+        duracion=round(1000 * len(muestras) / FRECUENCIA),
+        tempo=60000 / (periodo * ms_por_salto),
+        beats=np.rint(np.unique(beats) * ms_por_salto).astype(int).tolist(),
+        onsets=np.rint(onsets * ms_por_salto).astype(int).tolist(),
+        fuerzas=np.rint(fuerzas * 255).astype(int).tolist(),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analiza pistas y guarda sus mapas de ritmo")
+    parser.add_argument("pistas", nargs="*", default=list(PISTAS))
+    parser.add_argument("--forzar", action="store_true", help="analiza aunque el mapa ya esté en caché")
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    for pista in args.pistas:
+        if not args.forzar and cargar_mapa(pista) is not None:
+            print(f"{pista}: ya analizada ({ruta_mapa(pista)})")
+            continue
+        inicio = time.perf_counter()
+        mapa = analizar(pista)
+        destino = guardar_mapa(mapa, pista)
+        print(f"{pista} -> {destino}: {mapa.tempo:.1f} BPM, {len(mapa.beats)} beats, "
+              f"{len(mapa.onsets)} onsets en {time.perf_counter() - inicio:.2f} s")
@@ -0,0 +1,259 @@
+import math
+
+import numpy as np
+
+from main import MotorJuego
+from niveles import Nivel
+
+# ----------------------------- Simulador por lotes -----------------------------
+# Avanza N partidas independientes de main.py a la vez. El estado vive en arreglos
+# NumPy (una columna por campo, una fila por partida) y cada frame es un único paso
+# vectorizado que reproduce Jugador.actualizar, Obstaculo.obtener_rectangulo_colision
+# y el aterrizaje sobre PlataformaMovil de MotorJuego.actualizar_juego. El orden de las
+# listas originales se conserva con un número de secuencia por hueco. Los mapas, los puntos
+# de cada nivel y el patrón de plataformas salen de la campaña de main.py (niveles.Campaña),
+# que tiene que ser de dos niveles, sin plataformas en el primero.
+
+ANCHO_PANTALLA = 800
+Y_SUELO = 450
+JUGADOR_X = 100
+JUGADOR_TAMAÑO = 50
+JUGADOR_Y_SUELO = Y_SUELO - JUGADOR_TAMAÑO
+VELOCIDAD_SALTO = -15
+TAMAÑO_OBSTACULO = 35
+
+SIN_ORDEN = np.iinfo(np.int64).max
+
+
+def _mapa_lote(mapa, n):
+    # (M,) o (N, M) -> (N, M + 1) con una columna final infinita que marca el fin del mapa
+    mapa = np.asarray(mapa, dtype=np.float64)
+    if mapa.ndim == 1:
+        mapa = np.broadcast_to(mapa, (n, mapa.shape[0]))
+    relleno = np.full((n, 1), np.inf)
+    return np.concatenate([mapa, relleno], axis=1)
+
+
+def _colisionan(ax, ay, aw, ah, bx, by, bw, bh):
+    # Misma regla que pygame.Rect.colliderect (bordes que solo se tocan no chocan)
+    return (ax < bx + bw) & (ax + aw > bx) & (ay < by + bh) & (ay + ah > by)
+
+
+class SimuladorLote:
+    def __init__(self, n, mapa_nivel_1=None, mapa_nivel_2=None):
+        motor = MotorJuego()
+        campaña = motor.campaña
+        if len(campaña) != 2:
+            raise ValueError(f"SimuladorLote sigue campañas de dos niveles, no de {len(campaña)}")
+        nivel_1, nivel_2 = Nivel.cargar(campaña[1]["nivel"]), Nivel.cargar(campaña[2]["nivel"])
+        if nivel_1.plataformas or not nivel_2.plataformas:
+            raise ValueError("SimuladorLote solo admite plataformas en el nivel 2")
+        self.n = n
+        self.velocidad_juego = motor.velocidad_juego
+        self.puntos_cambio_nivel, self.puntos_victoria = campaña.puntos[1], campaña.puntos[2]
+        patron = nivel_2.plataformas
+        self.plataforma_ancho, self.plataforma_alto = patron["ancho"], patron["alto"]
+        self.frames_entre_plataformas = patron["cada"]
+        self.alturas_plataformas = np.array(patron["alturas"], dtype=np.int32)
+        self.mapa_nivel_1 = _mapa_lote(nivel_1.distancias() if mapa_nivel_1 is None else mapa_nivel_1, n)
+        self.mapa_nivel_2 = _mapa_lote(nivel_2.distancias() if mapa_nivel_2 is None else mapa_nivel_2, n)
+
+        # Un obstáculo vive (ANCHO_PANTALLA + tamaño) / velocidad frames y como mucho se genera uno por frame
+        vida_obstaculo = math.ceil((ANCHO_PANTALLA + TAMAÑO_OBSTACULO) / self.velocidad_juego) + 1
+        distancia_minima = max(self.velocidad_juego, min(self.mapa_nivel_1[:, :-1].min(), self.mapa_nivel_2[:, :-1].min()))
+        self.capacidad_obstaculos = min(vida_obstaculo, math.ceil(vida_obstaculo * self.velocidad_juego / distancia_minima) + 1)
+        vida_plataforma = math.ceil((ANCHO_PANTALLA + self.plataforma_ancho) / self.velocidad_juego) + 1
+        self.capacidad_plataformas = math.ceil(vida_plataforma / self.frames_entre_plataformas) + 1
+
+        self.reiniciar()
+
+    def reiniciar(self):
+        n, k, p = self.n, self.capacidad_obstaculos, self.capacidad_plataformas
+        filas = np.arange(n)
+
+        # Jugador
+        self.y = np.full(n, JUGADOR_Y_SUELO, dtype=np.int32)
+        self.rect_y = self.y.copy()  # y del rectángulo del frame anterior, como Jugador.rectangulo
+        self.velocidad_y = np.zeros(n, dtype=np.int32)
+        self.esta_saltando = np.zeros(n, dtype=bool)
+
+        # Partida
+        self.nivel_actual = np.ones(n, dtype=np.int8)
+        self.puntuacion = np.zeros(n, dtype=np.int32)
+        self.juego_terminado = np.zeros(n, dtype=bool)
+        self.juego_ganado = np.zeros(n, dtype=bool)
+        self.frames = np.zeros(n, dtype=np.int64)
+        self.cursor_mapa = np.ones(n, dtype=np.int64)
+        self.distancia_para_siguiente_obstaculo = self.mapa_nivel_1[filas, 0].copy()
+        self.contador_plataforma = np.zeros(n, dtype=np.int32)
+
+        # Obstáculos: el orden de la lista original se conserva con un número de secuencia
+        self.obstaculo_x = np.zeros((n, k), dtype=np.int32)
+        self.obstaculo_y = np.full((n, k), Y_SUELO, dtype=np.int32)
+        self.obstaculo_tamaño = np.full((n, k), TAMAÑO_OBSTACULO, dtype=np.int32)
+        self.obstaculo_activo = np.zeros((n, k), dtype=bool)
+        self.obstaculo_superado = np.zeros((n, k), dtype=bool)
+        self.obstaculo_orden = np.full((n, k), SIN_ORDEN, dtype=np.int64)
+        self.obstaculos_generados = np.zeros(n, dtype=np.int64)
+
+        # Plataformas
+        self.plataforma_x = np.zeros((n, p), dtype=np.int32)
+        self.plataforma_y = np.zeros((n, p), dtype=np.int32)
+        self.plataforma_activa = np.zeros((n, p), dtype=bool)
+        self.plataforma_orden = np.full((n, p), SIN_ORDEN, dtype=np.int64)
+        self.plataformas_generadas = np.zeros(n, dtype=np.int64)
+
+    def reiniciar_filas(self, filas):
+        # Vuelve a empezar solo esas partidas (índices o máscara); lo demás sigue igual
+        self.y[filas] = JUGADOR_Y_SUELO
+        self.rect_y[filas] = JUGADOR_Y_SUELO
+        self.velocidad_y[filas] = 0
+        self.esta_saltando[filas] = False
+        self.nivel_actual[filas] = 1
+        self.puntuacion[filas] = 0
+        self.juego_terminado[filas] = False
+        self.juego_ganado[filas] = False
+        self.frames[filas] = 0
+        self.cursor_mapa[filas] = 1
+        self.distancia_para_siguiente_obstaculo[filas] = self.mapa_nivel_1[filas, 0]
+        self.contador_plataforma[filas] = 0
+        self.obstaculo_activo[filas] = False
+        self.obstaculo_superado[filas] = False
+        self.obstaculo_orden[filas] = SIN_ORDEN
+        self.obstaculos_generados[filas] = 0
+        self.plataforma_activa[filas] = False
+        self.plataforma_orden[filas] = SIN_ORDEN
+        self.plataformas_generadas[filas] = 0
+
+    def en_curso(self):
+        return ~(self.juego_terminado | self.juego_ganado)
+
+    def _siguiente_distancia(self, filas):
+        cursor = np.minimum(self.cursor_mapa[filas], self.mapa_nivel_1.shape[1] - 1)
+        cursor_2 = np.minimum(self.cursor_mapa[filas], self.mapa_nivel_2.shape[1] - 1)
+        distancia = np.where(self.nivel_actual[filas] == 1,
+                             self.mapa_nivel_1[filas, cursor],
+                             self.mapa_nivel_2[filas, cursor_2])
+        self.cursor_mapa[filas] += 1
+        return distancia
+
+    def saltar(self, mascara):
+        salta = mascara & self.en_curso() & ~self.esta_saltando
+        self.velocidad_y[salta] = VELOCIDAD_SALTO
+        self.esta_saltando[salta] = True
+
+    def paso(self, saltar=None):
+        if saltar is not None:
+            self.saltar(saltar)
+
+        vivos = self.en_curso()
+        vel = self.velocidad_juego
+        self.frames += vivos
+
+        # ------- Jugador (Jugador.actualizar) -------
+        self.velocidad_y += vivos
+        self.y += np.where(vivos, self.velocidad_y, 0).astype(np.int32)
+
+        # Aterrizaje: se usa el rectángulo del frame anterior y gana la primera plataforma de la lista
+        nivel_2 = vivos & (self.nivel_actual == 2)
+        aterrizaje = (self.plataforma_activa & nivel_2[:, None]
+                      & (self.velocidad_y >= 0)[:, None]
+                      & _colisionan(JUGADOR_X, self.rect_y[:, None], JUGADOR_TAMAÑO, JUGADOR_TAMAÑO,
+                                    self.plataforma_x, self.plataforma_y, self.plataforma_ancho, self.plataforma_alto)
+                      & (self.y[:, None] < self.plataforma_y))
+        aterriza = aterrizaje.any(axis=1)
+        primera = np.argmin(np.where(aterrizaje, self.plataforma_orden, SIN_ORDEN), axis=1)
+        y_plataforma = self.plataforma_y[np.arange(self.n), primera]
+        self.y = np.where(aterriza, y_plataforma - JUGADOR_TAMAÑO, self.y).astype(np.int32)
+
+        en_suelo = vivos & ~aterriza & (self.y >= JUGADOR_Y_SUELO)
+        self.y[en_suelo] = JUGADOR_Y_SUELO
+        detenido = aterriza | en_suelo
+        self.velocidad_y[detenido] = 0
+        self.esta_saltando[detenido] = False
+        self.rect_y = np.where(vivos, self.y, self.rect_y).astype(np.int32)
+
+        # ------- Generar obstáculos -------
+        self.distancia_para_siguiente_obstaculo -= np.where(vivos, vel, 0)
+        genera = np.flatnonzero(vivos & (self.distancia_para_siguiente_obstaculo <= 0))
+        if genera.size:
+            hueco = self.obstaculos_generados[genera] % self.capacidad_obstaculos
+            self.obstaculo_x[genera, hueco] = ANCHO_PANTALLA
+            self.obstaculo_activo[genera, hueco] = True
+            self.obstaculo_superado[genera, hueco] = False
+            self.obstaculo_orden[genera, hueco] = self.obstaculos_generados[genera]
+            self.obstaculos_generados[genera] += 1
+            self.distancia_para_siguiente_obstaculo[genera] = self._siguiente_distancia(genera)
+
+        # ------- Mover obstáculos y verificar colisiones -------
+        moviles = self.obstaculo_activo & vivos[:, None]
+        self.obstaculo_x -= np.where(moviles, vel, 0).astype(np.int32)
+        t = self.obstaculo_tamaño
+        choque = moviles & _colisionan(JUGADOR_X, self.rect_y[:, None], JUGADOR_TAMAÑO, JUGADOR_TAMAÑO,
+                                       self.obstaculo_x + t // 4, self.obstaculo_y - t, t // 2, t)
+        muere = choque.any(axis=1)
+
+        superados = moviles & ~self.obstaculo_superado & (JUGADOR_X > self.obstaculo_x + t)
+        self.obstaculo_superado |= superados
+        self.puntuacion += superados.sum(axis=1, dtype=np.int32)
+        self.juego_terminado |= muere
+        sigue = vivos & ~muere
+
+        # ------- Cambio de nivel -------
+        cambio = np.flatnonzero(sigue & (self.puntuacion >= self.puntos_cambio_nivel) & (self.nivel_actual == 1))
+        if cambio.size:
+            self.nivel_actual[cambio] = 2
+            self.y[cambio] = JUGADOR_Y_SUELO
+            self.rect_y[cambio] = JUGADOR_Y_SUELO
+            self.velocidad_y[cambio] = 0
+            self.esta_saltando[cambio] = False
+            self.puntuacion[cambio] = 0
+            self.obstaculo_activo[cambio] = False
+            self.obstaculo_orden[cambio] = SIN_ORDEN
+            self.plataforma_activa[cambio] = False
+            self.plataforma_orden[cambio] = SIN_ORDEN
+            self.contador_plataforma[cambio] = 0
+            self.cursor_mapa[cambio] = 0
+            self.distancia_para_siguiente_obstaculo[cambio] = self._siguiente_distancia(cambio)
+            sigue[cambio] = False
+
+        # ------- Victoria -------
+        gana = sigue & (self.puntuacion >= self.puntos_victoria) & (self.nivel_actual == 2)
+        self.juego_ganado |= gana
+        sigue &= ~gana
+
+        # ------- Limpiar obstáculos fuera de pantalla -------
+        fuera = sigue[:, None] & self.obstaculo_activo & (self.obstaculo_x + t <= 0)
+        self.obstaculo_activo &= ~fuera
+        self.obstaculo_orden[fuera] = SIN_ORDEN
+
+        # ------- Plataformas (nivel 2) -------
+        con_plataformas = sigue & (self.nivel_actual == 2)
+        moviles = self.plataforma_activa & con_plataformas[:, None]
+        self.plataforma_x -= np.where(moviles, vel, 0).astype(np.int32)
+        fuera = moviles & (self.plataforma_x + self.plataforma_ancho <= 0)
+        self.plataforma_activa &= ~fuera
+        self.plataforma_orden[fuera] = SIN_ORDEN
+
+        self.contador_plataforma += con_plataformas
+        genera = np.flatnonzero(con_plataformas & (self.contador_plataforma >= self.frames_entre_plataformas))
+        if genera.size:
+            self.contador_plataforma[genera] = 0
+            activas = self.plataforma_activa[genera].sum(axis=1)
+            hueco = self.plataformas_generadas[genera] % self.capacidad_plataformas
+            self.plataforma_x[genera, hueco] = ANCHO_PANTALLA
+            # La altura alterna según las que siguen en pantalla, como en niveles.compilar
+            self.plataforma_y[genera, hueco] = self.alturas_plataformas[activas % len(self.alturas_plataformas)]
+            self.plataforma_activa[genera, hueco] = True
+            self.plataforma_orden[genera, hueco] = self.plataformas_generadas[genera]
+            self.plataformas_generadas[genera] += 1
+
+    def ejecutar(self, saltos, max_frames=None):
+        # saltos: matriz booleana (N, F); la fila i indica en qué frames salta la partida i
+        saltos = np.asarray(saltos, dtype=bool)
+        max_frames = saltos.shape[1] if max_frames is None else max_frames
+        for frame in range(max_frames):
+            if not self.en_curso().any():
+                break
+            self.paso(saltos[:, frame] if frame < saltos.shape[1] else None)
+        return self
@@ -0,0 +1,37 @@
+import pygame
+
+from cache_lru import CacheLRU
+
+# ----------------------------- Caché de sprites -----------------------------
+# Superficies que antes se creaban o rasterizaban en cada frame (la capa oscura del
+# fin de juego, los triángulos de los obstáculos, las barras de las plataformas) se
+# construyen una sola vez por tamaño y color y después solo se hace blit.
+# Los obstáculos del nivel 2 tienen tamaños y colores al azar, por eso la caché
+# expulsa las entradas menos usadas al superar su capacidad.
+
+class CacheSprites(CacheLRU):
+    def __init__(self, capacidad=1024):
+        super().__init__(capacidad)
+
+    def superposicion(self, tamaño, color, alfa):
+        def construir():
+            superficie = pygame.Surface(tamaño)
+            superficie.set_alpha(alfa)
+            superficie.fill(color)
+            return superficie
+        return self.obtener(("superposicion", tamaño, color, alfa), construir)
+
+    def triangulo(self, ancho, alto, color):
+        # Triángulo con la base abajo; el polígono incluye el borde, de ahí el +1
+        def construir():
+            superficie = pygame.Surface((ancho + 1, alto + 1), pygame.SRCALPHA)
+            pygame.draw.polygon(superficie, color, [(0, alto), (ancho, alto), (ancho // 2, 0)])
+            return superficie
+        return self.obtener(("triangulo", ancho, alto, color), construir)
+
+    def barra(self, ancho, alto, color):
+        def construir():
+            superficie = pygame.Surface((ancho, alto))
+            superficie.fill(color)
+            return superficie
+        return self.obtener(("barra", ancho, alto, color), construir)
@@ -0,0 +1,54 @@
+import importlib
+import os
+import random
+import sys
+
+import pytest
+
+# Sin ventana ni sonido. Los módulos del juego están en la raíz del repositorio y cargan
+# imágenes y sonidos con rutas relativas a ella
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, RAIZ)
+os.chdir(RAIZ)
+
+
+@pytest.fixture(params=["main", "12"])
+def juego(request):
+    return request.param
+
+
+def modulo(juego):
+    # 12.py no se puede importar con import: su nombre empieza por un dígito
+    return importlib.import_module(juego)
+
+
+def jugar(motor, saltos, frames):
+    # Como Reproductor: saltar() cuando el contador de frames (desde 0) está en `saltos`
+    saltos = frozenset(saltos)
+    frame = 0
+    while frame < frames and motor.en_curso():
+        if frame in saltos:
+            motor.jugador.saltar()
+        motor.actualizar_juego()
+        frame += 1
+    return frame
+
+
+def estado(motor):
+    jugador = motor.jugador
+    return (motor.nivel_actual, motor.frame_nivel, motor.puntuacion, jugador.y, jugador.velocidad_y,
+            motor.en_curso(), [(o.x, o.y) for o in motor.obstaculos_activos])
+
+
+def calendario(juego, semilla):
+    # Saltos que pasan el nivel 1 y luego saltos al azar hasta perder
+    from autojugador import resolver_nivel
+    from evaluador import crear_motor
+
+    motor = crear_motor(juego, semilla=semilla)
+    motor.nueva_partida()
+    solucion = resolver_nivel(motor, rapido=True)
+    rng = random.Random(semilla)
+    return list(solucion.saltos) + [f for f in range(solucion.frames, solucion.frames + 3000) if rng.random() < 0.04]
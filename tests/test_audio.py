@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pygame
+import pytest
+
+from audio import GestorAudio
+from recursos import GestorRecursos
+
+
+@pytest.fixture
+def audio():
+    pygame.mixer.init()
+    recursos = GestorRecursos()
+    gestor = GestorAudio(recursos)
+    yield gestor
+    recursos.cerrar()
+    pygame.mixer.quit()
+
+
+def registrar_lenta(audio, nombre, ruta, soltar):
+    # Pista cuya decodificación no termina hasta que se suelta el evento
+    def cargar():
+        soltar.wait(5)
+        return pygame.mixer.Sound(ruta)
+    audio.recursos.registrar(nombre, cargar)
+
+
+def esperar_lista(audio, nombre):
+    limite = time.perf_counter() + 5
+    while not audio.recursos.listo(nombre) and time.perf_counter() < limite:
+        time.sleep(0.01)
+
+
+def test_desde_inicio_no_bloquea_mientras_se_decodifica(audio):
+    soltar = threading.Event()
+    registrar_lenta(audio, "pista", "Castle-town.mp3", soltar)
+    inicio = time.perf_counter()
+    audio.musica("pista", desde_inicio=True)
+    assert time.perf_counter() - inicio < 0.1
+    assert audio.esperando_inicio() and audio.pista is None
+    audio.actualizar()
+    assert audio.esperando_inicio()
+
+    soltar.set()
+    esperar_lista(audio, "pista")
+    audio.actualizar()
+    assert not audio.esperando_inicio() and audio.pista == "pista"
+
+
+def test_desde_inicio_ya_decodificada_suena_en_el_mismo_frame(audio):
+    audio.registrar("pista", "win.mp3")
+    audio.precargar("pista")
+    esperar_lista(audio, "pista")
+    audio.musica("pista", desde_inicio=True)
+    assert not audio.esperando_inicio() and audio.pista == "pista"
+
+
+def test_cambio_normal_no_cuenta_como_espera(audio):
+    soltar = threading.Event()
+    registrar_lenta(audio, "pista", "lose.mp3", soltar)
+    audio.musica("pista")
+    assert audio.pendiente == "pista" and not audio.esperando_inicio()
+    soltar.set()
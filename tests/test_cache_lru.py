@@ -0,0 +1,22 @@
+from cache_lru import CacheLRU
+
+
+def test_expulsa_la_menos_usada():
+    cache = CacheLRU(2)
+    construidos = []
+
+    def construir(clave):
+        def hacer():
+            construidos.append(clave)
+            return clave.upper()
+        return hacer
+
+    assert cache.obtener("a", construir("a")) == "A"
+    cache.obtener("b", construir("b"))
+    cache.obtener("a", construir("a"))
+    cache.obtener("c", construir("c"))
+    assert len(cache) == 2
+    cache.obtener("a", construir("a"))
+    cache.obtener("b", construir("b"))
+    assert construidos == ["a", "b", "c", "b"]
+    assert (cache.aciertos, cache.fallos) == (2, 4)
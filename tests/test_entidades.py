@@ -0,0 +1,59 @@
+from conftest import calendario, jugar
+from entidades import AlmacenEntidades, PoolEntidades
+from evaluador import crear_motor
+from infinito import NIVEL_INFINITO
+
+
+class Vista:
+    def __init__(self, valor, almacen=None):
+        self.almacen = almacen
+        self.indice = almacen.reservar()
+        self.reiniciar(valor)
+
+    def reiniciar(self, valor):
+        self.almacen.x[self.indice] = valor
+
+
+def test_pool_reutiliza_la_vista_con_su_hueco():
+    almacen = AlmacenEntidades(2)
+    pool = PoolEntidades(Vista, almacen)
+    vistas = [pool.obtener(i) for i in range(5)]
+    assert almacen.capacidad == 8 and almacen.ocupados == 5
+    assert len({v.indice for v in vistas}) == 5
+    for vista in vistas[:3]:
+        pool.devolver(vista)
+    otras = [pool.obtener(10 + i) for i in range(3)]
+    assert {id(v) for v in otras} == {id(v) for v in vistas[:3]}
+    assert (pool.aciertos, pool.fallos, almacen.ocupados) == (3, 5, 5)
+    assert sorted(almacen.x[v.indice] for v in otras + vistas[3:]) == [3, 4, 10, 11, 12]
+
+
+def test_huecos_vivos_distintos_y_acotados(juego):
+    # En una partida larga ningún hueco lo comparten dos entidades y cada pool no crea más
+    # vistas que las que llegan a estar en pantalla a la vez
+    motor = crear_motor(juego, semilla=1)
+    motor.nueva_partida(NIVEL_INFINITO)
+    maximo = 0
+    for _ in range(6000):
+        motor.jugador.y, motor.jugador.velocidad_y = -1000, 0
+        motor.actualizar_juego()
+        indices = [o.indice for o in motor.obstaculos_activos]
+        assert len(indices) == len(set(indices))
+        maximo = max(maximo, len(indices))
+    pools = list(motor_pools(motor))
+    vistas = sum(pool.fallos for pool in pools)
+    assert motor.almacen_obstaculos.ocupados == vistas <= maximo * len(pools)
+
+
+def test_pasar_de_nivel_devuelve_las_vistas(juego):
+    motor = crear_motor(juego, semilla=0)
+    motor.nueva_partida()
+    jugar(motor, calendario(juego, 0), 5000)
+    creadas = sum(pool.fallos for pool in motor_pools(motor))
+    libres = sum(len(pool.libres) for pool in motor_pools(motor))
+    assert libres + len(motor.obstaculos_activos) == creadas
+
+
+def motor_pools(motor):
+    # Pools de obstáculos de main.py (uno) o de 12.py (uno por clase)
+    return motor.pools.values() if hasattr(motor, "pools") else [motor.pool_obstaculos]
@@ -0,0 +1,28 @@
+import random
+
+import numpy as np
+
+from entorno import EntornoLote, EntornoVector
+
+
+def test_lote_coincide_con_vector_en_main():
+    # Con cualquier semilla: en main.py no cambia la partida
+    lote, vector = EntornoLote(8), EntornoVector(8, "main")
+    assert np.array_equal(lote.reset(seed=3), vector.reset(seed=11))
+    rng = random.Random(0)
+    for _ in range(1500):
+        acciones = [rng.random() < 0.05 for _ in range(8)]
+        for a, b in zip(lote.step(acciones)[:4], vector.step(acciones)[:4]):
+            assert np.array_equal(a, b)
+
+
+def test_semilla_repite_episodios_en_12():
+    observaciones = []
+    for _ in range(2):
+        entornos = EntornoVector(4, "12")
+        filas = [entornos.reset(seed=7)]
+        rng = random.Random(1)
+        for _ in range(600):
+            filas.append(entornos.step([rng.random() < 0.05 for _ in range(4)])[0])
+        observaciones.append(np.array(filas))
+    assert np.array_equal(*observaciones)
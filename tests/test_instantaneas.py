@@ -0,0 +1,81 @@
+import pytest
+
+from conftest import calendario, estado, jugar
+from evaluador import crear_motor
+from infinito import NIVEL_INFINITO
+
+
+def _traza(motor, saltos, desde, frames):
+    # Estados tras cada actualización, con los saltos contados desde el inicio de la partida
+    saltos = frozenset(saltos)
+    estados = []
+    for frame in range(desde, desde + frames):
+        if not motor.en_curso():
+            break
+        if frame in saltos:
+            motor.jugador.saltar()
+        motor.actualizar_juego()
+        estados.append(estado(motor))
+    return estados
+
+
+@pytest.mark.parametrize("corte", [0, 1, 137, 700, 1500])
+def test_restaurar_sigue_igual_que_sin_interrumpir(juego, corte):
+    saltos = calendario(juego, 4)
+    motor = crear_motor(juego, semilla=4)
+    motor.nueva_partida()
+    jugar(motor, saltos, corte)
+    instantanea = motor.instantanea()
+    esperada = _traza(motor, saltos, corte, 1500)
+
+    # Sobre el mismo motor, ya más adelante, y sobre uno nuevo sin partida empezada
+    motor.restaurar(instantanea)
+    assert motor.instantanea() == instantanea
+    assert _traza(motor, saltos, corte, 1500) == esperada
+    nuevo = crear_motor(juego, semilla=4)
+    nuevo.restaurar(instantanea)
+    assert nuevo.instantanea() == instantanea
+    assert _traza(nuevo, saltos, corte, 1500) == esperada
+
+
+def test_instantanea_de_otro_nivel(juego):
+    saltos = calendario(juego, 0)
+    motor = crear_motor(juego, semilla=0)
+    motor.nueva_partida()
+    jugar(motor, saltos, 200)
+    en_nivel_1 = motor.instantanea()
+    jugar(motor, [s - 200 for s in saltos if s >= 200], 5000)
+    assert motor.nivel_actual == 2 or not motor.en_curso()
+    motor.restaurar(en_nivel_1)
+    assert motor.nivel_actual == 1 and motor.instantanea() == en_nivel_1
+
+
+def test_instantanea_en_el_modo_infinito(juego):
+    def avanzar(motor, hasta):
+        # Siempre en el aire para atravesar varios tramos
+        while motor.frame_nivel < hasta:
+            motor.jugador.y, motor.jugador.velocidad_y = -1000, 0
+            motor.actualizar_juego()
+
+    motor = crear_motor(juego, semilla=9)
+    motor.nueva_partida(NIVEL_INFINITO)
+    instantaneas = []
+    for frame in (300, 900, 1500):
+        avanzar(motor, frame)
+        instantaneas.append(motor.instantanea())
+    avanzar(motor, 2000)
+    final = motor.instantanea()
+    for instantanea in instantaneas:
+        otro = crear_motor(juego, semilla=9)
+        otro.restaurar(instantanea)
+        avanzar(otro, 2000)
+        assert otro.instantanea() == final
+
+
+def test_instantanea_de_otra_version(juego):
+    motor = crear_motor(juego, semilla=0)
+    motor.nueva_partida()
+    datos = bytearray(motor.instantanea())
+    datos[0] ^= 0xFF
+    with pytest.raises(ValueError):
+        motor.restaurar(bytes(datos))
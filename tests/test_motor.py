@@ -0,0 +1,64 @@
+import pygame
+import pytest
+
+from conftest import calendario, modulo
+from evaluador import crear_motor
+
+
+def traza(motor, saltos, frames):
+    # Estado tras cada actualización con los saltos dados (contados desde 0)
+    saltos = frozenset(saltos)
+    estados = []
+    for frame in range(frames):
+        if not motor.en_curso():
+            break
+        if frame in saltos:
+            motor.jugador.saltar()
+        motor.actualizar_juego()
+        jugador = motor.jugador
+        estados.append((motor.nivel_actual, motor.frame_nivel, motor.puntuacion, jugador.y, jugador.velocidad_y,
+                        motor.en_curso(), motor.partida_ganada(),
+                        [(o.x, o.y, o.ancho) for o in motor.obstaculos_activos]))
+    return estados
+
+
+@pytest.fixture
+def juego_con_ventana(juego):
+    instancia = modulo(juego).Juego(directorio_grabaciones=None)
+    yield instancia
+    instancia.recursos.cerrar()
+    pygame.quit()
+
+
+@pytest.mark.parametrize("semilla", [0, 1])
+def test_juego_sigue_la_misma_traza_que_el_motor(juego, juego_con_ventana, semilla):
+    saltos = calendario(juego, semilla)
+    motor = crear_motor(juego, semilla=semilla)
+    motor.nueva_partida()
+    juego_con_ventana.semilla = semilla
+    juego_con_ventana.nueva_partida()
+    esperada = traza(motor, saltos, 5000)
+    assert esperada[-1][0] == 2 or esperada[-1][6]  # llegó al nivel 2
+    assert traza(juego_con_ventana, saltos, 5000) == esperada
+
+
+def test_simular_es_determinista(juego):
+    motores = [crear_motor(juego, semilla=3) for _ in range(2)]
+    for motor in motores:
+        motor.nueva_partida()
+    saltos = calendario(juego, 3)
+    assert traza(motores[0], saltos, 4000) == traza(motores[1], saltos, 4000)
+
+
+def test_12_sortea_cada_partida_una_sola_vez(monkeypatch):
+    clase = modulo("12").MotorJuego
+    semillas = []
+    original = clase.planificar_partida
+    monkeypatch.setattr(clase, "planificar_partida", lambda self, semilla: (semillas.append(semilla), original(self, semilla)))
+    motor = crear_motor("12", semilla=5)
+    motor.nueva_partida()
+    assert semillas == [5]
+    motor.nueva_partida()
+    motor.semilla = 6
+    motor.nueva_partida()
+    assert semillas == [5, 5, 6]
@@ -0,0 +1,68 @@
+import json
+import os
+import random
+
+import pytest
+
+from niveles import (FIN, TIPOS, Campaña, Nivel, cargar_linea_tiempo, cargar_nivel, compilar,
+                     guardar_linea_tiempo)
+
+
+def columnas(linea):
+    return (linea.velocidad, list(linea.frames_obstaculos), list(linea.tipos_obstaculos), list(linea.frames_plataformas),
+            list(linea.alturas_plataformas), linea.ancho_plataforma, linea.alto_plataforma)
+
+
+def test_compilar_spawn_en_el_primer_frame_que_llega_a_cero():
+    linea = compilar(Nivel.desde_distancias([300, 305, 5]), 10)
+    assert list(linea.frames_obstaculos) == [30, 61, 62, FIN]
+    assert linea.total_obstaculos == 3 and linea.total_plataformas == 0
+
+
+def test_compilar_alterna_alturas_por_plataformas_en_pantalla():
+    plataformas = {"cada": 50, "alturas": [350, 320], "ancho": 180, "alto": 25}
+    linea = compilar(Nivel.desde_distancias([600] * 10, plataformas=plataformas), 10)
+    # Una plataforma vive 98 frames: desde la segunda, cada una aparece con otra en pantalla
+    assert list(linea.frames_plataformas[:4]) == [50, 100, 150, 200]
+    assert list(linea.alturas_plataformas[:4]) == [350, 320, 320, 320]
+
+
+@pytest.mark.parametrize("nombre", ["nivel_1", "nivel_2", "azar_nivel_1", "azar_nivel_2"])
+def test_nivel_ida_y_vuelta_por_binario(tmp_path, nombre):
+    linea = compilar(Nivel.cargar(nombre), 10, rng=random.Random(0))
+    ruta = tmp_path / f"{nombre}.nivel"
+    guardar_linea_tiempo(linea, ruta)
+    assert columnas(cargar_linea_tiempo(ruta, 10)) == columnas(linea)
+    with pytest.raises(ValueError):
+        cargar_linea_tiempo(ruta, 12)
+
+
+def test_cargar_nivel_usa_el_binario_solo_si_esta_al_dia(tmp_path):
+    with open(tmp_path / "prueba.json", "w", encoding="utf-8") as archivo:
+        json.dump({"obstaculos": [{"distancia": 400, "repetir": 3}]}, archivo)
+    binario = tmp_path / "prueba-v10.nivel"
+    guardar_linea_tiempo(compilar(Nivel.desde_distancias([100]), 10), binario)
+    assert cargar_nivel("prueba", 10, directorio=tmp_path).total_obstaculos == 1
+    # Un JSON más nuevo que el binario se compila en memoria
+    antes = os.path.getmtime(binario) - 10
+    os.utime(binario, (antes, antes))
+    assert list(cargar_nivel("prueba", 10, directorio=tmp_path).frames_obstaculos) == [40, 80, 120, FIN]
+
+
+def test_tipos_no_admitidos():
+    nivel = Nivel([{"tipo": "variable", "distancia": 300}])
+    with pytest.raises(ValueError):
+        compilar(nivel, 10, tipos_permitidos=("triangulo",))
+    with pytest.raises(ValueError):
+        Nivel([{"tipo": "cuadrado", "distancia": 300}])
+    assert TIPOS[compilar(nivel, 10).tipos_obstaculos[0]] == "variable"
+
+
+@pytest.mark.parametrize("juego", ["main", "12"])
+def test_campaña_indexa_desde_1_y_el_0_es_el_infinito(juego):
+    campaña = Campaña.cargar(juego)
+    assert campaña[1] is campaña.niveles[0] and campaña[len(campaña)] is campaña.niveles[-1]
+    assert campaña[0] is campaña.infinito and campaña.puntos[0] == FIN
+    for nivel in range(1, len(campaña) + 1):
+        assert campaña.puntos[nivel] == campaña[nivel]["puntos"]
+        Nivel.cargar(campaña[nivel]["nivel"])
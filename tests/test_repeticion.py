@@ -0,0 +1,80 @@
+import random
+from array import array
+
+import pytest
+
+from conftest import calendario, estado
+from evaluador import crear_motor
+from repeticion import MAGIA, Grabacion, Grabador, Reproductor, _escribir_varint
+
+
+def grabar(juego, semilla, saltos, mapa=None):
+    # Como Juego: salto() en cada saltar() y tick() tras cada actualización
+    motor = crear_motor(juego, mapa, semilla)
+    motor.nueva_partida()
+    grabador = Grabador(directorio=None)
+    grabador.comenzar(motor, juego, semilla, 1)
+    saltos = frozenset(saltos)
+    frame = 0
+    while grabador.activo and frame < 20000:
+        if frame in saltos:
+            motor.jugador.saltar()
+            grabador.salto()
+        motor.actualizar_juego()
+        grabador.tick()
+        frame += 1
+    return grabador.terminar() or grabador.ultima, motor
+
+
+@pytest.mark.parametrize("mapa", [None, [300, 450, 1000, 2 ** 20]])
+def test_grabacion_ida_y_vuelta(mapa):
+    grabacion = Grabacion("12", 2 ** 64 - 1, 2, array("I", [0, 5, 5, 200, 70000]), 70001, 17, 2, mapa)
+    leida = Grabacion.desde_bytes(grabacion.a_bytes())
+    assert (leida.juego, leida.semilla, leida.nivel, list(leida.saltos), leida.frames, leida.puntuacion,
+            leida.nivel_final, leida.mapa) == ("12", 2 ** 64 - 1, 2, [0, 5, 5, 200, 70000], 70001, 17, 2, mapa)
+
+
+def test_grabacion_version_1_se_sigue_leyendo():
+    # La versión 1 no tenía mapa: tras los seis números vienen directamente los saltos
+    datos = bytearray(MAGIA)
+    datos.append(1)
+    _escribir_varint(datos, 4)
+    datos += b"main"
+    for numero in (0, 1, 500, 9, 1, 3):
+        _escribir_varint(datos, numero)
+    for delta in (30, 200, 1):
+        _escribir_varint(datos, delta)
+    leida = Grabacion.desde_bytes(bytes(datos))
+    assert (leida.juego, leida.semilla, leida.nivel, leida.frames, leida.puntuacion, leida.nivel_final) == ("main", 0, 1, 500, 9, 1)
+    assert list(leida.saltos) == [30, 230, 231] and leida.mapa is None
+
+
+def test_grabacion_no_compatible():
+    with pytest.raises(ValueError):
+        Grabacion.desde_bytes(b"XXXX\x02")
+
+
+@pytest.mark.parametrize("semilla", [0, 5])
+def test_repeticion_coincide_con_la_partida(juego, semilla):
+    grabacion, motor = grabar(juego, semilla, calendario(juego, semilla))
+    assert grabacion.frames > 600
+    reproductor = Reproductor(Grabacion.desde_bytes(grabacion.a_bytes()))
+    assert estado(reproductor.reproducir()) == estado(motor)
+    assert reproductor.coincide()
+
+
+def test_repeticion_con_mapa_fijo(juego):
+    mapa = [random.Random(1).randint(300, 600) for _ in range(10)]
+    grabacion, motor = grabar(juego, 2, [], mapa)
+    assert grabacion.mapa == mapa
+    assert estado(Reproductor(grabacion).reproducir()) == estado(motor)
+
+
+def test_buscar_llega_al_mismo_estado_que_jugar_seguido(juego):
+    grabacion, _ = grabar(juego, 3, calendario(juego, 3))
+    rng = random.Random(0)
+    frames = [rng.randrange(grabacion.frames) for _ in range(12)] + [0, grabacion.frames]
+    con_saltos = Reproductor(grabacion, intervalo_instantaneas=50)
+    for frame in frames:
+        seguido = Reproductor(grabacion, intervalo_instantaneas=0).avanzar_hasta(frame)
+        assert estado(con_saltos.buscar(frame)) == estado(seguido), frame
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from autojugador import resolver_nivel
+from evaluador import crear_motor
+from simulador_lote import SimuladorLote
+
+FRAMES = 3000
+
+
+def saltos_ganadores():
+    # Frames de salto que ganan la partida de main.py, nivel tras nivel
+    motor = crear_motor("main")
+    motor.nueva_partida()
+    saltos, inicio = [], 0
+    while motor.en_curso():
+        solucion = resolver_nivel(motor, rapido=True)
+        assert solucion.posible
+        saltos += [inicio + s for s in solucion.saltos]
+        inicio += solucion.frames
+    return saltos
+
+
+def traza_motor(saltos):
+    motor = crear_motor("main")
+    motor.nueva_partida()
+    estados = []
+    saltos = frozenset(saltos)
+    for frame in range(FRAMES):
+        if motor.en_curso():
+            if frame in saltos:
+                motor.jugador.saltar()
+            motor.actualizar_juego()
+        estados.append((motor.nivel_actual, motor.puntuacion, motor.jugador.y, motor.juego_terminado, motor.juego_ganado))
+    return estados
+
+
+@pytest.mark.parametrize("semilla", [0, 1, 2])
+def test_simulador_lote_coincide_con_motor(semilla):
+    rng = np.random.default_rng(semilla)
+    ganadores = np.zeros(FRAMES, dtype=bool)
+    ganadores[saltos_ganadores()] = True
+    # Fila 0: gana; las demás: la partida ganadora con saltos de más o de menos, o saltos al azar
+    saltos = np.empty((12, FRAMES), dtype=bool)
+    saltos[0] = ganadores
+    for fila in range(1, 8):
+        ruido = rng.random(FRAMES) < 0.002 * fila
+        saltos[fila] = ganadores ^ ruido
+    saltos[8:] = rng.random((4, FRAMES)) < 0.05
+
+    simulador = SimuladorLote(len(saltos))
+    trazas = []
+    for frame in range(FRAMES):
+        simulador.paso(saltos[:, frame])
+        trazas.append(np.stack([simulador.nivel_actual, simulador.puntuacion, simulador.y,
+                                simulador.juego_terminado, simulador.juego_ganado], axis=1).tolist())
+    assert simulador.juego_ganado[0]
+    for fila in range(len(saltos)):
+        esperada = traza_motor(np.flatnonzero(saltos[fila]).tolist())
+        obtenida = [tuple(traza[fila]) for traza in trazas]
+        assert obtenida == [tuple(map(int, estado)) for estado in esperada], f"fila {fila}"
@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from autojugador import resolver_nivel
+from conftest import jugar
+from evaluador import crear_motor
+from validador import validar_motor
+
+
+def _pasa_el_nivel(motor, saltos):
+    nivel = motor.nivel_actual
+    jugar(motor, saltos, 100000)
+    return motor.partida_ganada() or motor.nivel_actual != nivel
+
+
+@pytest.mark.parametrize("semilla", range(40))
+def test_plan_del_validador_pasa_mapas_densos(juego, semilla):
+    rng = random.Random(semilla)
+    motor = crear_motor(juego, [rng.randint(80, 400) for _ in range(10)], semilla=0)
+    motor.nueva_partida(1)
+    validacion = validar_motor(motor)
+    if validacion.posible:
+        assert _pasa_el_nivel(motor, validacion.saltos)
+    else:
+        assert not resolver_nivel(motor, rapido=True).posible
+
+
+def test_plan_del_validador_pasa_la_campaña(juego):
+    motor = crear_motor(juego, semilla=0)
+    for nivel in range(1, len(motor.campaña) + 1):
+        motor.nueva_partida(nivel)
+        validacion = validar_motor(motor)
+        assert validacion.posible
+        assert _pasa_el_nivel(motor, validacion.saltos)
+
+
+def test_mapa_imposible_coincide_con_el_autojugador(juego):
+    # Cinco obstáculos a 20 frames: demasiado juntos para saltarlos uno a uno o de dos en dos
+    motor = crear_motor(juego, [300] + [200] * 5, semilla=0)
+    motor.nueva_partida(1)
+    validacion = validar_motor(motor)
+    assert not validacion.posible and validacion.imposibles
+    assert not resolver_nivel(motor, rapido=True).posible
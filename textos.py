@@ -0,0 +1,51 @@
+import pygame
+
+from cache_lru import CacheLRU
+
+# ----------------------------- Caché de textos -----------------------------
+# Rasterizar con font.render es lo más caro de dibujar el menú y el HUD.
+# CacheTextos guarda las superficies ya renderizadas con expulsión LRU y
+# MarcadorHUD recompone un texto con números solo cuando cambia su valor,
+# pegando glifos de dígitos que también salen de la caché.
+
+class CacheTextos(CacheLRU):
+    def __init__(self, capacidad=256):
+        super().__init__(capacidad)
+
+    def render(self, fuente, texto, antialias, color):
+        # Misma firma que Font.render, con la fuente delante
+        clave = (fuente, texto, tuple(color), antialias)
+        return self.obtener(clave, lambda: fuente.render(texto, antialias, color))
+
+
+class MarcadorHUD:
+    def __init__(self, cache, fuente, plantilla, color, antialias=True):
+        # plantilla con huecos "{}" para los valores, p. ej. "Nivel {} - Puntos: {}"
+        self.cache = cache
+        self.fuente = fuente
+        self.literales = plantilla.split("{}")
+        self.color = color
+        self.antialias = antialias
+        self.valores = None
+        self.superficie_actual = None
+
+    def _glifos(self, valores):
+        for literal, valor in zip(self.literales, valores + ("",)):
+            if literal:
+                yield self.cache.render(self.fuente, literal, self.antialias, self.color)
+            for caracter in str(valor):
+                yield self.cache.render(self.fuente, caracter, self.antialias, self.color)
+
+    def superficie(self, *valores):
+        if valores != self.valores:
+            glifos = list(self._glifos(valores))
+            ancho = sum(g.get_width() for g in glifos)
+            alto = max(g.get_height() for g in glifos)
+            superficie = pygame.Surface((ancho, alto), pygame.SRCALPHA)
+            x = 0
+            for glifo in glifos:
+                superficie.blit(glifo, (x, 0))
+                x += glifo.get_width()
+            self.valores = valores
+            self.superficie_actual = superficie
+        return self.superficie_actual
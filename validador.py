@@ -0,0 +1,424 @@
+import argparse
+from bisect import bisect_left, bisect_right
+
+from niveles import TIPOS
+
+# ----------------------------- Validador analítico de niveles -----------------------------
+# Decide si un nivel se puede pasar sin simular la partida. El salto tiene forma cerrada:
+# tras k actualizaciones el jugador está en y = base - 15k + k(k+1)/2 y vuelve al suelo en
+# la 29ª. Cada obstáculo solapa en x al jugador durante unos pocos frames fijos (según su
+# tamaño y velocidad) y de ahí sale la ventana de frames de salto que lo superan. Las
+# ventanas dependen solo de (tamaño, velocidad, oscilación) relativas al frame de spawn,
+# así que se calculan una vez por combinación y un mapa de 10k obstáculos se valida
+# encadenándolas: estado = primer obstáculo pendiente y último frame en que el jugador
+# tiene que estar en el suelo, quedándose con el más temprano (esperar en el suelo desde
+# ahí siempre es posible).
+#
+# Con plataformas, los saltos que acabarían aterrizando en una no cuentan como saltos
+# normales; si así no basta se prueba a subirse a la plataforma y bajar cuando se acaba.
+# Si tampoco (por ejemplo hay que saltar desde encima de una) se recorre ese tramo frame a
+# frame con la regla de Jugador.actualizar sobre los estados distintos del jugador
+# (y, velocidad, saltando), con obstáculos y plataformas aún en forma cerrada: es exacto
+# pero más lento, y solo se usa ahí.
+
+ANCHO_PANTALLA = 800
+Y_SUELO = 450
+JUGADOR_X = 100
+JUGADOR_TAMAÑO = 50
+JUGADOR_Y_SUELO = Y_SUELO - JUGADOR_TAMAÑO
+VELOCIDAD_SALTO = -15
+GRAVEDAD = 1
+TAMAÑO_TRIANGULO = 35
+OSCILACION = 80          # ObstaculoNivel2 sube hasta 80 px sobre el suelo...
+PASO_OSCILACION = 2      # ...a 2 px por frame
+
+SIN_ALCANZAR = float("inf")
+RETROCESO = 240  # frames hacia atrás desde los que se busca frame a frame cuando faltan saltos normales
+
+
+def altura_salto(k, base=JUGADOR_Y_SUELO):
+    # y del jugador tras k actualizaciones desde saltar() (k = 0 es el frame del salto)
+    return base + VELOCIDAD_SALTO * k + GRAVEDAD * k * (k + 1) // 2
+
+
+def _duracion_salto():
+    k = 1
+    while altura_salto(k) < JUGADOR_Y_SUELO:
+        k += 1
+    return k
+
+
+DURACION_SALTO = _duracion_salto()  # actualizaciones desde saltar() hasta volver a tocar el suelo
+
+
+def _alturas_oscilantes(frames):
+    # y de un ObstaculoNivel2 vertical j frames después de aparecer (se mueve ya en su frame de spawn)
+    alturas, y, direccion = [], Y_SUELO, 1
+    for _ in range(frames):
+        y += direccion * PASO_OSCILACION
+        if y <= Y_SUELO - OSCILACION or y >= Y_SUELO:
+            direccion = -direccion
+        alturas.append(y)
+    return alturas
+
+
+_oscilantes = []
+
+
+def _altura_obstaculo(j, vertical):
+    # y de la base del obstáculo j frames después de aparecer
+    if not vertical:
+        return Y_SUELO
+    if j >= len(_oscilantes):
+        _oscilantes[:] = _alturas_oscilantes(2 * j + 1)
+    return _oscilantes[j]
+
+
+def frames_peligro(tamaño, velocidad):
+    # Frames tras el spawn (j0, j1) en que la caja de colisión solapa en x al jugador.
+    # En el frame j el obstáculo está en x = ANCHO_PANTALLA - velocidad*(j+1) y su caja
+    # empieza en x + tamaño//4 con ancho tamaño//2 (Obstaculo.actualizar_rectangulo)
+    izquierda = tamaño // 4
+    j0 = (ANCHO_PANTALLA - JUGADOR_X - JUGADOR_TAMAÑO + izquierda) // velocidad
+    j1 = (ANCHO_PANTALLA - JUGADOR_X + izquierda + tamaño // 2 - 1) // velocidad - 1
+    return j0, j1
+
+
+def _seguro(y_jugador, y_obstaculo, tamaño):
+    # Sin solape vertical entre el jugador [y, y+50) y la caja [y_obstaculo - tamaño, y_obstaculo)
+    return not (y_jugador < y_obstaculo and y_jugador + JUGADOR_TAMAÑO > y_obstaculo - tamaño)
+
+
+def _rangos(valores):
+    # Enteros ordenados -> lista de rangos cerrados (inicio, fin)
+    rangos = []
+    for valor in valores:
+        if rangos and rangos[-1][1] == valor - 1:
+            rangos[-1] = (rangos[-1][0], valor)
+        else:
+            rangos.append((valor, valor))
+    return rangos
+
+
+_ventanas = {}
+
+
+def ventana_obstaculo(tamaño, velocidad, vertical=False):
+    # (j0, j1, en_suelo, rangos): frames de peligro, si se pasa sin saltar y los desfases
+    # d = frame_salto - frame_spawn con los que un salto (y suelo antes y después) lo supera
+    clave = (tamaño, velocidad, vertical)
+    ventana = _ventanas.get(clave)
+    if ventana is None:
+        j0, j1 = frames_peligro(tamaño, velocidad)
+        alturas = [_altura_obstaculo(j, vertical) for j in range(j0, j1 + 1)]
+        en_suelo = all(_seguro(JUGADOR_Y_SUELO, y, tamaño) for y in alturas)
+        desfases = []
+        for d in range(j0 - DURACION_SALTO + 2, j1 + 1):
+            if all(_seguro(altura_salto(j - d + 1) if 0 < j - d + 1 < DURACION_SALTO else JUGADOR_Y_SUELO,
+                           y, tamaño)
+                   for j, y in enumerate(alturas, j0)):
+                desfases.append(d)
+        ventana = _ventanas[clave] = (j0, j1, en_suelo, _rangos(desfases))
+    return ventana
+
+
+# ----------------------------- Plataformas -----------------------------
+# Una plataforma aparece en x = ANCHO_PANTALLA al final de su frame de spawn P y el
+# jugador la ve en la posición del frame anterior: en la actualización t está en
+# x = ANCHO_PANTALLA - velocidad*(t - 1 - P).
+
+class Plataforma:
+    __slots__ = ("frame", "y", "ancho", "alto", "velocidad", "t_inicio", "t_fin")
+
+    def __init__(self, frame, y, ancho, alto, velocidad):
+        self.frame, self.y, self.ancho, self.alto, self.velocidad = frame, y, ancho, alto, velocidad
+        # Actualizaciones en que solapa en x al jugador (es candidata en BarridoX.candidatos)
+        self.t_inicio = frame + 1 + (ANCHO_PANTALLA - JUGADOR_X - JUGADOR_TAMAÑO) // velocidad + 1
+        self.t_fin = frame + 1 + (ANCHO_PANTALLA - JUGADOR_X + self.ancho - 1) // velocidad
+
+    def solapa(self, t):
+        return self.t_inicio <= t <= self.t_fin
+
+    def aterriza(self, y_anterior, y, velocidad_y):
+        # Misma condición que Jugador.actualizar con el rectángulo del frame anterior
+        return (velocidad_y >= 0 and y_anterior < self.y + self.alto
+                and y_anterior + JUGADOR_TAMAÑO > self.y and y < self.y)
+
+    def saltos_que_aterrizan(self):
+        # Frames de salto desde el suelo cuyo arco acaba sobre esta plataforma
+        frames = set()
+        for k in range(1, DURACION_SALTO):
+            if self.aterriza(altura_salto(k - 1), altura_salto(k), VELOCIDAD_SALTO + GRAVEDAD * k):
+                frames.update(range(self.t_inicio - k + 1, self.t_fin - k + 2))
+        return sorted(frames)
+
+
+_trayectorias = {}
+
+
+def trayectoria(salto, plataformas):
+    # Alturas del jugador desde el frame `salto` hasta volver al suelo, paso a paso con la
+    # regla de Jugador.actualizar. Solo depende de dónde están las plataformas respecto al salto
+    clave = tuple((p.frame - salto, p.y, p.ancho, p.alto, p.velocidad) for p in plataformas)
+    alturas = _trayectorias.get(clave)
+    if alturas is not None:
+        return alturas
+    alturas = []
+    y, velocidad_y, t = JUGADOR_Y_SUELO, VELOCIDAD_SALTO, salto
+    while y < JUGADOR_Y_SUELO or not alturas:
+        y_anterior = y
+        velocidad_y += GRAVEDAD
+        y += velocidad_y
+        for plataforma in plataformas:
+            if plataforma.solapa(t) and plataforma.aterriza(y_anterior, y, velocidad_y):
+                y, velocidad_y = plataforma.y - JUGADOR_TAMAÑO, 0
+                break
+        else:
+            if y >= JUGADOR_Y_SUELO:
+                y = JUGADOR_Y_SUELO
+        alturas.append(y)
+        t += 1
+    _trayectorias[clave] = alturas
+    return alturas
+
+
+# ----------------------------- Validación -----------------------------
+
+class Validacion:
+    def __init__(self, posible, saltos, imposibles, obstaculos, recorridos):
+        self.posible = posible
+        # Frames (desde el inicio del nivel, contando desde 0) en que llamar a saltar() antes de
+        # actualizar, como Solucion.saltos y las grabaciones
+        self.saltos = saltos
+        self.imposibles = imposibles      # (índice del obstáculo, frame de spawn, frames desde el anterior)
+        self.obstaculos = obstaculos
+        self.recorridos = recorridos      # tramos que hubo que recorrer frame a frame
+
+    def __repr__(self):
+        return (f"Validacion(posible={self.posible}, obstaculos={self.obstaculos}, "
+                f"saltos={len(self.saltos)}, imposibles={len(self.imposibles)})")
+
+
+def obstaculos_de_linea(linea, tamaños=None, extras_velocidad=None, verticales=None):
+    # (frame de spawn, tamaño, velocidad, vertical) de cada obstáculo. Los "variable" de
+    # 12.py usan los parámetros sorteados del plan de la partida (índice = orden de spawn)
+    obstaculos = []
+    for i in range(linea.total_obstaculos):
+        frame = linea.frames_obstaculos[i]
+        if TIPOS[linea.tipos_obstaculos[i]] == "variable":
+            obstaculos.append((frame, tamaños[i], linea.velocidad + extras_velocidad[i], bool(verticales[i])))
+        else:
+            obstaculos.append((frame, TAMAÑO_TRIANGULO, linea.velocidad, False))
+    return obstaculos
+
+
+def plataformas_de_linea(linea):
+    return [Plataforma(linea.frames_plataformas[i], linea.alturas_plataformas[i], linea.ancho_plataforma,
+                       linea.alto_plataforma, linea.velocidad)
+            for i in range(linea.total_plataformas)]
+
+
+def validar_motor(motor):
+    # Valida el nivel en curso de un MotorJuego de main.py o 12.py (tras nueva_partida)
+    linea = motor.linea_tiempo
+    obstaculos = obstaculos_de_linea(linea, getattr(motor, "tamaños_obstaculos", None),
+                                     getattr(motor, "extras_velocidad", None),
+                                     getattr(motor, "verticales_obstaculos", None))
+    return validar(obstaculos, plataformas_de_linea(linea))
+
+
+def validar(obstaculos, plataformas=()):
+    # Obstáculos por el primer frame en que solapan al jugador (casi siempre ya vienen así)
+    filas = []
+    for indice, (frame, tamaño, velocidad, vertical) in enumerate(obstaculos):
+        j0, j1, suelo, rangos = ventana_obstaculo(tamaño, velocidad, vertical)
+        filas.append((frame + j0, frame + j1, indice, frame, suelo, rangos))
+    filas.sort()
+    n = len(filas)
+    inicios, finales, orden, spawns, en_suelo, ventanas = map(list, zip(*filas)) if n else ([],) * 6
+    # finales_hasta[j]: último frame de peligro de los obstáculos < j
+    finales_hasta = [0]
+    for final in finales:
+        finales_hasta.append(max(finales_hasta[-1], final))
+
+    # Saltos que tocarían una plataforma: no siguen el arco normal
+    tocan = sorted({s for p in plataformas for s in p.saltos_que_aterrizan()})
+    tocan_conjunto = set(tocan)
+    plataformas = sorted(plataformas, key=lambda p: p.t_inicio)
+    inicios_plataformas = [p.t_inicio for p in plataformas]
+    solape_maximo = max((p.t_fin - p.t_inicio for p in plataformas), default=0)
+
+    def en_ventana(k, s):
+        d = s - spawns[k]
+        return any(a <= d <= b for a, b in ventanas[k])
+
+    # mejor[i]: último frame en que hay que estar en el suelo con los obstáculos < i superados
+    mejor = [SIN_ALCANZAR] * (n + 1)
+    previo = [None] * (n + 1)
+    mejor[0] = 0
+    alcanzado = 0
+    imposibles = []
+    recorridos = 0
+
+    def relajar(j, suelo, i, saltos):
+        nonlocal alcanzado
+        if suelo < mejor[j]:
+            mejor[j], previo[j] = suelo, (i, saltos)
+            alcanzado = max(alcanzado, j)
+
+    def seguro_con(j, s, alturas):
+        # El obstáculo j con el jugador siguiendo `alturas` desde el frame s y en el suelo fuera de ellas
+        frame, tamaño, velocidad, vertical = obstaculos[orden[j]]
+        for t in range(inicios[j], finales[j] + 1):
+            y = alturas[t - s] if s <= t < s + len(alturas) else JUGADOR_Y_SUELO
+            if not _seguro(y, _altura_obstaculo(t - frame, vertical), tamaño):
+                return False
+        return True
+
+    def subir(i, suelo):
+        # Saltos desde el suelo que aterrizan en una plataforma y se bajan al acabarse esta
+        encontrado = False
+        for s in tocan[bisect_left(tocan, suelo + 1):bisect_right(tocan, finales[i])]:
+            # Las plataformas que pueden tocarse: si el recorrido dura más, se amplía y se repite
+            desde, hasta = bisect_left(inicios_plataformas, s - solape_maximo), s + DURACION_SALTO
+            while True:
+                alturas = trayectoria(s, plataformas[desde:bisect_right(inicios_plataformas, hasta)])
+                if s + len(alturas) - 1 <= hasta:
+                    break
+                hasta = s + len(alturas) - 1
+            fin = s + len(alturas) - 1
+            j, ultimo = i, finales[i]
+            while j < n and inicios[j] <= fin and seguro_con(j, s, alturas):
+                ultimo = max(ultimo, finales[j])
+                j += 1
+            if j > i and not (j < n and inicios[j] <= fin):
+                # Todas bajan cuando se acaba la plataforma: la primera que sirve es la que antes termina
+                relajar(j, max(fin, ultimo), i, (s,))
+                return True
+        return False
+
+    def recorrer(k, i):
+        # Frame a frame desde el jugador en el suelo tras mejor[k] hasta dejar atrás el obstáculo i;
+        # cada vez que vuelve al suelo con los obstáculos anteriores ya pasados es un estado nuevo
+        desde = mejor[k]
+        hasta = finales[i] + 2 * DURACION_SALTO
+        peligros = {}
+        for j in range(k, n):
+            if inicios[j] > hasta:
+                break
+            frame, tamaño, velocidad, vertical = obstaculos[orden[j]]
+            for t in range(inicios[j], finales[j] + 1):
+                peligros.setdefault(t, []).append((_altura_obstaculo(t - frame, vertical), tamaño))
+        cercanas = plataformas[bisect_left(inicios_plataformas, desde - DURACION_SALTO):
+                               bisect_right(inicios_plataformas, hasta)]
+        suelo = (JUGADOR_Y_SUELO, 0, False)
+        estados = {suelo: None}   # (y, velocidad_y, esta_saltando) -> (estado anterior, saltó)
+        historia = []
+        for t in range(desde + 1, hasta + 1):
+            nuevos = {}
+            candidatas = [p for p in cercanas if p.solapa(t)]
+            for estado in estados:
+                y0, velocidad0, saltando = estado
+                for saltar in (False,) if saltando else (False, True):
+                    velocidad_y = (VELOCIDAD_SALTO if saltar else velocidad0) + GRAVEDAD
+                    y, sigue_saltando = y0 + velocidad_y, saltando or saltar
+                    for plataforma in candidatas:
+                        if plataforma.aterriza(y0, y, velocidad_y):
+                            y, velocidad_y, sigue_saltando = plataforma.y - JUGADOR_TAMAÑO, 0, False
+                            break
+                    else:
+                        if y >= JUGADOR_Y_SUELO:
+                            y, velocidad_y, sigue_saltando = JUGADOR_Y_SUELO, 0, False
+                    if all(_seguro(y, y_obstaculo, tamaño) for y_obstaculo, tamaño in peligros.get(t, ())):
+                        nuevos.setdefault((y, velocidad_y, sigue_saltando), (estado, saltar))
+            if not nuevos:
+                return
+            historia.append(nuevos)
+            estados = nuevos
+            j = bisect_right(inicios, t)
+            if suelo in estados and j >= i and finales_hasta[j] <= t and t < mejor[j]:
+                saltos, estado = [], suelo
+                for frame in range(t, desde, -1):
+                    estado, saltar = historia[frame - desde - 1][estado]
+                    if saltar:
+                        saltos.append(frame)
+                relajar(j, t, k, saltos[::-1])
+
+    for i in range(n + 1):
+        if mejor[i] == SIN_ALCANZAR and alcanzado <= i and plataformas:
+            # Ni saltos normales ni subir a una plataforma: se recorren frame a frame los
+            # últimos estados alcanzados (por ejemplo para saltar desde encima de una plataforma)
+            k = i - 1
+            while k >= 0 and mejor[i] == SIN_ALCANZAR and finales[i - 1] - mejor[k] <= RETROCESO:
+                if mejor[k] != SIN_ALCANZAR:
+                    recorrer(k, i - 1)
+                    recorridos += 1
+                k -= 1
+        suelo = mejor[i]
+        if suelo == SIN_ALCANZAR:
+            if alcanzado > i:
+                continue
+            # Nada supera el obstáculo anterior: se marca y se sigue como si se hubiera pasado
+            k = orden[i - 1]
+            imposibles.append((k, obstaculos[k][0], obstaculos[k][0] - (obstaculos[k - 1][0] if k else 0)))
+            suelo = mejor[i] = finales[i - 1]
+            previo[i] = None
+        if i == n:
+            break
+
+        if en_suelo[i]:
+            relajar(i + 1, max(suelo, finales[i]), i, ())
+
+        # Saltos normales. Con el siguiente obstáculo lejos ningún arco lo alcanza y solo
+        # interesa el primer salto válido, que es el que antes vuelve al suelo
+        lejos = i + 1 == n or inicios[i + 1] > finales[i] + DURACION_SALTO - 2
+        spawn = spawns[i]
+        for a, b in ventanas[i]:
+            for s in range(max(spawn + a, suelo + 1), spawn + b + 1):
+                if s in tocan_conjunto:
+                    continue
+                if lejos:
+                    relajar(i + 1, max(s + DURACION_SALTO - 1, finales[i]), i, (s,))
+                    break
+                fin_arco = s + DURACION_SALTO - 2
+                j, ultimo = i + 1, finales[i]
+                while j < n and inicios[j] <= fin_arco and en_ventana(j, s):
+                    ultimo = max(ultimo, finales[j])
+                    j += 1
+                if not (j < n and inicios[j] <= fin_arco):
+                    relajar(j, max(fin_arco + 1, ultimo), i, (s,))
+            else:
+                continue
+            break
+        if tocan and alcanzado <= i:
+            subir(i, suelo)
+
+    # Aquí un salto es el frame_nivel de la actualización en que se salta, uno más que el
+    # contador de frames con que se juega (actualizar_juego incrementa frame_nivel al empezar)
+    saltos = []
+    j = n
+    while j and previo[j] is not None:
+        i, tramo = previo[j]
+        saltos.extend(s - 1 for s in reversed(tramo))
+        j = i
+    saltos.reverse()
+    return Validacion(not imposibles, saltos, sorted(imposibles), n, recorridos)
+
+
+if __name__ == "__main__":
+    from evaluador import crear_motor
+
+    parser = argparse.ArgumentParser(description="Comprueba sin simular que los niveles se pueden pasar")
+    parser.add_argument("--juego", choices=["main", "12"], default="main")
+    parser.add_argument("--semillas", type=int, nargs=2, default=(0, 1), metavar=("INICIO", "FIN"),
+                        help="en 12.py cada semilla sortea un mapa distinto")
+    args = parser.parse_args()
+
+    for semilla in range(*args.semillas):
+        motor = crear_motor(args.juego, semilla=semilla)
+        for nivel in range(1, len(motor.campaña) + 1):
+            motor.nueva_partida(nivel)
+            validacion = validar_motor(motor)
+            print(f"semilla {semilla}, nivel {nivel}: {validacion}")
+            for indice, frame, separacion in validacion.imposibles:
+                print(f"  obstáculo {indice} (frame {frame}) a {separacion} frames del anterior: imposible")